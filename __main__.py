@@ -1,2 +1,9 @@
-from main import main 
-main()
\ No newline at end of file
+import sys
+
+if len(sys.argv) > 1 and not sys.argv[1].startswith(("--profile", "--startup-report")):
+    # headless CLI: never imports PyQt
+    from cli import main
+    sys.exit(main())
+
+from main import main
+main()
@@ -0,0 +1,58 @@
+"""
+    python -m benchmarks run --output benchmarks/baseline.json
+    python -m benchmarks run --sizes 10,1000 --output current.json
+    python -m benchmarks compare benchmarks/baseline.json current.json --threshold 0.2
+
+compare exits with status 1 when a measurement regressed beyond the threshold.
+"""
+import argparse
+import sys
+
+from benchmarks.suite import DEFAULT_SIZES, run_suite, compare, load_results, save_results
+
+
+def cmd_run(args):
+    sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else DEFAULT_SIZES
+    groups = args.groups.split(",")
+    results = run_suite(sizes, groups, progress=lambda n: print(f"  size {n} done", file=sys.stderr))
+    for key, seconds in sorted(results["results"].items()):
+        print(f"{key:40s} {seconds * 1000:12.3f} ms")
+    if args.output:
+        save_results(results, args.output)
+    return 0
+
+
+def cmd_compare(args):
+    rows = compare(load_results(args.baseline), load_results(args.current), args.threshold, args.min_time)
+    regressions = 0
+    for key, before, after, ratio, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{key:40s} {before * 1000:12.3f} ms {after * 1000:12.3f} ms {ratio:7.2f}x {flag}")
+        regressions += regressed
+    print(f"{regressions} regression(s) over {len(rows)} measurement(s) (threshold +{args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the suite")
+    run.add_argument("--sizes", help=f"comma-separated catalog sizes (default {DEFAULT_SIZES})")
+    run.add_argument("--groups", default="optics,solver,catalog")
+    run.add_argument("--output", help="write the results to this JSON file")
+    run.set_defaults(func=cmd_run)
+
+    cmp_ = sub.add_parser("compare", help="compare two result files")
+    cmp_.add_argument("baseline")
+    cmp_.add_argument("current")
+    cmp_.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown (0.2 = +20%%)")
+    cmp_.add_argument("--min-time", type=float, default=1e-4, help="ignore measurements faster than this (s)")
+    cmp_.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Benchmarks : formules optiques, solveur et E/S du catalogue sur des
+catalogues synthétiques de taille croissante.
+
+Chaque mesure est le meilleur temps (s) sur quelques répétitions, rangé
+sous une clé "<groupe>.<cas>[<taille>]" dans un fichier JSON de référence.
+"""
+
+import json
+import platform
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from services import optics_batch
+from services.database_manager import DatabaseManager
+from services.optics_calculations import (
+    compute_fov,
+    compute_px_per_mm,
+    compute_min_detectable_defect,
+    compute_motion_blur,
+)
+from services.dataflow import resolve
+from services.solver import CachedSolver, solve
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 1_000_000]
+
+_RESOLUTIONS = [(1440, 1080), (2448, 2048), (4096, 2992), (4112, 3008), (5472, 3648)]
+_PIXELS = [2.4, 2.74, 3.45, 4.5, 5.5]
+
+
+# ------------------------------------------------------------
+# Catalogues synthétiques
+# ------------------------------------------------------------
+
+def synthetic_cameras(n, seed=0):
+    rnd = random.Random(seed)
+    cameras = []
+    for i in range(n):
+        rx, ry = rnd.choice(_RESOLUTIONS)
+        cameras.append({
+            "name": f"CAM-{i:07d}",
+            "resolution_x": rx,
+            "resolution_y": ry,
+            "pixel_size_um": rnd.choice(_PIXELS),
+            "shutter": rnd.choice(["global", "rolling"]),
+            "notes": "synthetic",
+        })
+    return cameras
+
+
+def synthetic_objectives(n, seed=0):
+    rnd = random.Random(seed)
+    return [
+        {
+            "name": f"LENS-{i:07d}",
+            "focal_length": round(rnd.uniform(4, 100), 1),
+            "mount": rnd.choice(["C", "CS", "F"]),
+            "max_image_circle": rnd.choice([8, 11, 16, 22, 43]),
+            "aperture": rnd.choice([1.4, 2.0, 2.8, 4.0]),
+        }
+        for i in range(n)
+    ]
+
+
+# ------------------------------------------------------------
+# Mesure
+# ------------------------------------------------------------
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _repeat_for(n):
+    return 5 if n <= 1_000 else 3 if n <= 100_000 else 1
+
+
+def bench_optics(n, cameras):
+    px = [c["pixel_size_um"] for c in cameras]
+    rx = [c["resolution_x"] for c in cameras]
+    sensor = [p * r / 1000. for p, r in zip(px, rx)]
+
+    def scalar():
+        for s, r, p in zip(sensor, rx, px):
+            fov = compute_fov(s, 16.0, 400.0)
+            ppm = compute_px_per_mm(r, fov)
+            compute_min_detectable_defect(ppm)
+            compute_motion_blur(1.0, 1e-3, ppm, p)
+
+    sensor_a, rx_a, px_a = np.array(sensor), np.array(rx, dtype=np.float64), np.array(px)
+
+    def vectorized():
+        fov = optics_batch.compute_fov_batch(sensor_a, 16.0, 400.0)
+        ppm = optics_batch.compute_px_per_mm_batch(rx_a, fov)
+        optics_batch.compute_min_detectable_defect_batch(ppm)
+        optics_batch.compute_motion_blur_batch(1.0, 1e-3, ppm, px_a)
+
+    repeat = _repeat_for(n)
+    return {
+        f"optics.scalar[{n}]": best_time(scalar, repeat),
+        f"optics.batch[{n}]": best_time(vectorized, repeat),
+    }
+
+
+def bench_solver(n, cameras):
+    sensor = [c["pixel_size_um"] * c["resolution_x"] / 1000. for c in cameras]
+    locks = {"wd": True, "focal": True, "fov": False}
+
+    def closed_form():
+        for s in sensor:
+            solve({"wd": 400.0, "focal": 16.0, "fov": 0.0}, locks, s)
+
+    def dataflow():
+        # même résolution par le moteur générique (plan en cache) : référence
+        for s in sensor:
+            resolve({"sensor_width_mm": s, "wd": 400.0, "focal": 16.0, "fov": 0.0}, locks)
+
+    by_name = {c["name"]: c for c in cameras}
+    solver = CachedSolver(by_name, maxsize=max(len(by_name), 1))
+
+    def cached():
+        for name in by_name:
+            solver.solve(name, {"wd": 400.0, "focal": 16.0, "fov": 0.0}, locks)
+
+    cached()  # cache chaud : requêtes répétées de la GUI / des lots
+    repeat = _repeat_for(n)
+    return {
+        f"solver.solve[{n}]": best_time(closed_form, repeat),
+        f"solver.resolve[{n}]": best_time(dataflow, repeat),
+        f"solver.cached[{n}]": best_time(cached, repeat),
+    }
+
+
+def bench_catalog_io(n, cameras, workdir):
+    db = DatabaseManager(Path(workdir) / f"cameras_{n}.json", Path(workdir) / f"objectives_{n}.json")
+    cams = {c["name"]: c for c in cameras}
+    repeat = 3 if n <= 100_000 else 1
+    results = {
+        f"catalog.save[{n}]": best_time(lambda: db.save_cameras(cams), repeat),
+        f"catalog.load[{n}]": best_time(db.load_cameras, repeat),
+        f"catalog.load_columnar[{n}]": best_time(lambda: db.load_camera_catalog(mapped=False), repeat),
+    }
+    db.load_camera_catalog(mapped=True)  # compilation
+    results[f"catalog.load_mapped[{n}]"] = best_time(lambda: db.load_camera_catalog(mapped=True), repeat)
+    extra = {"name": "CAM-extra", "resolution_x": 640, "resolution_y": 480, "pixel_size_um": 5.6}
+    results[f"catalog.append[{n}]"] = best_time(lambda: db.append_camera(extra), repeat)
+    return results
+
+
+def run_suite(sizes=DEFAULT_SIZES, groups=("optics", "solver", "catalog"), progress=None):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in sizes:
+            cameras = synthetic_cameras(n)
+            if "optics" in groups:
+                results.update(bench_optics(n, cameras))
+            if "solver" in groups:
+                results.update(bench_solver(n, cameras))
+            if "catalog" in groups:
+                results.update(bench_catalog_io(n, cameras, workdir))
+            if progress is not None:
+                progress(n)
+    return {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+# ------------------------------------------------------------
+# Comparaison
+# ------------------------------------------------------------
+
+def compare(baseline, current, threshold=0.2, min_time=1e-4):
+    """
+    Renvoie une ligne par mesure commune : (clé, référence, actuel, ratio,
+    régression). Une régression est un ratio > 1 + threshold ; les mesures
+    plus courtes que min_time dans les deux runs sont ignorées (bruit).
+    """
+    rows = []
+    base, cur = baseline["results"], current["results"]
+    for key in sorted(base.keys() & cur.keys()):
+        before, after = base[key], cur[key]
+        ratio = after / before if before > 0 else float("inf")
+        noisy = before < min_time and after < min_time
+        rows.append((key, before, after, ratio, not noisy and ratio > 1 + threshold))
+    return rows
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(results, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, sort_keys=True)
@@ -0,0 +1,264 @@
+"""
+Headless command-line entry point (no PyQt import).
+
+    python . solve --camera "Sony IMX250 (5MP)" --lens "16mm f/2.8" --wd 200
+    python cli.py solve --camera "Sony IMX250 (5MP)" --focal 16 --fov 120 --speed 1 --exposure 0.001
+    python . batch stations.csv -o results.csv --workers 8
+    python . compile
+    python . import cameras vendor_cameras.csv --rejects rejected.jsonl
+    python . serve --port 8765
+    python . pareto --wd 100:1000:50 --criteria min_defect_mm,wd,fov --min-fov 80
+    python . cache stats
+    python . coverage --width 1600 --max-defect 0.2 --overlap 10 --wd-min 150 --wd-max 800
+
+Results are printed as JSON on stdout. Errors are printed as {"error": ...}
+with a non-zero exit code.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from services.database_manager import DatabaseManager, CAMERA_FILE, DATA_DIR, OBJECTIVE_FILE
+from services.solver import evaluate
+
+
+class CliError(Exception):
+    pass
+
+
+def open_db(args):
+    return DatabaseManager(Path(args.camera_file), Path(args.objective_file))
+
+
+def lookup(records, name, kind):
+    record = records.get(name)
+    if record is None:
+        raise CliError(f"Unknown {kind}: {name!r}")
+    return record
+
+
+def cmd_solve(args):
+    db = open_db(args)
+    camera = lookup(db.load_cameras(), args.camera, "camera")
+    focal = args.focal
+    lens = None
+    if args.lens is not None:
+        lens = lookup(db.load_objectives(), args.lens, "lens")
+        if focal is None:
+            focal = float(lens["focal_length"])
+    result = evaluate(
+        camera, wd=args.wd, focal=focal, fov=args.fov,
+        speed_m_s=args.speed, exposure_time_s=args.exposure,
+        required_pixels=args.required_pixels,
+    )
+    if lens is not None:
+        result["objective"] = lens["name"]
+    return result
+
+
+def cmd_batch(args):
+    from services.batch import run_batch
+
+    count = run_batch(
+        args.input, args.output, workers=args.workers, chunk_size=args.chunk_size,
+        camera_file=Path(args.camera_file), objective_file=Path(args.objective_file),
+    )
+    if args.output not in (None, "-"):
+        return {"rows": count, "output": args.output}
+    return None
+
+
+def cmd_compile(args):
+    # JSON catalogs -> memory-mapped binary files (cameras.occat / objectives.occat)
+    db = open_db(args)
+    cameras = db.load_camera_catalog(mapped=True)
+    objectives = db.load_objective_catalog(mapped=True)
+    return {"cameras": len(cameras), "objectives": len(objectives)}
+
+
+def cmd_import(args):
+    from services.importer import import_file
+
+    def progress(report):
+        print(f"  {report.rows} rows read, {report.imported} imported", file=sys.stderr)
+
+    report = import_file(
+        open_db(args), args.kind, args.input, update=args.update,
+        batch_size=args.batch_size, compact=not args.no_compact, progress=progress,
+    )
+    if args.rejects:
+        with open(args.rejects, "w", encoding="utf-8") as f:
+            for row, name, reason in report.rejected:
+                f.write(json.dumps({"row": row, "name": name, "reason": reason}) + "\n")
+    return report.as_dict()
+
+
+def cmd_serve(args):
+    # NumPy + asyncio server: imported only for this command
+    from services.server import run
+
+    def ready(server):
+        host, port = server.sockets[0].getsockname()[:2]
+        print(json.dumps({"listening": f"http://{host}:{port}"}), flush=True)
+
+    run(args.host, args.port, Path(args.camera_file), Path(args.objective_file),
+        refresh_interval=args.refresh, ready=ready)
+    return None
+
+
+def parse_wd_range(text):
+    # "100:1000:50" -> 50 values from 100 to 1000 mm; "200" -> one value
+    parts = [float(p) for p in text.split(":")]
+    if len(parts) == 1:
+        return parts
+    if len(parts) != 3 or parts[2] < 1:
+        raise CliError(f"Invalid WD range {text!r} (use start:stop:count)")
+    start, stop, count = parts
+    step = (stop - start) / max(int(count) - 1, 1)
+    return [start + i * step for i in range(int(count))]
+
+
+def open_cache(args):
+    from services.result_cache import ResultCache
+
+    return ResultCache(Path(args.cache_file), max_bytes=args.cache_size_mb * 1024 * 1024)
+
+
+def cmd_pareto(args):
+    # NumPy: imported only for this command
+    from services.pareto import configuration_front
+    from services.result_cache import cached_front
+
+    db = open_db(args)
+    query = dict(
+        wd_mm=parse_wd_range(args.wd), criteria=tuple(c.strip() for c in args.criteria.split(",") if c.strip()),
+        speed_m_s=args.speed, exposure_time_s=args.exposure, required_pixels=args.required_pixels,
+        max_defect_mm=args.max_defect, max_blur_px=args.max_blur,
+        min_fov_mm=args.min_fov, max_fov_mm=args.max_fov,
+        compatible_only=not args.all_pairs,
+    )
+    if args.no_cache:
+        front = configuration_front(cameras=db.load_camera_catalog(), objectives=db.load_objective_catalog(), **query)
+    else:
+        # same query on the same catalog content: read back from the result cache
+        with open_cache(args) as cache:
+            front = cached_front(cache, db, **query)
+    return front[:args.limit] if args.limit else front
+
+
+def cmd_coverage(args):
+    # NumPy: imported only for this command
+    from services.coverage import plan_coverage
+
+    db = open_db(args)
+    return plan_coverage(
+        args.width, args.max_defect, overlap_pct=args.overlap, wd_min_mm=args.wd_min, wd_max_mm=args.wd_max,
+        required_pixels=args.required_pixels, preferred_wd_mm=args.preferred_wd, max_cameras=args.max_cameras,
+        top_n=args.top, cameras=db.load_camera_catalog(), objectives=db.load_objective_catalog(),
+        compatible_only=not args.all_pairs,
+    )
+
+
+def cmd_cache(args):
+    with open_cache(args) as cache:
+        if args.action == "clear":
+            return {"removed": cache.clear()}
+        return cache.stats()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="optical-configurator", description="Optical configurator (headless)")
+    parser.add_argument("--camera-file", default=str(CAMERA_FILE))
+    parser.add_argument("--objective-file", default=str(OBJECTIVE_FILE))
+    parser.add_argument("--indent", type=int, default=None, help="pretty-print the JSON output")
+    parser.add_argument("--cache-file", default=str(DATA_DIR / "results_cache.sqlite3"),
+                        help="persistent result cache (pareto)")
+    parser.add_argument("--cache-size-mb", type=int, default=256, help="result cache size bound (LRU eviction)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    solve = sub.add_parser("solve", help="solve WD / focal / FOV for one camera (+ lens)")
+    solve.add_argument("--camera", required=True)
+    solve.add_argument("--lens", help="objective name (sets the focal length unless --focal is given)")
+    solve.add_argument("--wd", type=float, help="working distance (mm)")
+    solve.add_argument("--focal", type=float, help="focal length (mm)")
+    solve.add_argument("--fov", type=float, help="horizontal FOV (mm)")
+    solve.add_argument("--speed", type=float, help="object speed (m/s)")
+    solve.add_argument("--exposure", type=float, help="exposure time (s)")
+    solve.add_argument("--required-pixels", type=int, default=3)
+    solve.set_defaults(func=cmd_solve)
+
+    batch = sub.add_parser("batch", help="evaluate every station of a CSV/JSONL file")
+    batch.add_argument("input", help=".csv or .jsonl file, one station per row")
+    batch.add_argument("-o", "--output", help=".csv or .jsonl file (JSONL on stdout by default)")
+    batch.add_argument("--workers", type=int, default=0, help="worker processes (0 = in-process)")
+    batch.add_argument("--chunk-size", type=int, default=1000, help="rows per worker task")
+    batch.set_defaults(func=cmd_batch)
+
+    compile_ = sub.add_parser("compile", help="compile the JSON catalogs to memory-mapped binary files")
+    compile_.set_defaults(func=cmd_compile)
+
+    import_ = sub.add_parser("import", help="bulk import a vendor CSV/JSONL/JSON list into the catalog")
+    import_.add_argument("kind", choices=["cameras", "objectives"])
+    import_.add_argument("input", help=".csv, .jsonl or .json file, one model per row")
+    import_.add_argument("--update", action="store_true", help="replace models already in the catalog")
+    import_.add_argument("--batch-size", type=int, default=5000, help="rows per journal write")
+    import_.add_argument("--no-compact", action="store_true", help="leave the rows in the journal")
+    import_.add_argument("--rejects", help="write every rejected row (JSONL) to this file")
+    import_.set_defaults(func=cmd_import)
+
+    serve = sub.add_parser("serve", help="local JSON-over-HTTP service (solve, evaluate, catalog lookup)")
+    serve.add_argument("--host", default="127.0.0.1", help="bind address (localhost by default)")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--refresh", type=float, default=2.0, help="catalog re-read interval (s, 0 = never)")
+    serve.set_defaults(func=cmd_serve)
+
+    pareto = sub.add_parser("pareto", help="Pareto-optimal camera × lens × WD configurations of the catalog")
+    pareto.add_argument("--wd", default="50:1000:40", help="candidate WDs (mm): start:stop:count or one value")
+    pareto.add_argument("--criteria", default="min_defect_mm,wd,fov",
+                        help="comma-separated: min_defect_mm, wd, fov, blur_px, px_per_mm")
+    pareto.add_argument("--speed", type=float, help="object speed (m/s)")
+    pareto.add_argument("--exposure", type=float, help="exposure time (s)")
+    pareto.add_argument("--required-pixels", type=int, default=3)
+    pareto.add_argument("--max-defect", type=float, help="constraint: min defect (mm)")
+    pareto.add_argument("--max-blur", type=float, help="constraint: blur (px)")
+    pareto.add_argument("--min-fov", type=float, help="constraint: FOV (mm)")
+    pareto.add_argument("--max-fov", type=float, help="constraint: FOV (mm)")
+    pareto.add_argument("--all-pairs", action="store_true", help="include incompatible camera / lens pairs")
+    pareto.add_argument("--limit", type=int, default=0, help="print at most this many configurations")
+    pareto.add_argument("--no-cache", action="store_true", help="always recompute (result cache untouched)")
+    pareto.set_defaults(func=cmd_pareto)
+
+    coverage = sub.add_parser("coverage", help="fewest identical cameras side by side to cover a wide part / web")
+    coverage.add_argument("--width", type=float, required=True, help="part / web width (mm)")
+    coverage.add_argument("--max-defect", type=float, required=True, help="required min defect (mm)")
+    coverage.add_argument("--overlap", type=float, default=10.0, help="overlap between neighbours (%% of FOV)")
+    coverage.add_argument("--wd-min", type=float, default=0.0, help="working distance limits (mm)")
+    coverage.add_argument("--wd-max", type=float, default=1000.0)
+    coverage.add_argument("--preferred-wd", type=float, help="tie-break (mm, middle of the range by default)")
+    coverage.add_argument("--required-pixels", type=int, default=3)
+    coverage.add_argument("--max-cameras", type=int, help="give up above this many cameras")
+    coverage.add_argument("--top", type=int, default=10, help="number of camera / lens / WD choices")
+    coverage.add_argument("--all-pairs", action="store_true", help="include incompatible camera / lens pairs")
+    coverage.set_defaults(func=cmd_coverage)
+
+    cache = sub.add_parser("cache", help="persistent result cache: hit-rate stats or clear")
+    cache.add_argument("action", choices=["stats", "clear"])
+    cache.set_defaults(func=cmd_cache)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        result = args.func(args)
+    except (CliError, ValueError, KeyError, TypeError, ZeroDivisionError) as e:
+        print(json.dumps({"error": str(e)}))
+        return 1
+    if result is not None:
+        print(json.dumps(result, indent=args.indent))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
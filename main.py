@@ -1,18 +1,99 @@
+import json
+import os
 import sys
+import time
+
+# startup is measured from here: the PyQt / services imports are part of it
+START = time.perf_counter()
+
+# --profile[=file.json]: same as OPTICAL_CONFIGURATOR_PROFILE, must be set
+# before the services are imported (timing decorators are applied at import)
+for arg in sys.argv[1:]:
+    if arg == "--profile" or arg.startswith("--profile="):
+        os.environ["OPTICAL_CONFIGURATOR_PROFILE"] = arg.partition("=")[2] or "stderr"
+        sys.argv.remove(arg)
+
+# --startup-report[=budget_ms]: print the startup times (JSON) once the window
+# is usable and quit; exit code 1 if ready_ms exceeds the budget
+STARTUP_REPORT = False
+STARTUP_BUDGET_MS = None
+for arg in sys.argv[1:]:
+    if arg == "--startup-report" or arg.startswith("--startup-report="):
+        STARTUP_REPORT = True
+        budget = arg.partition("=")[2]
+        STARTUP_BUDGET_MS = float(budget) if budget else None
+        sys.argv.remove(arg)
+
+from PyQt6.QtCore import QEvent, QTimer
 from PyQt6.QtWidgets import QApplication
+
+from services.instrumentation import enabled, record, span
 from ui.main_window import MainWindow
 
 
+class ProfilingApplication(QApplication):
+    # time spent dispatching repaint / layout events (only when profiling)
+    TIMED_EVENTS = {
+        QEvent.Type.Paint: "qt.paint",
+        QEvent.Type.UpdateRequest: "qt.update_request",
+        QEvent.Type.LayoutRequest: "qt.layout_request",
+    }
+
+    def notify(self, receiver, event):
+        name = self.TIMED_EVENTS.get(event.type())
+        if name is None:
+            return super().notify(receiver, event)
+        with span(name):
+            return super().notify(receiver, event)
+
+
+class StartupClock:
+    """
+    Time from process start to the first paint and to a usable window
+    (catalog loaded, first camera shown). Always measured, recorded in the
+    profile histograms, printed by --startup-report.
+    """
+
+    def __init__(self, app, report=False, budget_ms=None):
+        self.app = app
+        self.report = report
+        self.budget_ms = budget_ms
+        self.marks = {}
+
+    def mark(self, name):
+        seconds = time.perf_counter() - START
+        self.marks[f"{name}_ms"] = round(seconds * 1000, 1)
+        record(f"startup.to_{name}", seconds)
+
+    def on_ready(self):
+        self.mark("ready")
+        if not self.report:
+            return
+        report = dict(self.marks)
+        over = False
+        if self.budget_ms is not None:
+            report["budget_ms"] = self.budget_ms
+            over = report["ready_ms"] > self.budget_ms
+        print(json.dumps(report))
+        self.app.exit(1 if over else 0)
+
+
 def main():
-    app = QApplication(sys.argv)
+    with span("startup.qapplication"):
+        app = ProfilingApplication(sys.argv) if enabled() else QApplication(sys.argv)
 
-    window = MainWindow()
-    window.show()
+    clock = StartupClock(app, STARTUP_REPORT, STARTUP_BUDGET_MS)
+    with span("startup.main_window"):
+        window = MainWindow(watch_catalog=not STARTUP_REPORT)
+    window.ready.connect(clock.on_ready)
+    # first pass of the event loop: the window has been painted (queued ahead
+    # of the window's deferred startup work, scheduled by show())
+    QTimer.singleShot(0, lambda: clock.mark("first_paint"))
+    with span("startup.show"):
+        window.show()
 
     sys.exit(app.exec())
 
-    
-
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,225 @@
+# services/batch.py
+"""
+Évaluation en lot de postes d'inspection (CSV / JSONL → CSV / JSONL).
+
+Une ligne d'entrée = un poste :
+    camera, lens, wd, focal, fov, speed_m_s, exposure_time_s, required_pixels
+(lens et les champs vides sont optionnels ; deux parmi wd / focal / fov,
+ou la focale de l'objectif, sont nécessaires).
+
+Tout est fait en flux (générateurs) : la mémoire reste constante quelle que
+soit la taille du fichier. En mode multi-processus, les lignes sont envoyées
+par blocs de chunk_size avec un nombre borné de blocs en vol, et les
+résultats sont écrits dans l'ordre d'entrée au fur et à mesure.
+"""
+
+import csv
+import json
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from services.database_manager import DatabaseManager, CAMERA_FILE, OBJECTIVE_FILE
+from services.solver import CachedSolver, evaluate
+
+OUTPUT_FIELDS = [
+    "row", "camera", "objective", "wd", "focal", "fov",
+    "px_per_mm", "min_defect_mm",
+    "blur_object_mm", "blur_sensor_um", "blur_px",
+    "error",
+]
+
+# alias acceptés dans les fichiers d'entrée
+_ALIASES = {
+    "objective": "lens",
+    "speed": "speed_m_s",
+    "exposure": "exposure_time_s",
+    "exposure_s": "exposure_time_s",
+}
+_FLOAT_FIELDS = ("wd", "focal", "fov", "speed_m_s", "exposure_time_s")
+
+
+def _format(path):
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Unsupported file format: {path} (use .csv or .jsonl)")
+
+
+class InvalidRow:
+    """
+    Ligne illisible du fichier d'entrée (JSON invalide, pas un objet) :
+    signalée comme une ligne en erreur, sans interrompre la lecture.
+    """
+
+    def __init__(self, line, error):
+        self.line = line  # numéro de ligne dans le fichier (1 = première)
+        self.error = error
+
+    def __str__(self):
+        return f"line {self.line}: {self.error}"
+
+
+def read_rows(path):
+    """
+    Générateur de lignes (dicts) depuis un fichier CSV ou JSONL ; une ligne
+    JSONL illisible donne un InvalidRow.
+    """
+    fmt = _format(path)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield InvalidRow(number, f"invalid JSON ({e})")
+                    continue
+                if not isinstance(row, dict):
+                    yield InvalidRow(number, f"not an object: {type(row).__name__}")
+                    continue
+                yield row
+
+
+def _optional_float(value):
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def parse_row(row, cameras, objectives):
+    """
+    Ligne → (caméra, arguments de evaluate(), objectif ou None).
+    ValueError / KeyError / TypeError si la ligne est invalide.
+    """
+    row = {_ALIASES.get(key, key): value for key, value in row.items()}
+    camera = cameras.get(row.get("camera"))
+    if camera is None:
+        raise ValueError(f"Unknown camera: {row.get('camera')!r}")
+    values = {key: _optional_float(row.get(key)) for key in _FLOAT_FIELDS}
+    objective = row.get("lens") or None
+    if objective:
+        lens = objectives.get(objective)
+        if lens is None:
+            raise ValueError(f"Unknown lens: {objective!r}")
+        if values["focal"] is None:
+            values["focal"] = float(lens["focal_length"])
+    required_pixels = row.get("required_pixels")
+    values["required_pixels"] = int(required_pixels) if required_pixels not in (None, "") else 3
+    return camera, values, objective
+
+
+def evaluate_row(row, cameras, objectives, solver=None):
+    """
+    Évalue une ligne ; les erreurs sont renvoyées dans le champ "error".
+    solver : CachedSolver du catalogue, partagé par toutes les lignes.
+    """
+    if not isinstance(row, dict):
+        error = row if isinstance(row, InvalidRow) else f"not an object: {type(row).__name__}"
+        return {"camera": None, "objective": None, "error": str(error)}
+    aliased = {_ALIASES.get(key, key): value for key, value in row.items()}
+    result = {"camera": aliased.get("camera"), "objective": aliased.get("lens") or None}
+    try:
+        camera, values, _ = parse_row(row, cameras, objectives)
+        result.update(evaluate(camera, solver=solver, **values))
+    except (ValueError, KeyError, TypeError, ZeroDivisionError) as e:
+        # ex. focale ou wd à 0 : la ligne est en erreur, pas tout le lot
+        result["error"] = str(e)
+    return result
+
+
+def iter_results(rows, cameras, objectives):
+    # les balayages répètent les mêmes (caméra, wd, focale, fov) : solve() mémoïsé
+    solver = CachedSolver(cameras)
+    for i, row in enumerate(rows):
+        yield {"row": i, **evaluate_row(row, cameras, objectives, solver)}
+
+
+# ------------------------------------------------------------
+# Pool de processus
+# ------------------------------------------------------------
+
+_worker_catalog = None
+
+
+def _init_worker(camera_file, objective_file):
+    # catalogue chargé une fois par processus, pas à chaque bloc
+    global _worker_catalog
+    db = DatabaseManager(Path(camera_file), Path(objective_file))
+    cameras = db.load_cameras()
+    _worker_catalog = (cameras, db.load_objectives(), CachedSolver(cameras))
+
+
+def _evaluate_chunk(start, rows):
+    cameras, objectives, solver = _worker_catalog
+    return [{"row": i, **evaluate_row(row, cameras, objectives, solver)} for i, row in enumerate(rows, start)]
+
+
+def iter_results_parallel(rows, camera_file, objective_file, workers, chunk_size=1000):
+    """
+    Comme iter_results, réparti sur `workers` processus.
+    Au plus 2 × workers blocs sont en vol : la lecture suit l'écriture.
+    """
+    rows = iter(rows)
+    pending = deque()
+    start = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(str(camera_file), str(objective_file))) as pool:
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                pending.append(pool.submit(_evaluate_chunk, start, chunk))
+                start += len(chunk)
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+# ------------------------------------------------------------
+# Écriture
+# ------------------------------------------------------------
+
+def write_results(results, out, fmt):
+    """
+    Écrit les résultats au fil de l'eau ; renvoie le nombre de lignes.
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for result in results:
+            writer.writerow(result)
+            count += 1
+    else:
+        for result in results:
+            out.write(json.dumps(result) + "\n")
+            count += 1
+    return count
+
+
+def run_batch(input_path, output_path=None, workers=0, chunk_size=1000,
+              camera_file: Path = CAMERA_FILE, objective_file: Path = OBJECTIVE_FILE):
+    """
+    input_path → output_path (stdout en JSONL si None ou "-").
+    workers <= 1 : évaluation dans le processus courant.
+    """
+    rows = read_rows(input_path)
+    if workers and workers > 1:
+        results = iter_results_parallel(rows, camera_file, objective_file, workers, chunk_size)
+    else:
+        db = DatabaseManager(Path(camera_file), Path(objective_file))
+        results = iter_results(rows, db.load_cameras(), db.load_objectives())
+
+    if output_path in (None, "-"):
+        return write_results(results, sys.stdout, "jsonl")
+    with open(output_path, "w", encoding="utf-8", newline="") as out:
+        return write_results(results, out, _format(output_path))
@@ -0,0 +1,236 @@
+# services/catalog.py
+"""
+Catalogue compact en colonnes (tableaux structurés NumPy).
+
+Les champs numériques sont stockés dans un tableau structuré (une ligne par
+enregistrement, ~50 octets), les champs à faible cardinalité (shutter,
+mount) sous forme de codes entiers + table de catégories, le texte libre
+dans une liste. Un dict name → ligne permet les accès par nom.
+
+Les colonnes (catalog.column("focal_length"), ...) sont des vues sans copie,
+directement utilisables par optics_batch.
+"""
+
+import numpy as np
+
+from services.database_manager import normalize_camera, normalize_objective
+
+_MISSING_INT = 0
+
+
+class ColumnarCatalog:
+    # (champ, dtype) stockés tels quels
+    NUMERIC = []
+    # champs calculés une fois à l'insertion
+    DERIVED = []
+    # champs codés en entiers (catégories)
+    CATEGORICAL = []
+    # texte libre
+    TEXT = []
+    normalize = staticmethod(lambda record: record)
+    # vrai pour un catalogue adossé à un fichier mappé (catalog_binary)
+    read_only = False
+
+    def __init__(self, capacity=0):
+        self.dtype = np.dtype(
+            list(self.NUMERIC) + list(self.DERIVED) + [(field, np.int16) for field in self.CATEGORICAL]
+        )
+        self._data = np.zeros(capacity, dtype=self.dtype)
+        self._size = 0
+        self.names = []
+        self.index = {}
+        self.categories = {field: [] for field in self.CATEGORICAL}
+        self._codes = {field: {} for field in self.CATEGORICAL}
+        self.text = {field: [] for field in self.TEXT}
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Construit le catalogue à partir d'enregistrements déjà normalisés.
+        En cas de doublon de nom, le dernier l'emporte (comme les dicts
+        de DatabaseManager).
+        """
+        unique = {}
+        for record in records:
+            unique[record["name"]] = record
+        records = list(unique.values())
+
+        catalog = cls(capacity=len(records))
+        catalog.names = list(unique)
+        catalog.index = {name: row for row, name in enumerate(catalog.names)}
+        catalog._size = len(records)
+        for field, dtype in cls.NUMERIC:
+            missing = np.nan if np.dtype(dtype).kind == "f" else _MISSING_INT
+            catalog._data[field] = [missing if (v := r.get(field)) is None else v for r in records]
+        for field in cls.CATEGORICAL:
+            catalog._data[field] = [catalog._code(field, r.get(field)) for r in records]
+        for field in cls.TEXT:
+            catalog.text[field] = [r.get(field) or "" for r in records]
+        catalog._derive(slice(0, catalog._size))
+        return catalog
+
+    @classmethod
+    def from_columns(cls, data, names, index, categories, text):
+        """
+        Catalogue en lecture seule sur des colonnes existantes (ex. vues
+        d'un fichier mappé en mémoire) : aucune copie.
+        """
+        catalog = cls.__new__(cls)
+        catalog.dtype = data.dtype
+        catalog._data = data
+        catalog._size = len(data)
+        catalog.names = names
+        catalog.index = index
+        catalog.categories = categories
+        catalog._codes = {field: {v: i for i, v in enumerate(values)} for field, values in categories.items()}
+        catalog.text = text
+        catalog.read_only = True
+        return catalog
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, name):
+        return name in self.index
+
+    @property
+    def data(self):
+        return self._data[:self._size]
+
+    def column(self, field):
+        return self._data[field][:self._size]
+
+    def row(self, name):
+        return self.index[name]
+
+    def category(self, field, row):
+        code = self._data[field][row]
+        return self.categories[field][code] if code >= 0 else None
+
+    def record(self, name_or_row):
+        row = self.index[name_or_row] if isinstance(name_or_row, str) else name_or_row
+        values = self._data[row]
+        record = {"name": self.names[row]}
+        for field, dtype in self.NUMERIC:
+            value = values[field].item()
+            if np.dtype(dtype).kind == "f":
+                record[field] = None if np.isnan(value) else value
+            else:
+                record[field] = None if value == _MISSING_INT else value
+        for field in self.CATEGORICAL:
+            record[field] = self.category(field, row)
+        for field in self.TEXT:
+            record[field] = self.text[field][row]
+        return record
+
+    def append(self, record):
+        """
+        Ajoute (ou remplace) un enregistrement ; coût amorti O(1).
+        Renvoie l'indice de ligne.
+        """
+        if self.read_only:
+            raise TypeError("This catalog is read-only (memory-mapped).")
+        record = self.normalize(record)
+        if record["name"] not in self.index and self._size == len(self._data):
+            self._grow()
+        row = self._set(record)
+        self._derive(slice(row, row + 1))
+        return row
+
+    def remove(self, name):
+        if self.read_only:
+            raise TypeError("This catalog is read-only (memory-mapped).")
+        row = self.index.pop(name)
+        self._data = np.delete(self._data[:self._size], row)
+        self._size -= 1
+        del self.names[row]
+        for field in self.TEXT:
+            del self.text[field][row]
+        for i in range(row, self._size):
+            self.index[self.names[i]] = i
+
+    def _grow(self):
+        data = np.zeros(max(16, 2 * len(self._data)), dtype=self.dtype)
+        data[:self._size] = self._data[:self._size]
+        self._data = data
+
+    def _code(self, field, value):
+        if value in (None, ""):
+            return -1
+        codes = self._codes[field]
+        if value not in codes:
+            codes[value] = len(self.categories[field])
+            self.categories[field].append(value)
+        return codes[value]
+
+    def _set(self, record):
+        name = record["name"]
+        row = self.index.get(name)
+        if row is None:
+            row = self._size
+            self._size += 1
+            self.index[name] = row
+            self.names.append(name)
+            for field in self.TEXT:
+                self.text[field].append("")
+        values = self._data[row]
+        for field, dtype in self.NUMERIC:
+            value = record.get(field)
+            if value is None:
+                value = np.nan if np.dtype(dtype).kind == "f" else _MISSING_INT
+            values[field] = value
+        for field in self.CATEGORICAL:
+            values[field] = self._code(field, record.get(field))
+        for field in self.TEXT:
+            self.text[field][row] = record.get(field) or ""
+        return row
+
+    def _derive(self, rows):
+        pass
+
+
+class CameraCatalog(ColumnarCatalog):
+    NUMERIC = [
+        ("resolution_x", np.int32),
+        ("resolution_y", np.int32),
+        ("pixel_size_um", np.float64),
+    ]
+    DERIVED = [
+        ("sensor_width_mm", np.float64),
+        ("sensor_height_mm", np.float64),
+        ("sensor_diagonal_mm", np.float64),
+    ]
+    CATEGORICAL = ["shutter", "mount"]
+    TEXT = ["notes"]
+    normalize = staticmethod(normalize_camera)
+
+    def _derive(self, rows):
+        data = self._data[rows]
+        width = (data["pixel_size_um"] * data["resolution_x"]) / 1000.
+        height = (data["pixel_size_um"] * data["resolution_y"]) / 1000.
+        self._data["sensor_width_mm"][rows] = width
+        self._data["sensor_height_mm"][rows] = height
+        self._data["sensor_diagonal_mm"][rows] = np.hypot(width, height)
+
+
+class ObjectiveCatalog(ColumnarCatalog):
+    NUMERIC = [
+        ("focal_length", np.float64),
+        ("max_image_circle", np.float64),
+        ("aperture", np.float64),
+    ]
+    CATEGORICAL = ["mount"]
+    normalize = staticmethod(normalize_objective)
+
+
+def as_camera_catalog(cameras):
+    # accepte un CameraCatalog ou un dict {name: record} de DatabaseManager
+    if isinstance(cameras, CameraCatalog):
+        return cameras
+    return CameraCatalog.from_records(map(normalize_camera, cameras.values()))
+
+
+def as_objective_catalog(objectives):
+    if isinstance(objectives, ObjectiveCatalog):
+        return objectives
+    return ObjectiveCatalog.from_records(map(normalize_objective, objectives.values()))
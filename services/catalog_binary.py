@@ -0,0 +1,253 @@
+# services/catalog_binary.py
+"""
+Format binaire colonne du catalogue, chargé par mmap.
+
+cameras.json (+ journal) est compilé en cameras.occat :
+
+    [0:8]    magic b"OPTCAT\\0\\0"
+    [8:12]   version (u32)
+    [12:16]  taille H de l'en-tête (u32)
+    [16:16+H] en-tête JSON : classe, nb de lignes, dtype, catégories,
+             signature de la source, sections (offset, taille)
+    puis, alignées sur 64 octets :
+    - data          : tableau structuré NumPy (colonnes numériques + codes)
+    - <col>.offsets : int64[n+1] ; <col>.blob : chaînes UTF-8 concaténées
+      (names + champs texte)
+    - names.order   : lignes triées par nom (recherche dichotomique)
+
+Le chargement ne parse rien : les colonnes sont des vues np.frombuffer sur
+le mmap (zéro copie, pages partagées entre processus) et les chaînes sont
+décodées à la demande. Le fichier est reconstruit automatiquement quand la
+signature de cameras.json / cameras.json.log ne correspond plus.
+"""
+
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+import numpy as np
+
+from services.catalog import CameraCatalog, ObjectiveCatalog
+
+MAGIC = b"OPTCAT\0\0"
+VERSION = 1
+SUFFIX = ".occat"
+_ALIGN = 64
+_PREFIX = struct.Struct("<8sII")
+
+
+def _align(n):
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def source_signature(journal):
+    # (mtime_ns, taille) de la base et du journal : toute écriture la change
+    signature = []
+    for path in (journal.path, journal.log_path):
+        try:
+            st = os.stat(path)
+            signature.append([st.st_mtime_ns, st.st_size])
+        except FileNotFoundError:
+            signature.append(None)
+    return signature
+
+
+def compiled_path(journal):
+    return journal.path.with_suffix(SUFFIX)
+
+
+# ------------------------------------------------------------
+# Écriture
+# ------------------------------------------------------------
+
+def _string_sections(name, strings):
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return {f"{name}.offsets": offsets.tobytes(), f"{name}.blob": b"".join(encoded)}, encoded
+
+
+def write_catalog(catalog, path: Path, signature=None):
+    """
+    Écrit `catalog` (CameraCatalog / ObjectiveCatalog) au format binaire,
+    via un fichier temporaire + os.replace : les processus qui ont déjà
+    mappé l'ancien fichier le gardent intact.
+    """
+    sections = {"data": np.ascontiguousarray(catalog.data).tobytes()}
+    names, encoded = _string_sections("names", catalog.names)
+    sections.update(names)
+    order = sorted(range(len(encoded)), key=encoded.__getitem__)
+    sections["names.order"] = np.array(order, dtype="<i8").tobytes()
+    for field in catalog.TEXT:
+        sections.update(_string_sections(field, catalog.text[field])[0])
+
+    layout, offset = {}, 0
+    for key, blob in sections.items():
+        layout[key] = [offset, len(blob)]
+        offset = _align(offset + len(blob))
+    header = json.dumps({
+        "class": type(catalog).__name__,
+        "rows": len(catalog),
+        "dtype": [list(field) for field in catalog.data.dtype.descr],
+        "categories": catalog.categories,
+        "text": list(catalog.TEXT),
+        "source": signature,
+        "sections": layout,
+    }).encode("utf-8")
+
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(_PREFIX.pack(MAGIC, VERSION, len(header)))
+            f.write(header)
+            base = _align(_PREFIX.size + len(header))
+            for key, blob in sections.items():
+                f.seek(base + layout[key][0])
+                f.write(blob)
+            f.truncate(base + offset)
+        os.replace(tmp, path)
+    except BaseException:
+        if tmp.exists():
+            tmp.unlink()
+        raise
+
+
+# ------------------------------------------------------------
+# Lecture (mmap)
+# ------------------------------------------------------------
+
+class StringColumn(Sequence):
+    """
+    Colonne de chaînes décodées à la demande depuis le mmap.
+    """
+
+    def __init__(self, buf, offsets, start):
+        self._view = memoryview(buf)
+        self._offsets = offsets
+        self._start = start
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def raw(self, i):
+        a = self._start + int(self._offsets[i])
+        b = self._start + int(self._offsets[i + 1])
+        return bytes(self._view[a:b])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if isinstance(i, (int, np.integer)):
+            if i < 0:
+                i += len(self)
+            if not 0 <= i < len(self):
+                raise IndexError(i)
+            return self.raw(i).decode("utf-8")
+        # tableau d'indices (fancy indexing)
+        return [self[int(j)] for j in i]
+
+
+class NameIndex(Mapping):
+    """
+    name → ligne par recherche dichotomique sur names.order (pas de dict).
+    """
+
+    def __init__(self, names, order):
+        self._names = names
+        self._order = order
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __getitem__(self, name):
+        key = name.encode("utf-8")
+        lo, hi = 0, len(self._order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._names.raw(int(self._order[mid])) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._order):
+            row = int(self._order[lo])
+            if self._names.raw(row) == key:
+                return row
+        raise KeyError(name)
+
+
+_CLASSES = {cls.__name__: cls for cls in (CameraCatalog, ObjectiveCatalog)}
+
+
+def read_header(path: Path):
+    with open(path, "rb") as f:
+        magic, version, size = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled catalog.")
+        if version != VERSION:
+            return None
+        return json.loads(f.read(size))
+
+
+def open_catalog(path: Path):
+    """
+    Mappe un fichier .occat ; renvoie un CameraCatalog / ObjectiveCatalog
+    en lecture seule dont les colonnes pointent dans le mmap.
+    """
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, size = _PREFIX.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: unsupported compiled catalog.")
+    header = json.loads(bytes(buf[_PREFIX.size:_PREFIX.size + size]))
+    base = _align(_PREFIX.size + size)
+    sections = header["sections"]
+    rows = header["rows"]
+
+    def array(key, dtype, count):
+        return np.frombuffer(buf, dtype=dtype, count=count, offset=base + sections[key][0])
+
+    def strings(name):
+        return StringColumn(buf, array(f"{name}.offsets", "<i8", rows + 1), base + sections[f"{name}.blob"][0])
+
+    dtype = np.dtype([tuple(field) for field in header["dtype"]])
+    data = array("data", dtype, rows)
+    names = strings("names")
+    index = NameIndex(names, array("names.order", "<i8", rows))
+    text = {field: strings(field) for field in header["text"]}
+    return _CLASSES[header["class"]].from_columns(data, names, index, header["categories"], text)
+
+
+# ------------------------------------------------------------
+# Compilation automatique
+# ------------------------------------------------------------
+
+def load_compiled(journal, catalog_cls, normalize, path: Path = None):
+    """
+    Catalogue mappé pour `journal`, recompilé si la source JSON a changé
+    depuis la dernière compilation (ou si le fichier est absent / d'une
+    autre version).
+    """
+    path = compiled_path(journal) if path is None else Path(path)
+    signature = source_signature(journal)
+    header = None
+    if path.exists():
+        try:
+            header = read_header(path)
+        except (ValueError, struct.error):
+            header = None
+    if header is None or header.get("source") != signature or header.get("class") != catalog_cls.__name__:
+        catalog = catalog_cls.from_records(map(normalize, journal.read()))
+        try:
+            write_catalog(catalog, path, signature)
+        except PermissionError:
+            # Windows : impossible de remplacer un fichier mappé par un autre
+            # processus ; on sert la version en mémoire
+            return catalog
+    return open_catalog(path)
@@ -0,0 +1,202 @@
+# services/catalog_journal.py
+"""
+Écritures journalisées du catalogue JSON.
+
+- cameras.json reste la base (format inchangé) ;
+- chaque ajout est une ligne JSON ajoutée à cameras.json.log → O(1),
+  indépendant de la taille du catalogue ;
+- la compaction fusionne base + journal dans un fichier temporaire puis
+  fait un os.replace atomique, et vide le journal ; elle est déclenchée
+  automatiquement par l'ajout qui fait dépasser COMPACT_BYTES au journal,
+  pour que le coût d'une lecture ne croisse pas avec l'historique ;
+- toutes les opérations prennent un verrou exclusif (cameras.json.lock),
+  ce qui protège les accès depuis plusieurs postes sur un partage réseau.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# taille du journal au-delà de laquelle un ajout compacte (≈ 1000 fiches)
+COMPACT_BYTES = 256 * 1024
+
+
+@contextmanager
+def file_lock(lock_path: Path):
+    """
+    Verrou exclusif inter-processus sur lock_path (bloquant).
+    """
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class CatalogJournal:
+    def __init__(self, path: Path, key: str, compact_bytes=COMPACT_BYTES):
+        # key : clé de la liste dans le JSON ("cameras" / "objectives")
+        # compact_bytes : None / 0 → jamais de compaction automatique
+        self.path = Path(path)
+        self.key = key
+        self.compact_bytes = compact_bytes
+        self.log_path = self.path.with_name(self.path.name + ".log")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        # position de la dernière lecture : (signature de la base, offset du journal)
+        self.cursor = None
+
+    def append(self, record):
+        self.append_many([record])
+
+    def append_many(self, records):
+        lines = "".join(json.dumps(rec) + "\n" for rec in records)
+        if not lines:
+            return
+        with file_lock(self.lock_path):
+            with open(self.log_path, "a+b") as f:
+                # une ligne tronquée (crash pendant une écriture) ne doit pas
+                # absorber l'enregistrement suivant
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+                f.write(lines.encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+                size = f.tell()
+            if self.compact_bytes and size >= self.compact_bytes:
+                self._compact_unlocked()
+
+    def read(self):
+        """
+        Enregistrements de la base suivis de ceux du journal.
+        """
+        with file_lock(self.lock_path):
+            return self._read_unlocked()
+
+    def read_changes(self):
+        """
+        Lecture incrémentale depuis le dernier read() / read_changes().
+        Renvoie (records, full) : si la base a été remplacée (compaction,
+        save) ou le journal tronqué, full=True et records est le catalogue
+        complet ; sinon records ne contient que les lignes ajoutées au journal.
+        """
+        with file_lock(self.lock_path):
+            if self.cursor is None or self.cursor[0] != self._base_signature():
+                return self._read_unlocked(), True
+            offset = self.cursor[1]
+            try:
+                with open(self.log_path, "rb") as f:
+                    if f.seek(0, os.SEEK_END) < offset:
+                        return self._read_unlocked(), True
+                    f.seek(offset)
+                    tail = f.read()
+            except FileNotFoundError:
+                if offset:
+                    return self._read_unlocked(), True
+                tail = b""
+            records, consumed = self._parse_log(tail)
+            self.cursor = (self.cursor[0], offset + consumed)
+            return records, False
+
+    def rewrite(self, records):
+        """
+        Remplace tout le catalogue (écriture atomique) et vide le journal.
+        """
+        with file_lock(self.lock_path):
+            self._rewrite_unlocked(records)
+
+    def compact(self):
+        """
+        Fusionne le journal dans la base (un enregistrement par nom, le plus récent).
+        """
+        with file_lock(self.lock_path):
+            self._compact_unlocked()
+
+    def _compact_unlocked(self):
+        if not self.log_path.exists() or self.log_path.stat().st_size == 0:
+            return
+        merged = {rec["name"]: rec for rec in self._read_unlocked()}
+        self._rewrite_unlocked(merged.values())
+
+    def _base_signature(self):
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    def _parse_log(data: bytes):
+        # seules les lignes complètes sont consommées ; une ligne illisible
+        # (tronquée puis suivie d'un \n de réparation) est ignorée
+        end = data.rfind(b"\n") + 1
+        records = []
+        for line in data[:end].splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records, end
+
+    def _read_unlocked(self):
+        signature = self._base_signature()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                records = json.load(f).get(self.key, [])
+        except FileNotFoundError:
+            records = []
+        try:
+            with open(self.log_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        log_records, consumed = self._parse_log(data)
+        records.extend(log_records)
+        if data[consumed:]:
+            # ligne finale sans \n : enregistrement en cours d'écriture ou tronqué
+            try:
+                records.append(json.loads(data[consumed:]))
+            except ValueError:
+                pass
+        self.cursor = (signature, consumed)
+        return records
+
+    def _rewrite_unlocked(self, records):
+        import tempfile  # only needed on rewrite: keeps the headless CLI startup light
+
+        data = {self.key: list(records)}
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                mode = self.path.stat().st_mode & 0o777
+            except FileNotFoundError:
+                mode = 0o644
+            os.chmod(tmp, mode)  # mkstemp crée en 0600
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        with open(self.log_path, "w", encoding="utf-8"):
+            pass
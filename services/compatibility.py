@@ -0,0 +1,268 @@
+# services/compatibility.py
+"""
+Compatibilité caméra × objectif :
+- cercle d'image >= diagonale capteur (is_sensor_compatible) ;
+- même monture (une monture absente, côté caméra ou objectif, ne filtre pas).
+Un cercle d'image ou une diagonale inconnus ne filtrent pas non plus.
+
+CompatibilityIndex précalcule la matrice pour tout le catalogue sous forme
+de bitset (une ligne de bits par caméra, 8 objectifs par octet : 12,5 Mo
+pour 10 000 × 10 000) et la met à jour ligne / colonne à chaque ajout,
+modification ou suppression.
+"""
+
+import numpy as np
+
+from services.catalog import as_camera_catalog, as_objective_catalog
+from services.database_manager import normalize_camera, normalize_objective
+from services.optics_calculations import is_sensor_compatible
+
+
+def compatible(image_circle_mm, lens_mount, sensor_diagonal_mm, camera_mount):
+    """
+    Version vectorisée : cercles / diagonales en tableaux (NaN = inconnu),
+    montures en codes entiers d'un même espace (-1 = inconnue).
+    """
+    image_circle_mm = np.asarray(image_circle_mm, dtype=np.float64)
+    sensor_diagonal_mm = np.asarray(sensor_diagonal_mm, dtype=np.float64)
+    circle_ok = (
+        np.isnan(image_circle_mm) | np.isnan(sensor_diagonal_mm)
+        | is_sensor_compatible(image_circle_mm, sensor_diagonal_mm)
+    )
+    lens_mount, camera_mount = np.asarray(lens_mount), np.asarray(camera_mount)
+    mount_ok = (lens_mount < 0) | (camera_mount < 0) | (lens_mount == camera_mount)
+    return circle_ok & mount_ok
+
+
+def _mount_table(categories, codes):
+    # codes monture d'un catalogue → codes partagés (`codes` : {monture: code}) ;
+    # la dernière case sert aux montures absentes (code catalogue -1)
+    return np.array([codes.setdefault(mount, len(codes)) for mount in categories] + [-1], dtype=np.int32)
+
+
+def mount_codes(cameras, objectives, codes=None):
+    """
+    Codes monture des deux catalogues dans un même espace (-1 = inconnue) ;
+    `codes` ({monture: code}) est complété au passage.
+    """
+    codes = {} if codes is None else codes
+    lens = _mount_table(objectives.categories["mount"], codes)[objectives.column("mount").astype(np.int32)]
+    cam = _mount_table(cameras.categories["mount"], codes)[cameras.column("mount").astype(np.int32)]
+    return cam, lens
+
+
+def pair_mask(cameras, objectives, cam_rows, obj_rows):
+    """
+    Compatibilité des couples (cam_rows[k], obj_rows[k]) de deux catalogues
+    colonnes, sans Python par couple.
+    """
+    cam_mount, lens_mount = mount_codes(cameras, objectives)
+    return compatible(
+        objectives.column("max_image_circle")[obj_rows],
+        lens_mount[obj_rows],
+        cameras.column("sensor_diagonal_mm")[cam_rows],
+        cam_mount[cam_rows],
+    )
+
+
+# ------------------------------------------------------------
+# Index précalculé (bitset)
+# ------------------------------------------------------------
+
+class CompatibilityIndex:
+    """
+    index = CompatibilityIndex(db.load_cameras(), db.load_objectives())
+    index.compatible_objectives("Sony IMX250 (5MP)")  → [noms]
+    index.set_objective(record)                        → une colonne de bits
+    """
+
+    def __init__(self, cameras=None, objectives=None):
+        self.camera_names = []
+        self.camera_rows = {}
+        self.objective_names = []
+        self.objective_cols = {}
+        self._mounts = {}
+        # caractéristiques conservées pour calculer les lignes / colonnes ajoutées
+        self._diagonal = np.empty(0)
+        self._camera_mount = np.empty(0, dtype=np.int32)
+        self._circle = np.empty(0)
+        self._lens_mount = np.empty(0, dtype=np.int32)
+        self._bits = np.zeros((0, 0), dtype=np.uint8)
+        if cameras is not None and objectives is not None:
+            self.build(cameras, objectives)
+
+    def build(self, cameras, objectives):
+        """
+        Construction complète en une passe vectorisée (une ligne par caméra).
+        """
+        cameras = as_camera_catalog(cameras)
+        objectives = as_objective_catalog(objectives)
+        self.camera_names = list(cameras.names)
+        self.camera_rows = {name: row for row, name in enumerate(self.camera_names)}
+        self.objective_names = list(objectives.names)
+        self.objective_cols = {name: col for col, name in enumerate(self.objective_names)}
+        self._mounts = {}
+        self._camera_mount, self._lens_mount = mount_codes(cameras, objectives, self._mounts)
+        self._circle = np.array(objectives.column("max_image_circle"), dtype=np.float64)
+        self._diagonal = np.array(cameras.column("sensor_diagonal_mm"), dtype=np.float64)
+        matrix = compatible(
+            self._circle[None, :], self._lens_mount[None, :],
+            self._diagonal[:, None], self._camera_mount[:, None],
+        )
+        self._bits = np.packbits(matrix, axis=1).reshape(len(self.camera_names), -1)
+        # une colonne de caractéristiques par bit alloué
+        self._circle = _resize(self._circle, self._bits.shape[1] * 8, np.nan)
+        self._lens_mount = _resize(self._lens_mount, self._bits.shape[1] * 8, -1)
+
+    def __len__(self):
+        return len(self.camera_names)
+
+    # --------------------------
+    #   Requêtes
+    # --------------------------
+
+    def is_compatible(self, camera_name, objective_name):
+        row, col = self.camera_rows[camera_name], self.objective_cols[objective_name]
+        return bool(self._bits[row, col >> 3] & (0x80 >> (col & 7)))
+
+    def objective_mask(self, camera_name):
+        # booléens dans l'ordre de objective_names
+        row = self.camera_rows[camera_name]
+        return np.unpackbits(self._bits[row], count=len(self.objective_names)).astype(bool)
+
+    def compatible_objectives(self, camera_name):
+        names = self.objective_names
+        return [names[col] for col in np.flatnonzero(self.objective_mask(camera_name))]
+
+    def camera_mask(self, objective_name):
+        col = self.objective_cols[objective_name]
+        return (self._bits[:len(self.camera_names), col >> 3] & (0x80 >> (col & 7))) != 0
+
+    # --------------------------
+    #   Mises à jour incrémentales
+    # --------------------------
+
+    def set_camera(self, record):
+        """
+        Ajoute ou remplace une caméra : une seule ligne de bits recalculée.
+        """
+        record = normalize_camera(record)
+        name = record["name"]
+        row = self.camera_rows.get(name)
+        if row is None:
+            row = len(self.camera_names)
+            if row == self._bits.shape[0]:
+                self._grow(rows=max(16, 2 * row))
+            self.camera_rows[name] = row
+            self.camera_names.append(name)
+        self._diagonal[row] = _diagonal(record)
+        self._camera_mount[row] = self._mount_code(record.get("mount"))
+        self._set_row(row)
+
+    def set_objective(self, record):
+        """
+        Ajoute ou remplace un objectif : une seule colonne de bits recalculée.
+        """
+        record = normalize_objective(record)
+        name = record["name"]
+        col = self.objective_cols.get(name)
+        if col is None:
+            col = len(self.objective_names)
+            if col == self._bits.shape[1] * 8:
+                self._grow(cols=max(16, 2 * col))
+            self.objective_cols[name] = col
+            self.objective_names.append(name)
+        circle = record.get("max_image_circle")
+        self._circle[col] = np.nan if circle is None else circle
+        self._lens_mount[col] = self._mount_code(record.get("mount"))
+        self._set_column(col)
+
+    def remove_camera(self, name):
+        # la dernière ligne prend la place de la ligne supprimée
+        row = self.camera_rows.pop(name)
+        last = len(self.camera_names) - 1
+        if row != last:
+            moved = self.camera_names[last]
+            self.camera_names[row] = moved
+            self.camera_rows[moved] = row
+            self._bits[row] = self._bits[last]
+            self._diagonal[row] = self._diagonal[last]
+            self._camera_mount[row] = self._camera_mount[last]
+        self.camera_names.pop()
+        self._bits[last] = 0
+
+    def remove_objective(self, name):
+        col = self.objective_cols.pop(name)
+        last = len(self.objective_names) - 1
+        if col != last:
+            moved = self.objective_names[last]
+            self.objective_names[col] = moved
+            self.objective_cols[moved] = col
+            self._circle[col] = self._circle[last]
+            self._lens_mount[col] = self._lens_mount[last]
+            self._write_column(col, self._read_column(last))
+        self.objective_names.pop()
+        self._write_column(last, np.zeros(len(self.camera_names), dtype=bool))
+
+    # --------------------------
+    #   Interne
+    # --------------------------
+
+    def _mount_code(self, mount):
+        if not mount:
+            return -1
+        return self._mounts.setdefault(mount, len(self._mounts))
+
+    def _set_row(self, row):
+        n = len(self.objective_names)
+        mask = compatible(
+            self._circle[:n], self._lens_mount[:n],
+            self._diagonal[row], self._camera_mount[row],
+        )
+        packed = np.packbits(mask)
+        self._bits[row] = 0
+        self._bits[row, :len(packed)] = packed
+
+    def _set_column(self, col):
+        n = len(self.camera_names)
+        mask = compatible(
+            self._circle[col], self._lens_mount[col],
+            self._diagonal[:n], self._camera_mount[:n],
+        )
+        self._write_column(col, mask)
+
+    def _read_column(self, col):
+        n = len(self.camera_names)
+        return (self._bits[:n, col >> 3] & (0x80 >> (col & 7))) != 0
+
+    def _write_column(self, col, mask):
+        n = len(mask)
+        byte, bit = col >> 3, np.uint8(0x80 >> (col & 7))
+        column = self._bits[:n, byte]
+        self._bits[:n, byte] = np.where(mask, column | bit, column & ~bit)
+
+    def _grow(self, rows=None, cols=None):
+        rows = self._bits.shape[0] if rows is None else rows
+        nbytes = self._bits.shape[1] if cols is None else (cols + 7) // 8
+        bits = np.zeros((rows, nbytes), dtype=np.uint8)
+        bits[:self._bits.shape[0], :self._bits.shape[1]] = self._bits
+        self._bits = bits
+        self._diagonal = _resize(self._diagonal, rows, np.nan)
+        self._camera_mount = _resize(self._camera_mount, rows, -1)
+        self._circle = _resize(self._circle, nbytes * 8, np.nan)
+        self._lens_mount = _resize(self._lens_mount, nbytes * 8, -1)
+
+
+def _resize(array, size, fill):
+    if len(array) >= size:
+        return array
+    out = np.full(size, fill, dtype=array.dtype)
+    out[:len(array)] = array
+    return out
+
+
+def _diagonal(camera):
+    px, rx, ry = camera.get("pixel_size_um"), camera.get("resolution_x"), camera.get("resolution_y")
+    if px is None or rx is None or ry is None:
+        return np.nan
+    return float(np.hypot((px * rx) / 1000., (px * ry) / 1000.))
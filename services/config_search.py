@@ -0,0 +1,174 @@
+# services/config_search.py
+"""
+Recherche catalogue : quels couples caméra × objectif satisfont un cahier
+des charges d'inspection (FOV cible, défaut min, plage de WD, flou max) ?
+
+Tous les couples sont évalués en une passe vectorisée, sans boucle Python
+sur le produit cartésien :
+- défaut min et flou ne dépendent que de la caméra (FOV fixé) → filtrage
+  des caméras en O(N) ;
+- WD = FOV * focal / sensor est croissant avec la focale → pour chaque
+  caméra, les objectifs valides forment un intervalle contigu de la liste
+  triée par focale (searchsorted) ;
+- seules les top_n focales les plus proches de la WD préférée sont
+  évaluées par caméra, ce qui borne le coût à N_cam × 2·top_n ;
+- les couples incompatibles (cercle d'image, monture) sont écartés avant
+  toute évaluation ; la fenêtre n'est élargie que pour les caméras qui
+  n'y trouvent pas assez d'objectifs compatibles.
+"""
+
+import numpy as np
+
+from services.catalog import as_camera_catalog, as_objective_catalog
+from services.compatibility import compatible, mount_codes
+from services.database_manager import DatabaseManager
+from services.optics_batch import (
+    compute_distance_batch,
+    compute_px_per_mm_batch,
+    compute_min_detectable_defect_batch,
+    compute_motion_blur_batch,
+)
+
+
+def search_configurations(
+    target_fov_mm: float,
+    max_defect_mm: float,
+    wd_min_mm: float,
+    wd_max_mm: float,
+    max_blur_px: float = None,
+    speed_m_s: float = None,
+    exposure_time_s: float = None,
+    required_pixels: int = 3,
+    preferred_wd_mm: float = None,
+    top_n: int = 10,
+    cameras=None,
+    objectives=None,
+    compatible_only: bool = True,
+):
+    """
+    Renvoie les top_n couples caméra × objectif qui couvrent target_fov_mm
+    avec un défaut min <= max_defect_mm et une WD dans [wd_min_mm, wd_max_mm].
+
+    Si max_blur_px est donné, speed_m_s et exposure_time_s sont requis et
+    les couples dont le flou dépasse le budget sont écartés.
+
+    Classement : défaut min croissant, puis écart à preferred_wd_mm
+    (milieu de la plage de WD par défaut).
+    cameras / objectives : CameraCatalog / ObjectiveCatalog ou dicts
+    {name: record} (DatabaseManager par défaut).
+    compatible_only : ignorer les couples caméra / objectif incompatibles
+    (services.compatibility).
+    """
+    if target_fov_mm <= 0:
+        raise ValueError("Target FOV must be positive.")
+    if wd_min_mm > wd_max_mm:
+        raise ValueError("wd_min_mm must be <= wd_max_mm.")
+    with_blur = speed_m_s is not None and exposure_time_s is not None
+    if max_blur_px is not None and not with_blur:
+        raise ValueError("A blur budget needs speed_m_s and exposure_time_s.")
+    if top_n <= 0:
+        return []
+
+    if cameras is None or objectives is None:
+        db = DatabaseManager()
+        cameras = db.load_camera_catalog() if cameras is None else cameras
+        objectives = db.load_objective_catalog() if objectives is None else objectives
+    if preferred_wd_mm is None:
+        preferred_wd_mm = (wd_min_mm + wd_max_mm) / 2.
+
+    cameras = as_camera_catalog(cameras)
+    objectives = as_objective_catalog(objectives)
+    cam_names = cameras.names
+    cam_px = cameras.column("pixel_size_um")
+    cam_rx = cameras.column("resolution_x")
+    cam_sensor = cameras.column("sensor_width_mm")
+
+    # objectifs exploitables, triés par focale
+    focal = objectives.column("focal_length")
+    lenses = np.flatnonzero(focal > 0)
+    lenses = lenses[np.argsort(focal[lenses], kind="stable")]
+    focal = focal[lenses]
+    if len(cameras) == 0 or focal.size == 0:
+        return []
+
+    # 1. Élagage par caméra : défaut min et flou ne dépendent pas de l'objectif
+    px_per_mm = compute_px_per_mm_batch(cam_rx, target_fov_mm)
+    defect = compute_min_detectable_defect_batch(px_per_mm, required_pixels)
+    keep = (defect <= max_defect_mm) & (cam_sensor > 0)
+    blur_px = None
+    if with_blur:
+        _, _, blur_px = compute_motion_blur_batch(speed_m_s, exposure_time_s, px_per_mm, cam_px)
+        if max_blur_px is not None:
+            keep &= blur_px <= max_blur_px
+    cams = np.flatnonzero(keep)
+    if cams.size == 0:
+        return []
+
+    # 2. Intervalle de focales compatibles avec la plage de WD
+    sensor = cam_sensor[cams]
+    lo = np.searchsorted(focal, wd_min_mm * sensor / target_fov_mm, side="left")
+    hi = np.searchsorted(focal, wd_max_mm * sensor / target_fov_mm, side="right")
+    center = np.searchsorted(focal, preferred_wd_mm * sensor / target_fov_mm)
+    center = np.clip(center, lo, hi)
+
+    # 3. Fenêtre de 2·top_n focales autour de la WD préférée
+    # (élargie d'un cran de chaque côté : la vérification exacte se fait sur la WD).
+    # Avec compatible_only, la fenêtre d'une caméra est doublée tant qu'elle
+    # ne contient pas top_n + 1 objectifs compatibles de chaque côté.
+    if compatible_only:
+        cam_mount, lens_mount = mount_codes(cameras, objectives)
+        cam_mount, cam_diagonal = cam_mount[cams], cameras.column("sensor_diagonal_mm")[cams]
+        lens_mount = lens_mount[lenses]
+        lens_circle = objectives.column("max_image_circle")[lenses]
+    pending = np.arange(cams.size)
+    width = top_n
+    found_rows, found_idx = [], []
+    while pending.size:
+        offsets = np.arange(-width - 1, width + 1)
+        idx = center[pending, None] + offsets[None, :]
+        valid = (idx >= lo[pending, None] - 1) & (idx < hi[pending, None] + 1)
+        valid &= (idx >= 0) & (idx < focal.size)
+        done = np.ones(pending.size, dtype=bool)
+        if compatible_only:
+            safe = np.clip(idx, 0, focal.size - 1)
+            valid &= compatible(
+                lens_circle[safe], lens_mount[safe],
+                cam_diagonal[pending, None], cam_mount[pending, None],
+            )
+            first, last = idx[:, 0], idx[:, -1]
+            left_done = (first <= np.maximum(lo[pending] - 1, 0)) | (valid[:, :width + 1].sum(1) > top_n)
+            right_done = (last >= np.minimum(hi[pending], focal.size - 1)) | (valid[:, width + 1:].sum(1) > top_n)
+            done = left_done & right_done
+        rows, cols = np.nonzero(valid & done[:, None])
+        found_rows.append(pending[rows])
+        found_idx.append(idx[rows, cols])
+        pending = pending[~done]
+        width *= 2
+    cam_idx = cams[np.concatenate(found_rows)]
+    obj_idx = np.concatenate(found_idx)
+
+    wd = compute_distance_batch(target_fov_mm, cam_sensor[cam_idx], focal[obj_idx])
+    ok = (wd >= wd_min_mm) & (wd <= wd_max_mm)
+    cam_idx, obj_idx, wd = cam_idx[ok], obj_idx[ok], wd[ok]
+    if cam_idx.size == 0:
+        return []
+
+    # 4. Classement
+    order = np.lexsort((np.abs(wd - preferred_wd_mm), defect[cam_idx]))[:top_n]
+
+    results = []
+    for k in order:
+        c, o = cam_idx[k], obj_idx[k]
+        result = {
+            "camera": cam_names[c],
+            "objective": objectives.names[lenses[o]],
+            "wd": float(wd[k]),
+            "focal": float(focal[o]),
+            "fov": float(target_fov_mm),
+            "px_per_mm": float(px_per_mm[c]),
+            "min_defect_mm": float(defect[c]),
+        }
+        if with_blur:
+            result["blur_px"] = float(blur_px[c])
+        results.append(result)
+    return results
@@ -0,0 +1,294 @@
+# services/coverage.py
+"""
+Couverture multi-caméras d'une pièce (ou d'une bande) plus large que le
+champ d'une seule caméra : combien de caméras identiques (même modèle,
+même objectif, même WD), côte à côte le long de la largeur du capteur,
+et lesquelles ?
+
+N caméras de champ f, voisines recouvertes de overlap·f, couvrent
+f + (N - 1)·f·(1 - overlap) ; à N fixé il faut donc
+f >= f_need(N) = largeur / (1 + (N - 1)·(1 - overlap)).
+
+Bornes en forme close, sans énumérer caméra × objectif × WD :
+- défaut min = required_pixels · f / résolution <= max_defect_mm
+  → f <= f_max (par caméra, indépendant de l'objectif) ;
+- f = capteur · WD / focale, WD dans [wd_min, wd_max] → un objectif
+  convient à N caméras ssi sa focale est dans
+  [capteur · wd_min / f_max, capteur · wd_max / f_need(N)] ;
+- le plus petit N d'une caméra vient de la plus petite focale
+  compatible >= capteur · wd_min / f_max :
+  N_cam = N(min(f_max, capteur · wd_max / focale)) ;
+- N* = min des N_cam ; seules les caméras qui l'atteignent sont
+  développées, sur les top_n + 1 objectifs compatibles de leur
+  intervalle de part et d'autre de la focale de la WD préférée (ou de
+  la plus petite focale qui donne le défaut le plus fin, si elle est
+  au-dessus).
+
+Objectifs compatibles : une liste triée par focale par monture de
+caméra, et une table creuse de maximums des cercles d'image qui donne
+le premier (ou dernier) objectif compatible à partir d'une position en
+O(log n), vectorisé sur toutes les caméras.
+
+Point de fonctionnement retenu pour un couple : le plus petit champ
+possible (f_need(N*) ou celui à wd_min), donc le défaut min le plus fin.
+Les candidats sont vérifiés avec les formules de optics_batch
+(identiques à compute_fov / compute_px_per_mm /
+compute_min_detectable_defect).
+"""
+
+import numpy as np
+
+from services.catalog import as_camera_catalog, as_objective_catalog
+from services.compatibility import mount_codes
+from services.database_manager import DatabaseManager
+from services.optics_batch import (
+    compute_distance_batch,
+    compute_fov_batch,
+    compute_px_per_mm_batch,
+    compute_min_detectable_defect_batch,
+)
+
+# tolérance relative des comparaisons exactes (arrondis des formules)
+_TOLERANCE = 1e-9
+
+
+def camera_count(part_width_mm, fov_mm, overlap=0.0):
+    """
+    Nombre de caméras de champ fov_mm (recouvrement overlap, fraction du
+    champ) pour couvrir part_width_mm. Scalaires ou tableaux.
+    """
+    fov_mm = np.asarray(fov_mm, dtype=np.float64)
+    extra = np.ceil((part_width_mm - fov_mm) / (fov_mm * (1.0 - overlap)) - _TOLERANCE)
+    return 1 + np.maximum(extra, 0).astype(np.int64)
+
+
+def required_fov(part_width_mm, count, overlap=0.0):
+    """
+    Champ minimal de chacune des `count` caméras.
+    """
+    return part_width_mm / (1.0 + (np.asarray(count, dtype=np.float64) - 1.0) * (1.0 - overlap))
+
+
+# ------------------------------------------------------------
+# Objectifs compatibles d'une monture, triés par focale
+# ------------------------------------------------------------
+
+def _sparse_max(values):
+    # tables[k][i] = max(values[i : i + 2**k])
+    tables = [values]
+    span = 1
+    while 2 * span <= len(values):
+        tables.append(np.maximum(tables[-1][:-span], tables[-1][span:]))
+        span *= 2
+    return tables
+
+
+def _first_at_least(tables, pos, need):
+    """
+    Premier j >= pos avec values[j] >= need (len(values) si aucun) :
+    descente par blocs de 2**k dont le maximum est < need.
+    """
+    n = len(tables[0])
+    pos = np.minimum(pos, n)
+    for k in reversed(range(len(tables))):
+        step, table = 1 << k, tables[k]
+        block = table[np.clip(pos, 0, len(table) - 1)]
+        pos = np.where((pos + step <= n) & (block < need), pos + step, pos)
+    return pos
+
+
+class _LensIndex:
+    """
+    Objectifs montables sur une classe de caméras, triés par focale :
+    next / prev = premier / dernier objectif à partir de pos dont le
+    cercle d'image couvre la diagonale du capteur (cercle inconnu : +inf,
+    diagonale inconnue : -inf, comme services.compatibility).
+    """
+
+    def __init__(self, rows, focal, circle):
+        self.rows = rows
+        self.focal = focal
+        circle = np.where(np.isnan(circle), np.inf, circle)
+        self.forward = _sparse_max(circle) if len(circle) else [circle]
+        self.backward = _sparse_max(circle[::-1]) if len(circle) else [circle]
+
+    def __len__(self):
+        return len(self.focal)
+
+    def next(self, pos, diagonal):
+        return _first_at_least(self.forward, np.maximum(pos, 0), diagonal)
+
+    def prev(self, pos, diagonal):
+        n = len(self)
+        found = n - 1 - _first_at_least(self.backward, n - 1 - np.minimum(pos, n - 1), diagonal)
+        return np.where(pos < 0, -1, found)
+
+
+def _lens_indexes(cameras, objectives, lenses, cams, compatible_only):
+    """
+    {code monture caméra : _LensIndex} et le code de chaque caméra ; une
+    monture inconnue (-1), côté caméra ou objectif, ne filtre pas.
+    """
+    focal = objectives.column("focal_length")[lenses]
+    circle = objectives.column("max_image_circle")[lenses]
+    if not compatible_only:
+        return {-1: _LensIndex(lenses, focal, np.full(len(lenses), np.inf))}, np.full(len(cams), -1)
+    cam_mount, lens_mount = mount_codes(cameras, objectives)
+    cam_mount, lens_mount = cam_mount[cams], lens_mount[lenses]
+    indexes = {}
+    for code in np.unique(cam_mount).tolist():
+        keep = np.ones(len(lenses), dtype=bool) if code < 0 else (lens_mount < 0) | (lens_mount == code)
+        indexes[code] = _LensIndex(lenses[keep], focal[keep], circle[keep])
+    return indexes, cam_mount
+
+
+# ------------------------------------------------------------
+# Planificateur
+# ------------------------------------------------------------
+
+def plan_coverage(
+    part_width_mm: float,
+    max_defect_mm: float,
+    overlap_pct: float = 10.0,
+    wd_min_mm: float = 0.0,
+    wd_max_mm: float = 1000.0,
+    required_pixels: int = 3,
+    preferred_wd_mm: float = None,
+    max_cameras: int = None,
+    top_n: int = 10,
+    cameras=None,
+    objectives=None,
+    compatible_only: bool = True,
+):
+    """
+    Plus petit nombre de caméras identiques couvrant part_width_mm avec un
+    défaut min <= max_defect_mm, overlap_pct % de recouvrement entre
+    voisines et une WD dans [wd_min_mm, wd_max_mm] ; renvoie les top_n
+    meilleurs choix caméra × objectif × WD pour ce nombre.
+
+    Classement : défaut min croissant, puis écart à preferred_wd_mm
+    (milieu de la plage de WD par défaut). Liste vide si aucune
+    configuration ne convient (ou s'il faudrait plus de max_cameras).
+    cameras / objectives : CameraCatalog / ObjectiveCatalog ou dicts
+    {name: record} (DatabaseManager par défaut).
+    """
+    if part_width_mm <= 0 or max_defect_mm <= 0:
+        raise ValueError("Part width and max defect must be positive.")
+    if not 0 <= overlap_pct < 100:
+        raise ValueError("Overlap must be in [0, 100) %.")
+    if not 0 <= wd_min_mm <= wd_max_mm or wd_max_mm <= 0:
+        raise ValueError("Need 0 <= wd_min_mm <= wd_max_mm, wd_max_mm > 0.")
+    if top_n <= 0:
+        return []
+
+    if cameras is None or objectives is None:
+        db = DatabaseManager()
+        cameras = db.load_camera_catalog() if cameras is None else cameras
+        objectives = db.load_objective_catalog() if objectives is None else objectives
+    cameras, objectives = as_camera_catalog(cameras), as_objective_catalog(objectives)
+    if preferred_wd_mm is None:
+        preferred_wd_mm = (wd_min_mm + wd_max_mm) / 2.
+    overlap = overlap_pct / 100.
+
+    # objectifs exploitables triés par focale, caméras exploitables
+    focal_all = objectives.column("focal_length")
+    lenses = np.flatnonzero(focal_all > 0)
+    lenses = lenses[np.argsort(focal_all[lenses], kind="stable")]
+    sensor_all = cameras.column("sensor_width_mm")
+    resolution_all = cameras.column("resolution_x").astype(np.float64)
+    cams = np.flatnonzero((sensor_all > 0) & (resolution_all > 0))
+    if cams.size == 0 or lenses.size == 0:
+        return []
+    sensor, resolution = sensor_all[cams], resolution_all[cams]
+    diagonal = np.nan_to_num(cameras.column("sensor_diagonal_mm")[cams], nan=-np.inf)
+    # champ max imposé par la résolution
+    fov_max = max_defect_mm * resolution / required_pixels
+
+    indexes, cam_class = _lens_indexes(cameras, objectives, lenses, cams, compatible_only)
+
+    # 1. Par caméra : plus petite focale compatible dont le champ à wd_min
+    #    respecte le défaut (un cran de marge sur searchsorted, test exact)
+    first_focal = np.full(cams.size, np.nan)
+    lo = np.zeros(cams.size, dtype=np.int64)
+    for code, index in indexes.items():
+        members = np.flatnonzero(cam_class == code)
+        if members.size == 0 or len(index) == 0:
+            continue
+        s, need = sensor[members], diagonal[members]
+        start = np.maximum(np.searchsorted(index.focal, s * wd_min_mm / fov_max[members]) - 1, 0)
+        lo[members] = start
+        j = index.next(start, need)
+        for _ in range(2):
+            found = j < len(index)
+            fits = compute_fov_batch(s, index.focal[np.minimum(j, len(index) - 1)], wd_min_mm)
+            too_wide = found & (fits > fov_max[members] * (1 + _TOLERANCE))
+            j = np.where(too_wide, index.next(j + 1, need), j)
+        found = j < len(index)
+        first_focal[members[found]] = index.focal[j[found]]
+
+    # 2. Nombre minimal de caméras par modèle, puis global
+    reachable = ~np.isnan(first_focal)
+    if not reachable.any():
+        return []
+    best_fov = np.minimum(fov_max, sensor * wd_max_mm / np.where(reachable, first_focal, 1.0))
+    counts = np.where(reachable, camera_count(part_width_mm, best_fov, overlap), np.iinfo(np.int64).max)
+    n_min = int(counts.min())
+    if max_cameras is not None and n_min > max_cameras:
+        return []
+    fov_need = float(required_fov(part_width_mm, n_min, overlap))
+
+    # 3. Caméras qui atteignent n_min : objectifs compatibles de l'intervalle
+    #    [capteur · wd_min / f_max, capteur · wd_max / f_need], top_n + 1 de
+    #    chaque côté de la focale de la WD préférée
+    cam_rows, lens_rows = [], []
+    for code, index in indexes.items():
+        members = np.flatnonzero((cam_class == code) & (counts == n_min))
+        if members.size == 0:
+            continue
+        s, need, start = sensor[members], diagonal[members], lo[members]
+        stop = np.minimum(np.searchsorted(index.focal, s * wd_max_mm / fov_need, side="right") + 1, len(index))
+        # le défaut le plus fin (champ f_need) demande une focale >= capteur · wd_min / f_need
+        finest = np.searchsorted(index.focal, s * wd_min_mm / fov_need)
+        preferred = np.searchsorted(index.focal, s * preferred_wd_mm / fov_need)
+        center = np.clip(np.maximum(finest, preferred), start, stop)
+        right, left = center, center - 1
+        for _ in range(top_n + 1):
+            right = index.next(right, need)
+            left = index.prev(left, need)
+            for j, ok in ((right, right < stop), (left, left >= start)):
+                cam_rows.append(members[ok])
+                lens_rows.append(index.rows[j[ok]])
+            right, left = right + 1, left - 1
+    rows, lens = np.concatenate(cam_rows), np.concatenate(lens_rows)
+
+    # point de fonctionnement : le plus petit champ admissible
+    s, f = sensor[rows], focal_all[lens]
+    fov = np.maximum(fov_need, compute_fov_batch(s, f, wd_min_mm))
+    wd = compute_distance_batch(fov, s, f)
+    px_per_mm = compute_px_per_mm_batch(resolution[rows], fov)
+    defect = compute_min_detectable_defect_batch(px_per_mm, required_pixels)
+    keep = (
+        (defect <= max_defect_mm * (1 + _TOLERANCE))
+        & (wd >= wd_min_mm * (1 - _TOLERANCE)) & (wd <= wd_max_mm * (1 + _TOLERANCE))
+        & (camera_count(part_width_mm, fov, overlap) == n_min)
+    )
+    rows, lens, fov, wd, px_per_mm, defect = (a[keep] for a in (rows, lens, fov, wd, px_per_mm, defect))
+
+    # 4. Classement
+    order = np.lexsort((np.abs(wd - preferred_wd_mm), defect))[:top_n]
+    results = []
+    for k in order.tolist():
+        pitch = fov[k] * (1.0 - overlap)
+        results.append({
+            "camera": cameras.names[cams[rows[k]]],
+            "objective": objectives.names[lens[k]],
+            "camera_count": n_min,
+            "focal": float(focal_all[lens[k]]),
+            "wd": float(wd[k]),
+            "fov": float(fov[k]),
+            "pitch_mm": float(pitch),
+            "coverage_mm": float(fov[k] + (n_min - 1) * pitch),
+            "px_per_mm": float(px_per_mm[k]),
+            "min_defect_mm": float(defect[k]),
+        })
+    return results
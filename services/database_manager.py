@@ -1,11 +1,55 @@
 # services/database_manager.py
-import json
 from pathlib import Path
 
+from services.catalog_journal import CatalogJournal
+from services.instrumentation import timed
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 CAMERA_FILE = DATA_DIR / "cameras.json"
 OBJECTIVE_FILE = DATA_DIR / "objectives.json"
 
+
+# ------------------------------------------------------------
+# Normalisation des enregistrements (une fois, au chargement)
+# ------------------------------------------------------------
+
+def _to_number(value, kind=float):
+    # "16", "f/2.8", 2.8 → 2.8 ; valeur illisible → None
+    if isinstance(value, str):
+        value = value.strip()
+        if value[:2].lower() == "f/":
+            value = value[2:]
+    try:
+        return kind(float(value)) if kind is int else kind(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_camera(cam):
+    cam = dict(cam)
+    cam["name"] = str(cam.get("name", "")).strip()
+    for key in ("resolution_x", "resolution_y"):
+        cam[key] = _to_number(cam.get(key), int)
+    cam["pixel_size_um"] = _to_number(cam.get("pixel_size_um"))
+    cam["shutter"] = str(cam.get("shutter") or "").strip().lower()
+    cam["notes"] = str(cam.get("notes") or "")
+    if "mount" in cam:
+        cam["mount"] = str(cam["mount"] or "").strip().upper()
+    return cam
+
+
+def normalize_objective(obj):
+    obj = dict(obj)
+    obj["name"] = str(obj.get("name", "")).strip()
+    obj["focal_length"] = _to_number(obj.get("focal_length"))
+    obj["mount"] = str(obj.get("mount") or "").strip().upper()
+    # historical typo in objectives.json / AddLensDialog
+    circle = obj.pop("max_image_cirle", None)
+    obj["max_image_circle"] = _to_number(obj.get("max_image_circle", circle))
+    obj["aperture"] = _to_number(obj.get("aperture"))
+    return obj
+
+
 class DatabaseManager:
     def __init__(self, camera_file: Path = CAMERA_FILE,objective_file: Path = OBJECTIVE_FILE):
         self.camera_file = camera_file
@@ -15,29 +59,145 @@ class DatabaseManager:
             self.camera_file.write_text('{"cameras": []}')
         if not self.objective_file.exists():
             self.objective_file.write_text('{"objectives": []}')
+        # writes go through an append-only journal + atomic compaction
+        self.camera_journal = CatalogJournal(self.camera_file, "cameras")
+        self.objective_journal = CatalogJournal(self.objective_file, "objectives")
 
+    @timed("db.load_cameras")
     def load_cameras(self):
-        with open(self.camera_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
         # return dict keyed by name for convenience
-        cams = {cam["name"]: cam for cam in data.get("cameras", [])}
+        cams = {cam["name"]: cam for cam in map(normalize_camera, self.camera_journal.read())}
         return cams
 
+    @timed("db.save_cameras")
     def save_cameras(self, cams_dict):
         # cams_dict: {name: camdict}
-        data = {"cameras": list(cams_dict.values())}
-        with open(self.camera_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        self.camera_journal.rewrite(cams_dict.values())
+
+    @timed("db.append_camera")
+    def append_camera(self, cam):
+        # O(1) : one line appended to the journal
+        self.camera_journal.append(cam)
 
+    @timed("db.append_cameras")
+    def append_cameras(self, cams):
+        # one locked, fsynced journal write for the whole batch
+        self.camera_journal.append_many(cams)
+
+    @timed("db.load_objectives")
     def load_objectives(self):
-        with open(self.objective_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
         # return dict keyed by name for convenience
-        objs = {obj["name"]: obj for obj in data.get("objectives", [])}
+        objs = {obj["name"]: obj for obj in map(normalize_objective, self.objective_journal.read())}
         return objs
 
+    @timed("db.save_objective")
     def save_objective(self, obj_dict):
-        # cams_dict: {name: camdict}
-        data = {"objectives": list(obj_dict.values())}
-        with open(self.objective_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
\ No newline at end of file
+        # obj_dict: {name: objdict}
+        self.objective_journal.rewrite(obj_dict.values())
+
+    @timed("db.append_objective")
+    def append_objective(self, obj):
+        self.objective_journal.append(obj)
+
+    @timed("db.append_objectives")
+    def append_objectives(self, objs):
+        self.objective_journal.append_many(objs)
+
+    @timed("db.refresh_cameras")
+    def refresh_cameras(self, cams_dict):
+        # update cams_dict in place with what changed on disk since the last load
+        return _refresh(self.camera_journal, cams_dict, normalize_camera)
+
+    @timed("db.refresh_objectives")
+    def refresh_objectives(self, obj_dict):
+        return _refresh(self.objective_journal, obj_dict, normalize_objective)
+
+    @timed("db.camera_changes")
+    def camera_changes(self, cams_dict):
+        # same diff as refresh_cameras, cams_dict untouched (worker thread); see apply_changes
+        return _changes(self.camera_journal, cams_dict, normalize_camera)
+
+    @timed("db.objective_changes")
+    def objective_changes(self, obj_dict):
+        return _changes(self.objective_journal, obj_dict, normalize_objective)
+
+    @timed("db.load_camera_catalog")
+    def load_camera_catalog(self, mapped=True):
+        # columnar NumPy catalog (imported lazily: the CLI does not need NumPy)
+        # mapped=True: memory-mapped compiled file (cameras.occat), rebuilt if stale
+        from services.catalog import CameraCatalog
+        return _load_catalog(CatalogJournal(self.camera_file, "cameras"), CameraCatalog, normalize_camera, mapped)
+
+    @timed("db.load_objective_catalog")
+    def load_objective_catalog(self, mapped=True):
+        from services.catalog import ObjectiveCatalog
+        return _load_catalog(
+            CatalogJournal(self.objective_file, "objectives"), ObjectiveCatalog, normalize_objective, mapped
+        )
+
+    @timed("db.compact")
+    def compact(self):
+        # merge journals into cameras.json / objectives.json
+        self.camera_journal.compact()
+        self.objective_journal.compact()
+
+
+def _load_catalog(journal, catalog_cls, normalize, mapped):
+    # own journal: a catalog snapshot does not move the cursor of refresh_* / *_changes
+    if mapped:
+        from services.catalog_binary import load_compiled
+        try:
+            return load_compiled(journal, catalog_cls, normalize)
+        except (OSError, ValueError):
+            # read-only data folder, unreadable compiled file: parse the JSON instead
+            pass
+    return catalog_cls.from_records(map(normalize, journal.read()))
+
+
+def _changes(journal, records_dict, normalize):
+    """
+    On-disk changes relative to records_dict, which is only read.
+    Returns (added, removed, changed, records): lists of names, and the
+    new records {name: record} of added + changed.
+    """
+    records, full = journal.read_changes()
+    records = map(normalize, records)
+    if full:
+        new = {rec["name"]: rec for rec in records}
+        removed = [name for name in records_dict if name not in new]
+    else:
+        new = {}
+        for rec in records:
+            new[rec["name"]] = rec
+        removed = []
+    added, changed, updates = [], [], {}
+    for name, rec in new.items():
+        old = records_dict.get(name)
+        if old is None:
+            added.append(name)
+        elif old != rec:
+            changed.append(name)
+        else:
+            continue
+        updates[name] = rec
+    return added, removed, changed, updates
+
+
+def apply_changes(records_dict, changes):
+    """
+    Apply a _changes() result to records_dict (in place).
+    Returns (added, removed, changed).
+    """
+    added, removed, changed, updates = changes
+    for name in removed:
+        del records_dict[name]
+    records_dict.update(updates)
+    return added, removed, changed
+
+
+def _refresh(journal, records_dict, normalize):
+    """
+    Apply on-disk changes to records_dict (in place).
+    Returns (added, removed, changed) lists of names.
+    """
+    return apply_changes(records_dict, _changes(journal, records_dict, normalize))
@@ -0,0 +1,266 @@
+# services/dataflow.py
+"""
+Moteur de contraintes / flot de données d'un poste de vision.
+
+Variables :
+- paramètres caméra (toujours connus) : sensor_width_mm, resolution_x,
+  pixel_size_um, required_pixels ;
+- entrées : wd, focal, fov, speed_m_s, exposure_time_s ;
+- sorties : px_per_mm, min_defect_mm, blur_object_mm, blur_sensor_um, blur_px.
+
+Chaque relation de optics_calculations est déclarée une fois, avec une
+formule pour chacune de ses variables résolubles. N'importe quelle variable
+peut être verrouillée ; la résolution se fait par propagation locale :
+
+1. variables connues = paramètres + variables verrouillées ;
+2. tant qu'une relation n'a plus qu'une inconnue, on la calcule ;
+3. les entrées encore inconnues gardent leur valeur courante, puis on
+   propage à nouveau (sorties) ;
+4. ce qui reste inconnu vaut None (ex. fov <= 0 → px/mm indéfini).
+
+Le plan de calcul (suite ordonnée d'étapes) ne dépend que des verrous et
+des valeurs présentes : il est mis en cache. Entre deux solve(), seules les
+étapes en aval des variables modifiées sont recalculées.
+"""
+
+from functools import lru_cache
+
+from services.optics_calculations import (
+    compute_fov,
+    compute_distance,
+    compute_focal,
+    compute_px_per_mm,
+    compute_min_detectable_defect,
+)
+
+PARAMETERS = ("sensor_width_mm", "resolution_x", "pixel_size_um", "required_pixels")
+INPUTS = ("wd", "focal", "fov", "speed_m_s", "exposure_time_s")
+OUTPUTS = ("px_per_mm", "min_defect_mm", "blur_object_mm", "blur_sensor_um", "blur_px")
+VARIABLES = PARAMETERS + INPUTS + OUTPUTS
+
+
+# ------------------------------------------------------------
+# Relations : {variable résolue: (entrées, formule)}
+# ------------------------------------------------------------
+# les formules renvoient None hors de leur domaine ; les formules "directes"
+# reprennent l'ordre des opérations de optics_calculations (résultats identiques)
+
+def _px_per_mm(resolution_x, fov):
+    return compute_px_per_mm(resolution_x, fov) if fov > 0 else None
+
+
+def _fov_from_px_per_mm(resolution_x, px_per_mm):
+    return resolution_x / px_per_mm if px_per_mm > 0 else None
+
+
+def _min_defect(px_per_mm, required_pixels):
+    # résolution x à 0 → px/mm nul : défaut min indéfini
+    return compute_min_detectable_defect(px_per_mm, required_pixels=required_pixels) if px_per_mm else None
+
+
+def _px_per_mm_from_defect(min_defect_mm, required_pixels):
+    return required_pixels / min_defect_mm if min_defect_mm > 0 else None
+
+
+def _blur_object(speed_m_s, exposure_time_s):
+    return speed_m_s * exposure_time_s * 1000.0  # m → mm
+
+
+def _speed(blur_object_mm, exposure_time_s):
+    return blur_object_mm / (exposure_time_s * 1000.0) if exposure_time_s else None
+
+
+def _exposure(blur_object_mm, speed_m_s):
+    return blur_object_mm / (speed_m_s * 1000.0) if speed_m_s else None
+
+
+def _blur_sensor(blur_object_mm, px_per_mm, pixel_size_um):
+    magnification = (px_per_mm * pixel_size_um) / 1000.0
+    return blur_object_mm * magnification * 1000.0
+
+
+def _blur_object_from_sensor(blur_sensor_um, px_per_mm, pixel_size_um):
+    magnification = (px_per_mm * pixel_size_um) / 1000.0
+    return blur_sensor_um / 1000.0 / magnification if magnification else None
+
+
+def _px_per_mm_from_blur(blur_sensor_um, blur_object_mm, pixel_size_um):
+    if not blur_object_mm or not pixel_size_um:
+        return None
+    return blur_sensor_um / blur_object_mm / pixel_size_um
+
+
+def _blur_px(blur_sensor_um, pixel_size_um):
+    return blur_sensor_um / pixel_size_um if pixel_size_um else None
+
+
+def _blur_sensor_from_px(blur_px, pixel_size_um):
+    return blur_px * pixel_size_um
+
+
+RELATIONS = {
+    # FOV = sensor * WD / focal
+    "optics": {
+        "fov": (("sensor_width_mm", "focal", "wd"), compute_fov),
+        "wd": (("fov", "sensor_width_mm", "focal"), compute_distance),
+        "focal": (("sensor_width_mm", "wd", "fov"), compute_focal),
+    },
+    # px/mm = resolution_x / FOV
+    "sampling": {
+        "px_per_mm": (("resolution_x", "fov"), _px_per_mm),
+        "fov": (("resolution_x", "px_per_mm"), _fov_from_px_per_mm),
+    },
+    # défaut min = required_pixels / (px/mm)
+    "defect": {
+        "min_defect_mm": (("px_per_mm", "required_pixels"), _min_defect),
+        "px_per_mm": (("min_defect_mm", "required_pixels"), _px_per_mm_from_defect),
+    },
+    # flou objet = vitesse * exposition
+    "exposure": {
+        "blur_object_mm": (("speed_m_s", "exposure_time_s"), _blur_object),
+        "speed_m_s": (("blur_object_mm", "exposure_time_s"), _speed),
+        "exposure_time_s": (("blur_object_mm", "speed_m_s"), _exposure),
+    },
+    # flou capteur = flou objet * grandissement
+    "magnification": {
+        "blur_sensor_um": (("blur_object_mm", "px_per_mm", "pixel_size_um"), _blur_sensor),
+        "blur_object_mm": (("blur_sensor_um", "px_per_mm", "pixel_size_um"), _blur_object_from_sensor),
+        "px_per_mm": (("blur_sensor_um", "blur_object_mm", "pixel_size_um"), _px_per_mm_from_blur),
+    },
+    # flou en pixels
+    "pixels": {
+        "blur_px": (("blur_sensor_um", "pixel_size_um"), _blur_px),
+        "blur_sensor_um": (("blur_px", "pixel_size_um"), _blur_sensor_from_px),
+    },
+}
+
+_RELATION_VARIABLES = {
+    name: frozenset(v for target, (inputs, _) in solvers.items() for v in (target,) + inputs)
+    for name, solvers in RELATIONS.items()
+}
+
+
+# ------------------------------------------------------------
+# Plan de calcul
+# ------------------------------------------------------------
+
+def _propagate(known, steps):
+    progress = True
+    while progress:
+        progress = False
+        for name, solvers in RELATIONS.items():
+            unknown = _RELATION_VARIABLES[name] - known
+            if len(unknown) != 1:
+                continue
+            (target,) = unknown
+            if target in solvers:
+                inputs, func = solvers[target]
+                steps.append((target, inputs, func))
+                known.add(target)
+                progress = True
+
+
+@lru_cache(maxsize=256)
+def build_plan(locked, present):
+    """
+    locked : variables verrouillées (avec une valeur) ; present : variables
+    ayant une valeur. Renvoie (étapes, inconnues) : étapes = suite ordonnée
+    de (cible, entrées, formule), inconnues = variables qui valent None.
+    """
+    known = {v for v in PARAMETERS if v in present} | set(locked)
+    steps = []
+    _propagate(known, steps)
+    # entrées libres non déduites : on garde la valeur saisie
+    known |= {v for v in INPUTS if v in present}
+    _propagate(known, steps)
+    return tuple(steps), frozenset(VARIABLES) - known
+
+
+def resolve(values, locks):
+    """
+    Résolution ponctuelle, sans suivi des modifications : `values` (dict
+    variable → valeur, None = inconnue) est complété sur place et renvoyé.
+    """
+    present = frozenset(name for name, value in values.items() if value is not None)
+    locked = frozenset(name for name, on in locks.items() if on) & present
+    steps, unknown = build_plan(locked, present)
+    for target, inputs, func in steps:
+        args = [values.get(name) for name in inputs]
+        values[target] = None if None in args else func(*args)
+    for name in unknown:
+        values[name] = None
+    return values
+
+
+class Dataflow:
+    """
+    flow = Dataflow({"sensor_width_mm": 6.0, "resolution_x": 2000, ...})
+    flow.set_locks({"wd": True, "focal": True})
+    flow.update({"wd": 400.0, "focal": 12.0})
+    changed = flow.solve()   # {variable: nouvelle valeur}
+    """
+
+    def __init__(self, values=None, locks=None):
+        self.values = dict.fromkeys(VARIABLES)
+        self.locked = frozenset()
+        self._plan = None
+        self._dirty = set()
+        self._last = dict(self.values)
+        if values:
+            self.update(values)
+        if locks:
+            self.set_locks(locks)
+
+    def set(self, name, value):
+        if name not in self.values:
+            raise KeyError(name)
+        old = self.values[name]
+        if (old is None) != (value is None):
+            self._plan = None  # variables connues différentes
+        self.values[name] = value
+        self._dirty.add(name)
+
+    def update(self, values):
+        for name, value in values.items():
+            self.set(name, value)
+
+    def set_locks(self, locks):
+        # locks : {variable: bool} (les variables absentes sont déverrouillées)
+        locked = frozenset(name for name, on in locks.items() if on)
+        unknown = locked - self.values.keys()
+        if unknown:
+            raise KeyError(sorted(unknown)[0])
+        if locked != self.locked:
+            self.locked = locked
+            self._plan = None
+
+    def plan(self):
+        if self._plan is None:
+            present = frozenset(name for name, value in self.values.items() if value is not None)
+            self._plan = build_plan(self.locked & present, present)
+            self._dirty = set(VARIABLES)  # nouveau plan : tout recalculer
+        return self._plan
+
+    def solve(self):
+        """
+        Recalcule les étapes en aval des variables modifiées depuis le dernier
+        appel et renvoie {variable: valeur} des variables qui ont changé.
+        """
+        steps, unknown = self.plan()
+        values = self.values
+        dirty = self._dirty
+        for name in unknown:
+            values[name] = None
+        for target, inputs, func in steps:
+            # une cible modifiée de l'extérieur est recalculée (elle est déduite)
+            if target in dirty or any(name in dirty for name in inputs):
+                args = [values[name] for name in inputs]
+                value = None if None in args else func(*args)
+                if value != values[target]:
+                    values[target] = value
+                    dirty.add(target)
+        self._dirty = set()
+
+        changed = {name: value for name, value in values.items() if value != self._last[name]}
+        self._last = dict(values)
+        return changed
@@ -0,0 +1,265 @@
+# services/importer.py
+"""
+Import en masse de fiches constructeur (CSV / JSONL / JSON) dans le catalogue.
+
+- lecture en flux pour CSV et JSONL (JSON : liste ou {"cameras": [...]},
+  chargé d'un bloc) ;
+- en-têtes normalisés ("Pixel size (µm)" → pixel_size_um) puis alias
+  constructeur ("model" → name, "max_image_cirle" → max_image_circle, ...) ;
+- unités : "3.45 µm", "16mm", "0.0345 mm", "f/2.8", colonnes *_nm ... ;
+  puis normalize_camera / normalize_objective (shutter en minuscules,
+  monture en majuscules, ouverture en nombre) ;
+- une ligne invalide ou un nom déjà vu dans le fichier est rejeté (avec la
+  raison) sans interrompre l'import ;
+- les lignes valides sont écrites par blocs de batch_size dans le journal
+  (un verrou + un fsync par bloc), puis le catalogue est compacté.
+"""
+
+import json
+import re
+from pathlib import Path
+
+from services.batch import InvalidRow, read_rows
+from services.database_manager import normalize_camera, normalize_objective
+
+CAMERA_FIELDS = ("name", "resolution_x", "resolution_y", "pixel_size_um", "shutter", "mount", "notes")
+OBJECTIVE_FIELDS = ("name", "focal_length", "mount", "max_image_circle", "aperture", "notes")
+
+# alias d'en-tête → (champ, facteur de conversion)
+_CAMERA_ALIASES = {
+    "model": ("name", None),
+    "camera": ("name", None),
+    "width": ("resolution_x", None),
+    "res_x": ("resolution_x", None),
+    "resolution_x_px": ("resolution_x", None),
+    "height": ("resolution_y", None),
+    "res_y": ("resolution_y", None),
+    "resolution_y_px": ("resolution_y", None),
+    "pixel_size": ("pixel_size_um", None),
+    "pixel_um": ("pixel_size_um", None),
+    "pixel_size_nm": ("pixel_size_um", 1e-3),
+    "pixel_size_mm": ("pixel_size_um", 1e3),
+    "shutter_type": ("shutter", None),
+    "lens_mount": ("mount", None),
+    "description": ("notes", None),
+    "sensor": ("notes", None),
+}
+_OBJECTIVE_ALIASES = {
+    "model": ("name", None),
+    "lens": ("name", None),
+    "focal": ("focal_length", None),
+    "focal_length_mm": ("focal_length", None),
+    "max_image_cirle": ("max_image_circle", None),
+    "image_circle": ("max_image_circle", None),
+    "image_circle_mm": ("max_image_circle", None),
+    "max_image_circle_mm": ("max_image_circle", None),
+    "f_number": ("aperture", None),
+    "f_stop": ("aperture", None),
+    "lens_mount": ("mount", None),
+    "description": ("notes", None),
+}
+
+# unité de chaque champ numérique → facteurs des unités acceptées
+_LENGTH_UNITS = {
+    "mm": {"mm": 1., "cm": 10., "um": 1e-3, "µm": 1e-3, "μm": 1e-3},
+    "um": {"um": 1., "µm": 1., "μm": 1., "nm": 1e-3, "mm": 1e3},
+}
+_UNIT_OF = {
+    "pixel_size_um": "um",
+    "focal_length": "mm",
+    "max_image_circle": "mm",
+}
+_QUANTITY = re.compile(r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([a-zµμ]*)\s*$", re.IGNORECASE)
+_F_NUMBER = re.compile(r"^\s*(?:f\s*/?|1\s*:)\s*", re.IGNORECASE)
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+_RESOLUTION = re.compile(r"^\s*(\d+)\s*[x×*]\s*(\d+)\s*$", re.IGNORECASE)
+
+
+class ImportReport:
+    def __init__(self, kind):
+        self.kind = kind
+        self.rows = 0
+        self.imported = 0
+        self.skipped = 0      # déjà au catalogue (update=False)
+        self.rejected = []    # (ligne, nom, raison)
+
+    def as_dict(self, max_rejected=20):
+        return {
+            "kind": self.kind,
+            "rows": self.rows,
+            "imported": self.imported,
+            "skipped": self.skipped,
+            "rejected": len(self.rejected),
+            "rejections": [
+                {"row": row, "name": name, "reason": reason}
+                for row, name, reason in self.rejected[:max_rejected]
+            ],
+        }
+
+
+def _header(key):
+    # "Pixel size (µm)" → "pixel_size_um"
+    key = str(key).lower().replace("µ", "u").replace("μ", "u")
+    return _NON_WORD.sub("_", key).strip("_")
+
+
+def _quantity(value, unit):
+    # "3.45 µm" → 3.45 (dans l'unité du champ) ; nombre nu ou illisible : inchangé
+    if not isinstance(value, str):
+        return value
+    match = _QUANTITY.match(value)
+    if not match:
+        return value
+    number, suffix = match.groups()
+    if not suffix:
+        return number
+    factor = _LENGTH_UNITS[unit].get(suffix.lower())
+    if factor is None:
+        raise ValueError(f"unknown unit {suffix!r}")
+    return float(number) * factor
+
+
+def _canonical(row, aliases):
+    record = {}
+    for key, value in row.items():
+        if key is None:  # colonnes en trop d'une ligne CSV
+            continue
+        field, factor = aliases.get(_header(key), (_header(key), None))
+        if value is None or (isinstance(value, str) and not value.strip()):
+            if field not in record:
+                record[field] = None
+            continue
+        if factor is not None:
+            # l'unité est dans l'en-tête ("pixel_size_nm") : nombre nu attendu
+            value = float(value) * factor
+        if record.get(field) is None:
+            record[field] = value
+    return record
+
+
+def prepare_camera(row):
+    """
+    Ligne constructeur → enregistrement caméra normalisé (ValueError si invalide).
+    """
+    record = _canonical(row, _CAMERA_ALIASES)
+    resolution = record.get("resolution")
+    match = _RESOLUTION.match(resolution) if isinstance(resolution, str) else None
+    if match:
+        # "2448 x 2048"
+        for key, value in zip(("resolution_x", "resolution_y"), match.groups()):
+            if record.get(key) is None:
+                record[key] = value
+    for field, unit in _UNIT_OF.items():
+        if field in record:
+            record[field] = _quantity(record[field], unit)
+    cam = normalize_camera({key: record[key] for key in CAMERA_FIELDS if record.get(key) is not None})
+    if not cam["name"]:
+        raise ValueError("missing name")
+    for key in ("resolution_x", "resolution_y", "pixel_size_um"):
+        if cam[key] is None or cam[key] <= 0:
+            raise ValueError(f"invalid {key}: {record.get(key)!r}")
+    if not cam.get("mount"):
+        cam.pop("mount", None)
+    return cam
+
+
+def prepare_objective(row):
+    """
+    Ligne constructeur → enregistrement objectif normalisé (ValueError si invalide).
+    """
+    record = _canonical(row, _OBJECTIVE_ALIASES)
+    for field, unit in _UNIT_OF.items():
+        if field in record:
+            record[field] = _quantity(record[field], unit)
+    if isinstance(record.get("aperture"), str):
+        # "F2.8", "f/2.8", "1:2.8"
+        record["aperture"] = _F_NUMBER.sub("", record["aperture"])
+    obj = normalize_objective({key: record[key] for key in OBJECTIVE_FIELDS if record.get(key) is not None})
+    if not obj["name"]:
+        raise ValueError("missing name")
+    if obj["focal_length"] is None or obj["focal_length"] <= 0:
+        raise ValueError(f"invalid focal_length: {record.get('focal_length')!r}")
+    for key in ("max_image_circle", "aperture"):
+        if record.get(key) is not None and (obj[key] is None or obj[key] <= 0):
+            raise ValueError(f"invalid {key}: {record.get(key)!r}")
+    if not obj.get("notes"):
+        obj.pop("notes", None)
+    return obj
+
+
+def read_source(path):
+    """
+    Générateur de lignes : CSV / JSONL en flux, JSON (liste ou objet
+    contenant une liste) chargé d'un bloc. Une ligne JSONL illisible donne
+    un InvalidRow, rejeté par import_records sans interrompre l'import.
+    """
+    if Path(path).suffix.lower() != ".json":
+        yield from read_rows(path)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = next((value for value in data.values() if isinstance(value, list)), [])
+    yield from data
+
+
+def import_records(db, kind, rows, update=False, batch_size=5000, compact=True, progress=None):
+    """
+    Importe des lignes constructeur dans le catalogue `kind`
+    ("cameras" / "objectives") de `db` (DatabaseManager).
+    update=False : les noms déjà au catalogue sont ignorés (skipped) ;
+    update=True : ils sont remplacés. progress(report) est appelé après
+    chaque bloc écrit.
+    """
+    if kind == "cameras":
+        prepare, existing, append = prepare_camera, db.load_cameras(), db.append_cameras
+        journal = db.camera_journal
+    elif kind == "objectives":
+        prepare, existing, append = prepare_objective, db.load_objectives(), db.append_objectives
+        journal = db.objective_journal
+    else:
+        raise ValueError(f"Unknown catalog: {kind!r} (use cameras or objectives)")
+
+    report = ImportReport(kind)
+    seen = set()
+    pending = []
+
+    def flush():
+        append(pending)
+        report.imported += len(pending)
+        pending.clear()
+        if progress is not None:
+            progress(report)
+
+    for i, row in enumerate(rows):
+        report.rows += 1
+        name = str(row.get("name") or row.get("model") or "").strip() if isinstance(row, dict) else ""
+        try:
+            if isinstance(row, InvalidRow):
+                raise ValueError(str(row))
+            if not isinstance(row, dict):
+                raise ValueError("not an object")
+            record = prepare(row)
+        except (ValueError, TypeError) as e:
+            report.rejected.append((i, name, str(e)))
+            continue
+        name = record["name"]
+        if name in seen:
+            report.rejected.append((i, name, "duplicate name in source"))
+            continue
+        seen.add(name)
+        if name in existing and not update:
+            report.skipped += 1
+            continue
+        pending.append(record)
+        if len(pending) >= batch_size:
+            flush()
+    if pending:
+        flush()
+    if compact and report.imported:
+        journal.compact()
+    return report
+
+
+def import_file(db, kind, path, **kwargs):
+    return import_records(db, kind, read_source(path), **kwargs)
@@ -0,0 +1,163 @@
+# services/instrumentation.py
+"""
+Instrumentation légère des chemins chauds (E/S catalogue, solve, handlers
+de MainWindow, phases de démarrage).
+
+Activation : variable d'environnement OPTICAL_CONFIGURATOR_PROFILE
+    =chemin.json  → histogrammes écrits dans ce fichier à la sortie
+    =1 ou stderr  → écrits sur stderr
+
+Désactivée (par défaut), le coût est quasi nul :
+- @timed renvoie la fonction d'origine, sans wrapper ;
+- span() renvoie un context manager vide partagé.
+
+Les durées sont agrégées en mémoire par nom : nombre, total, min, max et
+histogramme en puissances de 2 (µs).
+"""
+
+import atexit
+import json
+import os
+import sys
+import time
+from functools import wraps
+
+ENV_VAR = "OPTICAL_CONFIGURATOR_PROFILE"
+
+_target = os.environ.get(ENV_VAR) or None
+_histograms = {}
+
+
+class Histogram:
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        # buckets[k] : durées dans ]2^(k-1), 2^k] µs
+        self.buckets = [0] * 40
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        k = min(int(seconds * 1e6).bit_length(), len(self.buckets) - 1)
+        self.buckets[k] += 1
+
+    def as_dict(self):
+        last = max((k for k, n in enumerate(self.buckets) if n), default=-1)
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1e3,
+            "mean_ms": self.total * 1e3 / self.count if self.count else 0.0,
+            "min_ms": self.min * 1e3 if self.count else 0.0,
+            "max_ms": self.max * 1e3,
+            "buckets_us": {f"<={1 << k}": n for k, n in enumerate(self.buckets[:last + 1]) if n},
+        }
+
+
+def enabled():
+    return _target is not None
+
+
+def enable(target="stderr"):
+    """
+    Active la collecte à l'exécution (ex. option --profile). Les fonctions
+    décorées avant l'appel ne sont pas instrumentées : pour tout couvrir,
+    utiliser la variable d'environnement.
+    """
+    global _target
+    first = _target is None
+    _target = target
+    if first:
+        atexit.register(dump)
+
+
+def record(name, seconds):
+    hist = _histograms.get(name)
+    if hist is None:
+        hist = _histograms[name] = Histogram()
+    hist.add(seconds)
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """
+    with span("db.load_cameras"): ...
+    """
+    return _Span(name) if _target is not None else _NULL_SPAN
+
+
+def timed(name=None):
+    """
+    Décorateur : chronomètre chaque appel sous `name` (par défaut
+    module.fonction). Sans effet si la collecte est désactivée.
+    """
+    def decorator(func):
+        if _target is None:
+            return func
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    return {name: hist.as_dict() for name, hist in sorted(_histograms.items())}
+
+
+def reset():
+    _histograms.clear()
+
+
+def dump(target=None):
+    target = target or _target
+    if target is None:
+        return
+    text = json.dumps(snapshot(), indent=2)
+    if target in ("1", "stderr"):
+        print(text, file=sys.stderr)
+    else:
+        with open(target, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if _target is not None:
+    atexit.register(dump)
@@ -0,0 +1,92 @@
+"""
+Module : optics_batch
+Versions vectorisées (NumPy) des fonctions de optics_calculations.
+
+Chaque fonction accepte des scalaires ou des tableaux (broadcasting NumPy)
+et renvoie des tableaux float64. Les divisions par zéro ne lèvent pas
+d'exception : les éléments concernés valent NaN.
+Les opérations sont faites dans le même ordre que la version scalaire,
+les résultats sont donc identiques bit à bit.
+"""
+
+import numpy as np
+
+
+def _divide(num, den) -> np.ndarray:
+    """
+    num / den, NaN là où den == 0.
+    """
+    num, den = np.broadcast_arrays(
+        np.asarray(num, dtype=np.float64),
+        np.asarray(den, dtype=np.float64),
+    )
+    out = np.full(num.shape, np.nan)
+    np.divide(num, den, out=out, where=den != 0)
+    return out
+
+
+# ------------------------------------------------------------
+# 1. Relations géométriques optiques
+# ------------------------------------------------------------
+
+def compute_fov_batch(sensor_mm, focal_mm, distance_mm) -> np.ndarray:
+    """
+    FOV = sensor_size * WD / focal
+    """
+    return np.asarray(sensor_mm, dtype=np.float64) * _divide(distance_mm, focal_mm)
+
+
+def compute_distance_batch(fov_mm, sensor_mm, focal_mm) -> np.ndarray:
+    """
+    WD = FOV * focal / sensor
+    """
+    return np.asarray(fov_mm, dtype=np.float64) * _divide(focal_mm, sensor_mm)
+
+
+def compute_focal_batch(sensor_mm, distance_mm, fov_mm) -> np.ndarray:
+    """
+    focal = sensor * WD / FOV
+    """
+    return np.asarray(sensor_mm, dtype=np.float64) * _divide(distance_mm, fov_mm)
+
+
+# ------------------------------------------------------------
+# 2. Résolution px/mm
+# ------------------------------------------------------------
+
+def compute_px_per_mm_batch(resolution_px, fov_mm) -> np.ndarray:
+    """
+    px/mm = resolution_px / FOV_mm
+    """
+    return _divide(resolution_px, fov_mm)
+
+
+def compute_min_detectable_defect_batch(px_per_mm, required_pixels=3) -> np.ndarray:
+    """
+    defect_size_mm = required_pixels / (px/mm)
+    """
+    return _divide(required_pixels, px_per_mm)
+
+
+def compute_motion_blur_batch(speed_m_s, exposure_time_s, px_per_mm, pixel_size_um):
+    """
+    Vectorized compute_motion_blur.
+
+    Returns:
+        blur_object_mm
+        blur_sensor_um
+        blur_px (NaN where pixel_size_um == 0)
+    """
+    speed_m_s = np.asarray(speed_m_s, dtype=np.float64)
+    exposure_time_s = np.asarray(exposure_time_s, dtype=np.float64)
+    px_per_mm = np.asarray(px_per_mm, dtype=np.float64)
+    pixel_size_um = np.asarray(pixel_size_um, dtype=np.float64)
+
+    blur_object_mm = speed_m_s * exposure_time_s * 1000.0
+    magnification = (px_per_mm * pixel_size_um) / 1000.0
+    blur_sensor_um = blur_object_mm * magnification * 1000.0
+    blur_px = _divide(blur_sensor_um, pixel_size_um)
+
+    # blur_object_mm ne dépend que de speed/exposure : on l'étend à la forme commune
+    blur_object_mm = np.broadcast_to(blur_object_mm, blur_px.shape).copy()
+    return blur_object_mm, blur_sensor_um, blur_px
@@ -95,35 +95,35 @@ def compute_motion_blur(
 
 
 
-# # ------------------------------------------------------------
-# # 3. Profondeur de champ (approximation basique)
-# # ------------------------------------------------------------
-
-# def compute_dof(f_number: float, coc_mm: float, magnification: float) -> float:
-#     """
-#     DOF approximée pour imaging indus.
-#     DOF ~ 2*N*CoC*(1+m)/m^2  
-#     """
-#     if magnification == 0:
-#         raise ValueError("Magnification cannot be zero.")
-#     return 2 *f_number*coc_mm*(1+magnification)/(magnification**2)
-
-
-# def compute_magnification(sensor_mm: float, fov_mm: float) -> float:
-#     """
-#     m = sensor/FOV
-#     """
-#     if fov_mm == 0:
-#         raise ValueError("FOV cannot be zero.")
-#     return sensor_mm/fov_mm
-
-
-# # ------------------------------------------------------------
-# # 4. Compatibilité capteur / objectif
-# # ------------------------------------------------------------
-
-# def is_sensor_compatible(image_circle_mm: float, sensor_diagonal_mm: float) -> bool:
-#     """
-#     Un objectif est compatible si son cercle d'image >= diagonale du capteur
-#     """
-#     return image_circle_mm >= sensor_diagonal_mm
+# ------------------------------------------------------------
+# 3. Profondeur de champ (approximation basique)
+# ------------------------------------------------------------
+
+def compute_dof(f_number: float, coc_mm: float, magnification: float) -> float:
+    """
+    DOF approximée pour imaging indus.
+    DOF ~ 2*N*CoC*(1+m)/m^2  
+    """
+    if magnification == 0:
+        raise ValueError("Magnification cannot be zero.")
+    return 2 *f_number*coc_mm*(1+magnification)/(magnification**2)
+
+
+def compute_magnification(sensor_mm: float, fov_mm: float) -> float:
+    """
+    m = sensor/FOV
+    """
+    if fov_mm == 0:
+        raise ValueError("FOV cannot be zero.")
+    return sensor_mm/fov_mm
+
+
+# ------------------------------------------------------------
+# 4. Compatibilité capteur / objectif
+# ------------------------------------------------------------
+
+def is_sensor_compatible(image_circle_mm: float, sensor_diagonal_mm: float) -> bool:
+    """
+    Un objectif est compatible si son cercle d'image >= diagonale du capteur
+    """
+    return image_circle_mm >= sensor_diagonal_mm
@@ -0,0 +1,225 @@
+# services/parallel_sweep.py
+"""
+Balayage catalogue complet (caméras × objectifs × WD [× vitesse × exposition])
+réparti sur plusieurs cœurs.
+
+- les colonnes d'entrée (capteur, résolution, pixel, focales, axes) et les
+  tableaux de sortie sont dans multiprocessing.shared_memory : les
+  processus s'y attachent par nom, lisent et écrivent en place, seuls
+  (nom, forme, dtype) et des indices de blocs sont sérialisés ;
+- le travail est découpé en blocs de caméras de taille bornée (block_size
+  évaluations), bien plus nombreux que les processus : la charge s'équilibre ;
+- les petits travaux (< min_parallel évaluations) ou workers <= 1 sont
+  calculés dans le processus courant, sans mémoire partagée.
+
+Formules : services.optics_batch, résultats identiques à services.sweep
+et aux fonctions scalaires.
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from services.catalog import as_camera_catalog, as_objective_catalog
+from services.instrumentation import timed
+from services.optics_batch import (
+    compute_fov_batch,
+    compute_px_per_mm_batch,
+    compute_min_detectable_defect_batch,
+    compute_motion_blur_batch,
+)
+
+OUTPUTS = ("fov", "px_per_mm", "min_defect_mm")
+BLUR_OUTPUTS = ("blur_object_mm", "blur_sensor_um", "blur_px")
+
+
+class _Shared:
+    """
+    Tableau NumPy dans un segment de mémoire partagée ; spec() est la seule
+    chose envoyée aux processus.
+    """
+
+    def __init__(self, shape, dtype=np.float64, name=None):
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        self.owner = name is None
+        if self.owner or sys.version_info < (3, 13):
+            self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        else:
+            # seul le processus créateur suit (et supprime) le segment
+            self.shm = shared_memory.SharedMemory(name=name, size=size, track=False)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf)
+        self.dtype = dtype
+
+    @classmethod
+    def from_array(cls, values):
+        values = np.ascontiguousarray(values)
+        shared = cls(values.shape, values.dtype)
+        shared.array[...] = values
+        return shared
+
+    def spec(self):
+        return self.shm.name, self.array.shape, self.dtype.str
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class CatalogSweep:
+    """
+    Résultat d'un balayage : axes ("cameras", "objectives", "wd" et, avec
+    vitesse / exposition, "speed", "exposure") et tableaux
+    result["fov"] (n_cam, n_obj, n_wd), result["blur_px"]
+    (n_cam, n_obj, n_wd, n_speed, n_exp), ...
+
+    En mode parallèle les tableaux sont des vues sur la mémoire partagée :
+    valides jusqu'à close() (ou la sortie du bloc with).
+    """
+
+    def __init__(self, axes, arrays, shared=()):
+        self.axes = axes
+        self.arrays = arrays
+        self._shared = list(shared)
+
+    def __getitem__(self, key):
+        if key in self.axes:
+            return self.axes[key]
+        return self.arrays[key]
+
+    def __contains__(self, key):
+        return key in self.axes or key in self.arrays
+
+    def keys(self):
+        return list(self.axes) + list(self.arrays)
+
+    def close(self):
+        self.arrays = {}
+        for shared in self._shared:
+            shared.close()
+        self._shared = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ------------------------------------------------------------
+# Calcul d'un bloc de caméras (processus courant ou worker)
+# ------------------------------------------------------------
+
+def _evaluate_block(inputs, outputs, start, stop, required_pixels):
+    sensor_w = inputs["sensor_width_mm"][start:stop, None, None]
+    resolution_x = inputs["resolution_x"][start:stop, None, None]
+    focal = inputs["focal_length"][None, :, None]
+    wd = inputs["wd"][None, None, :]
+
+    fov = compute_fov_batch(sensor_w, focal, wd)
+    px_per_mm = compute_px_per_mm_batch(resolution_x, fov)
+    outputs["fov"][start:stop] = fov
+    outputs["px_per_mm"][start:stop] = px_per_mm
+    outputs["min_defect_mm"][start:stop] = compute_min_detectable_defect_batch(px_per_mm, required_pixels)
+
+    if "blur_px" in outputs:
+        blur = compute_motion_blur_batch(
+            inputs["speed"][None, None, None, :, None],
+            inputs["exposure"][None, None, None, None, :],
+            px_per_mm[..., None, None],
+            inputs["pixel_size_um"][start:stop, None, None, None, None],
+        )
+        for key, values in zip(BLUR_OUTPUTS, blur):
+            outputs[key][start:stop] = values
+
+
+def _attach(specs):
+    shared = {key: _Shared(shape, dtype, name=name) for key, (name, shape, dtype) in specs.items()}
+    return shared, {key: s.array for key, s in shared.items()}
+
+
+def _worker_block(input_specs, output_specs, start, stop, required_pixels):
+    inputs, input_arrays = _attach(input_specs)
+    outputs, output_arrays = _attach(output_specs)
+    try:
+        _evaluate_block(input_arrays, output_arrays, start, stop, required_pixels)
+    finally:
+        for shared in list(inputs.values()) + list(outputs.values()):
+            shared.close()
+    return stop - start
+
+
+# ------------------------------------------------------------
+# API
+# ------------------------------------------------------------
+
+def _blocks(n_cameras, per_camera, block_size):
+    step = max(1, block_size // max(1, per_camera))
+    return [(start, min(start + step, n_cameras)) for start in range(0, n_cameras, step)]
+
+
+@timed("parallel_sweep.catalog_sweep")
+def catalog_sweep(cameras, objectives, wd_mm, speed_m_s=None, exposure_time_s=None, required_pixels=3,
+                  workers=None, min_parallel=2_000_000, block_size=1_000_000):
+    """
+    Évalue chaque caméra × objectif (focale du catalogue) × WD, et avec
+    vitesse et exposition, × vitesse × exposition.
+
+    cameras / objectives : CameraCatalog / ObjectiveCatalog ou dicts de
+    DatabaseManager. workers=None : os.cpu_count(). Renvoie un CatalogSweep
+    (à fermer en mode parallèle, ou utiliser `with`).
+    """
+    cameras, objectives = as_camera_catalog(cameras), as_objective_catalog(objectives)
+    wd = np.atleast_1d(np.asarray(wd_mm, dtype=np.float64))
+    inputs = {
+        "sensor_width_mm": cameras.column("sensor_width_mm"),
+        "resolution_x": cameras.column("resolution_x").astype(np.float64),
+        "pixel_size_um": cameras.column("pixel_size_um"),
+        "focal_length": objectives.column("focal_length"),
+        "wd": wd,
+    }
+    axes = {"cameras": list(cameras.names), "objectives": list(objectives.names), "wd": wd}
+    shape = (len(cameras), len(objectives), len(wd))
+    shapes = {key: shape for key in OUTPUTS}
+    if speed_m_s is not None and exposure_time_s is not None:
+        inputs["speed"] = axes["speed"] = np.atleast_1d(np.asarray(speed_m_s, dtype=np.float64))
+        inputs["exposure"] = axes["exposure"] = np.atleast_1d(np.asarray(exposure_time_s, dtype=np.float64))
+        blur_shape = shape + (len(inputs["speed"]), len(inputs["exposure"]))
+        shapes.update({key: blur_shape for key in BLUR_OUTPUTS})
+
+    per_camera = max(int(np.prod(s[1:])) for s in shapes.values())
+    total = per_camera * len(cameras)
+    workers = os.cpu_count() if workers is None else workers
+    blocks = _blocks(len(cameras), per_camera, block_size)
+
+    if workers <= 1 or total < min_parallel or len(blocks) < 2:
+        outputs = {key: np.empty(s) for key, s in shapes.items()}
+        for start, stop in blocks:
+            _evaluate_block(inputs, outputs, start, stop, required_pixels)
+        return CatalogSweep(axes, outputs)
+
+    shared_inputs = {key: _Shared.from_array(values) for key, values in inputs.items()}
+    shared_outputs = {key: _Shared(s) for key, s in shapes.items()}
+    try:
+        input_specs = {key: s.spec() for key, s in shared_inputs.items()}
+        output_specs = {key: s.spec() for key, s in shared_outputs.items()}
+        with ProcessPoolExecutor(max_workers=min(workers, len(blocks))) as pool:
+            futures = [
+                pool.submit(_worker_block, input_specs, output_specs, start, stop, required_pixels)
+                for start, stop in blocks
+            ]
+            for future in futures:
+                future.result()
+    except BaseException:
+        for shared in list(shared_inputs.values()) + list(shared_outputs.values()):
+            shared.close()
+        raise
+    for shared in shared_inputs.values():
+        shared.close()
+    arrays = {key: s.array for key, s in shared_outputs.items()}
+    return CatalogSweep(axes, arrays, shared_outputs.values())
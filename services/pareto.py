@@ -0,0 +1,321 @@
+# services/pareto.py
+"""
+Front de Pareto des configurations caméra × objectif × WD.
+
+Critères (sens fixé par SENSES) : défaut min (min), WD (max, dégagement
+de montage), FOV (max), flou en pixels (min), px/mm (max). Un point est
+dominé si un autre point est au moins aussi bon sur tous les critères et
+strictement meilleur sur l'un d'eux ; deux points identiques ne se
+dominent pas.
+
+pareto_front (skyline par tri) :
+- 2 critères : tri lexicographique puis balayage avec le minimum courant,
+  O(n log n), entièrement vectorisé ;
+- 3 critères : tri sur le 1er critère, escalier (2e, 3e) maintenu par
+  dichotomie, O(n log n) ;
+- plus de 3 critères : tri par somme des rangs puis filtrage par blocs
+  contre le front courant (vectorisé).
+Avant cela, un pré-filtre vectorisé contre quelques points pivots
+(minimums de sommes pondérées, donc sur le front) élimine l'essentiel des
+points dominés : tris et boucle Python ne voient que le reste.
+"""
+
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from services.catalog import as_camera_catalog, as_objective_catalog
+from services.compatibility import pair_mask
+from services.database_manager import DatabaseManager
+from services.optics_batch import (
+    compute_fov_batch,
+    compute_px_per_mm_batch,
+    compute_min_detectable_defect_batch,
+    compute_motion_blur_batch,
+)
+
+# +1 : à minimiser, -1 : à maximiser
+SENSES = {
+    "min_defect_mm": 1,
+    "wd": -1,
+    "fov": -1,
+    "blur_px": 1,
+    "px_per_mm": -1,
+}
+
+# grandeur dont dépend chaque critère et sens par rapport à elle : à
+# vitesse et exposition fixées, défaut min = k / px_mm et flou = v·t·px_mm,
+# ces trois critères sont des fonctions monotones de px/mm
+_BASIS = {
+    "min_defect_mm": ("px_per_mm", -1),
+    "px_per_mm": ("px_per_mm", -1),
+    "blur_px": ("px_per_mm", 1),
+    "wd": ("wd", -1),
+    "fov": ("fov", -1),
+}
+
+
+# ------------------------------------------------------------
+# Skyline
+# ------------------------------------------------------------
+
+def pareto_front(values):
+    """
+    Indices (croissants) des points non dominés de `values` (n, d), tous
+    les critères à minimiser. Les lignes contenant un NaN sont ignorées.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 2:
+        raise ValueError("values must be a 2-D array (points × criteria)")
+    finite = ~np.isnan(values[:, 0])
+    for j in range(1, values.shape[1]):
+        finite &= ~np.isnan(values[:, j])
+    rows = np.flatnonzero(finite)
+    if rows.size == 0:
+        return rows
+    d = values.shape[1]
+    if d == 1:
+        column = values[rows, 0]
+        return rows[column == column.min()]
+    rows = rows[_prefilter(values[rows] if rows.size < len(values) else values)]
+    points = values[rows]
+    if d == 2:
+        keep = _front_2d(points)
+    elif d == 3:
+        keep = _front_3d(points)
+    else:
+        keep = _front_nd(points)
+    return np.sort(rows[keep])
+
+
+def _prefilter(points, n_pivots=8, seed=0):
+    """
+    Indices des points non dominés par quelques pivots : les minimums de
+    sommes pondérées (poids > 0, critères ramenés à [0, 1]), qui sont sur
+    le front. Le test contre chaque pivot ne porte que sur les survivants
+    du précédent : O(n · d) pour l'essentiel des points. Calcul par
+    colonnes contiguës (les réductions sur l'axe court sont lentes).
+    """
+    columns = np.ascontiguousarray(points.T)
+    d = len(columns)
+    weights = np.vstack([np.eye(d) + 1e-3, np.random.default_rng(seed).random((n_pivots, d)) + 1e-3])
+    low, high = columns.min(axis=1), columns.max(axis=1)
+    weights /= np.where(high > low, high - low, 1.0)
+    # le décalage `low` ne change pas l'argmin ; calcul en place, colonne par colonne
+    total, term = np.empty(len(points)), np.empty(len(points))
+    pivots = set()
+    for w in weights:
+        np.multiply(columns[0], w[0], out=total)
+        for column, wi in zip(columns[1:], w[1:]):
+            total += np.multiply(column, wi, out=term)
+        pivots.add(int(np.argmin(total)))
+
+    alive = np.arange(len(points))
+    for pivot in sorted(pivots):
+        values = points[pivot]
+        current = columns[:, alive] if len(alive) < len(points) else columns
+        weak = current[0] >= values[0]
+        strict = current[0] > values[0]
+        for column, value in zip(current[1:], values[1:]):
+            weak &= column >= value
+            strict |= column > value
+        alive = alive[~(weak & strict)]
+    return alive
+
+
+def _lexsort(points):
+    # ordre lexicographique (1re colonne d'abord) : un dominant précède toujours le point dominé
+    return np.lexsort(points.T[::-1])
+
+
+def _front_2d(points):
+    order = _lexsort(points)
+    x, y = points[order, 0], points[order, 1]
+    # y strictement plus petit que tout ce qui précède → non dominé
+    best = np.minimum.accumulate(y)
+    keep_sorted = np.empty(len(y), dtype=bool)
+    keep_sorted[0] = True
+    keep_sorted[1:] = y[1:] < best[:-1]
+    # doublons exacts d'un point conservé : conservés aussi
+    same = np.zeros(len(y), dtype=bool)
+    same[1:] = (x[1:] == x[:-1]) & (y[1:] == y[:-1])
+    if same.any():
+        # propagation le long des séries de doublons
+        group = np.cumsum(~same) - 1
+        keep_sorted = keep_sorted[np.flatnonzero(~same)][group]
+    keep = np.empty(len(y), dtype=bool)
+    keep[order] = keep_sorted
+    return keep
+
+
+def _front_3d(points):
+    keep = np.zeros(len(points), dtype=bool)
+    ys, zs = [], []   # escalier : y croissant, z strictement décroissant
+    previous = None
+    order = _lexsort(points)
+    for k, point in zip(order.tolist(), points[order].tolist()):
+        x, y, z = point
+        i = bisect_right(ys, y) - 1
+        if i >= 0 and zs[i] <= z and point != previous:
+            continue
+        keep[k] = True
+        previous = point
+        # retire les marches que le nouveau point domine en (y, z)
+        j = bisect_left(ys, y)
+        end = j
+        while end < len(ys) and zs[end] >= z:
+            end += 1
+        ys[j:end] = [y]
+        zs[j:end] = [z]
+    return keep
+
+
+def _front_nd(points, block=512):
+    # rangs denses (ex aequo = même rang) : un dominant a une somme de rangs
+    # strictement plus petite, il passe avant
+    ranks = sum(np.unique(column, return_inverse=True)[1] for column in points.T)
+    order = np.lexsort((*points.T[::-1], ranks))
+    front = np.empty((0, points.shape[1]))
+    kept = []
+    for start in range(0, len(order), block):
+        idx = order[start:start + block]
+        chunk = points[idx]
+        alive = np.ones(len(idx), dtype=bool)
+        if len(front):
+            le = (front[None, :, :] <= chunk[:, None, :]).all(axis=2)
+            lt = (front[None, :, :] < chunk[:, None, :]).any(axis=2)
+            alive &= ~(le & lt).any(axis=1)
+        # dominance à l'intérieur du bloc (les dominants sont plus tôt dans l'ordre)
+        le = (chunk[:, None, :] <= chunk[None, :, :]).all(axis=2)
+        lt = (chunk[:, None, :] < chunk[None, :, :]).any(axis=2)
+        dominated_by = le & lt & alive[:, None]
+        alive &= ~dominated_by.any(axis=0)
+        front = np.concatenate([front, chunk[alive]])
+        kept.append(idx[alive])
+    keep = np.zeros(len(points), dtype=bool)
+    keep[np.concatenate(kept)] = True
+    return keep
+
+
+# ------------------------------------------------------------
+# Configurations du catalogue
+# ------------------------------------------------------------
+
+def _independent_criteria(criteria, blur_constant):
+    """
+    Critères effectivement comparés : un seul par grandeur de base (le
+    premier cité, les autres donnent le même ordre). Deux critères de sens
+    opposés sur la même grandeur rendraient presque tout non dominé :
+    erreur. Flou constant (vitesse ou exposition nulle) : critère ignoré.
+    """
+    kept, senses = [], {}
+    for criterion in criteria:
+        if criterion == "blur_px" and blur_constant:
+            continue
+        basis, sense = _BASIS[criterion]
+        if basis not in senses:
+            senses[basis] = (criterion, sense)
+            kept.append(criterion)
+        elif senses[basis][1] != sense:
+            raise ValueError(
+                f"{senses[basis][0]} and {criterion} both depend only on px/mm in opposite directions; "
+                "use max_blur_px / max_defect_mm as constraints instead."
+            )
+    return tuple(kept)
+
+
+def configuration_front(
+    wd_mm,
+    criteria=("min_defect_mm", "wd", "fov"),
+    speed_m_s: float = None,
+    exposure_time_s: float = None,
+    required_pixels: int = 3,
+    max_defect_mm: float = None,
+    max_blur_px: float = None,
+    min_fov_mm: float = None,
+    max_fov_mm: float = None,
+    cameras=None,
+    objectives=None,
+    compatible_only: bool = True,
+):
+    """
+    Front de Pareto des configurations caméra × objectif (focale du
+    catalogue) × WD (wd_mm : valeurs candidates) selon `criteria`
+    (clés de SENSES ; "blur_px" demande speed_m_s et exposure_time_s).
+    Les contraintes données écartent les points avant le calcul du front.
+
+    Renvoie une liste de dicts triée sur le premier critère.
+    cameras / objectives : CameraCatalog / ObjectiveCatalog ou dicts
+    {name: record} (DatabaseManager par défaut).
+    """
+    unknown = [c for c in criteria if c not in SENSES]
+    if unknown:
+        raise ValueError(f"Unknown criteria: {unknown} (use {sorted(SENSES)})")
+    with_blur = speed_m_s is not None and exposure_time_s is not None
+    if ("blur_px" in criteria or max_blur_px is not None) and not with_blur:
+        raise ValueError("Blur needs speed_m_s and exposure_time_s.")
+    if not criteria:
+        raise ValueError("At least one criterion is needed.")
+    compared = _independent_criteria(criteria, with_blur and speed_m_s * exposure_time_s == 0)
+
+    if cameras is None or objectives is None:
+        db = DatabaseManager()
+        cameras = db.load_camera_catalog() if cameras is None else cameras
+        objectives = db.load_objective_catalog() if objectives is None else objectives
+    cameras, objectives = as_camera_catalog(cameras), as_objective_catalog(objectives)
+    wd_axis = np.atleast_1d(np.asarray(wd_mm, dtype=np.float64))
+
+    # couples exploitables (focale > 0, compatibles), puis produit avec les WD
+    cam_rows, obj_rows = np.meshgrid(np.arange(len(cameras)), np.arange(len(objectives)), indexing="ij")
+    cam_rows, obj_rows = cam_rows.ravel(), obj_rows.ravel()
+    usable = objectives.column("focal_length")[obj_rows] > 0
+    if compatible_only and cam_rows.size:
+        usable &= pair_mask(cameras, objectives, cam_rows, obj_rows)
+    cam_rows, obj_rows = cam_rows[usable], obj_rows[usable]
+    cam = np.repeat(cam_rows, len(wd_axis))
+    obj = np.repeat(obj_rows, len(wd_axis))
+    wd = np.tile(wd_axis, len(cam_rows))
+
+    focal = objectives.column("focal_length")[obj]
+    fov = compute_fov_batch(cameras.column("sensor_width_mm")[cam], focal, wd)
+    px_per_mm = compute_px_per_mm_batch(cameras.column("resolution_x")[cam], fov)
+    columns = {
+        "wd": wd,
+        "fov": fov,
+        "px_per_mm": px_per_mm,
+        "min_defect_mm": compute_min_detectable_defect_batch(px_per_mm, required_pixels),
+    }
+    if with_blur:
+        _, _, columns["blur_px"] = compute_motion_blur_batch(
+            speed_m_s, exposure_time_s, px_per_mm, cameras.column("pixel_size_um")[cam]
+        )
+
+    ok = np.isfinite(px_per_mm) & (fov > 0)
+    if max_defect_mm is not None:
+        ok &= columns["min_defect_mm"] <= max_defect_mm
+    if max_blur_px is not None:
+        ok &= columns["blur_px"] <= max_blur_px
+    if min_fov_mm is not None:
+        ok &= fov >= min_fov_mm
+    if max_fov_mm is not None:
+        ok &= fov <= max_fov_mm
+    points = np.flatnonzero(ok)
+
+    if compared:
+        scores = np.column_stack([columns[c][points] * SENSES[c] for c in compared])
+        front = points[pareto_front(scores)]
+    else:
+        # seul critère : un flou constant, aucun point n'en domine un autre
+        front = points
+    front = front[np.argsort(columns[criteria[0]][front] * SENSES[criteria[0]], kind="stable")]
+
+    results = []
+    for k in front.tolist():
+        result = {
+            "camera": cameras.names[cam[k]],
+            "objective": objectives.names[obj[k]],
+            "focal": float(focal[k]),
+        }
+        result.update({key: float(values[k]) for key, values in columns.items()})
+        results.append(result)
+    return results
@@ -0,0 +1,343 @@
+# services/result_cache.py
+"""
+Cache persistant (SQLite) des résultats : solve, recherche catalogue,
+front de Pareto, balayage catalogue.
+
+- clé : sha256 de (type de requête, empreinte du contenu des fichiers
+  catalogue, requête normalisée). Toute modification du catalogue (ajout,
+  import, compaction) change l'empreinte : les anciennes entrées ne sont
+  plus jamais servies et finissent évincées ;
+- empreinte : sha256 des octets de cameras.json(.log) et
+  objectives.json(.log), recalculée seulement quand (inode, mtime, taille)
+  d'un des fichiers change ;
+- requête normalisée : arguments liés à la signature de la fonction
+  (valeurs par défaut explicites), nombres en float, tuples / tableaux
+  en listes → `top_n=10` et l'omission de top_n donnent la même clé ;
+- taille bornée (max_bytes) : éviction LRU sur la date de dernier accès ;
+- compteurs hits / misses persistés par type de requête (taux de succès
+  entre sessions), plus ceux de la session (cache.hits / cache.misses).
+
+Valeurs sérialisées avec pickle : le fichier est local à l'utilisateur,
+comme le catalogue. Pas d'import NumPy ici (utilisé par la CLI).
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from services.database_manager import DATA_DIR
+from services.instrumentation import timed
+
+CACHE_FILE = DATA_DIR / "results_cache.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries(last_used);
+
+CREATE TABLE IF NOT EXISTS stats (
+    kind TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# paths → (signature stat, empreinte)
+_fingerprints = {}
+_fingerprints_lock = threading.Lock()
+
+
+# ------------------------------------------------------------
+# Empreinte du catalogue, requêtes normalisées
+# ------------------------------------------------------------
+
+def catalog_paths(db):
+    return (
+        db.camera_file, db.camera_journal.log_path,
+        db.objective_file, db.objective_journal.log_path,
+    )
+
+
+def _signature(paths):
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append((st.st_ino, st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def catalog_fingerprint(db):
+    """
+    sha256 du contenu des fichiers catalogue de `db` (base + journaux).
+    """
+    paths = tuple(str(p) for p in catalog_paths(db))
+    while True:
+        signature = _signature(paths)
+        with _fingerprints_lock:
+            known = _fingerprints.get(paths)
+        if known is not None and known[0] == signature:
+            return known[1]
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(path.rsplit(".", 1)[-1].encode() + b"\0")
+            try:
+                with open(path, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(block)
+            except FileNotFoundError:
+                digest.update(b"-")
+            digest.update(b"\0")
+        # fichier modifié pendant la lecture : on recommence
+        if _signature(paths) == signature:
+            with _fingerprints_lock:
+                _fingerprints[paths] = (signature, digest.hexdigest())
+            return digest.hexdigest()
+
+
+def normalize_query(value):
+    """
+    Forme canonique JSON d'une requête (TypeError si non représentable).
+    """
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(k): normalize_query(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [normalize_query(v) for v in value]
+    if hasattr(value, "tolist"):  # tableaux / scalaires NumPy
+        return normalize_query(value.tolist())
+    raise TypeError(f"Cannot use {type(value).__name__} in a cached query")
+
+
+def bound_query(func, query, skip=("cameras", "objectives")):
+    # arguments complétés par les valeurs par défaut de func : même clé
+    # que l'argument soit omis ou donné explicitement
+    bound = inspect.signature(func).bind_partial(**query)
+    bound.apply_defaults()
+    return {key: value for key, value in bound.arguments.items() if key not in skip}
+
+
+def cache_key(kind, fingerprint, query):
+    payload = json.dumps([kind, fingerprint, normalize_query(query)], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# ------------------------------------------------------------
+# Stockage
+# ------------------------------------------------------------
+
+class ResultCache:
+    """
+    Cache clé → valeur (pickle) dans un fichier SQLite, borné à max_bytes
+    (valeurs sérialisées), éviction LRU. Utilisable depuis plusieurs
+    threads (verrou) et plusieurs processus (verrous SQLite).
+    """
+
+    def __init__(self, path: Path = CACHE_FILE, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @timed("result_cache.get")
+    def get(self, key, kind="", default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            hit = row is not None
+            with self.conn:
+                if hit:
+                    self.conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time_ns(), key))
+                self._count(kind, hit)
+        if not hit:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    @timed("result_cache.put")
+    def put(self, key, value, kind=""):
+        """
+        Stocke value ; les entrées les moins récemment utilisées sont
+        évincées au-delà de max_bytes. Une valeur plus grosse que
+        max_bytes n'est pas stockée (renvoie False).
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return False
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (key, kind, value, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, blob, len(blob), time.time_ns()),
+            )
+            self._evict()
+        return True
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self.conn.execute("SELECT key, size FROM entries ORDER BY last_used"):
+            doomed.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        self.conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def _count(self, kind, hit):
+        column = "hits" if hit else "misses"
+        self.conn.execute("INSERT OR IGNORE INTO stats (kind) VALUES (?)", (kind,))
+        self.conn.execute(f"UPDATE stats SET {column} = {column} + 1 WHERE kind = ?", (kind,))
+
+    def stats(self):
+        with self.lock:
+            entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            rows = self.conn.execute("SELECT kind, hits, misses FROM stats ORDER BY kind").fetchall()
+        kinds = {kind: {"hits": hits, "misses": misses, "hit_rate": _rate(hits, misses)}
+                 for kind, hits, misses in rows}
+        hits = sum(k["hits"] for k in kinds.values())
+        misses = sum(k["misses"] for k in kinds.values())
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": _rate(hits, misses),
+            "kinds": kinds,
+        }
+
+    def clear(self, stats=True):
+        """
+        Vide le cache (et les compteurs si stats) ; renvoie le nombre
+        d'entrées supprimées.
+        """
+        with self.lock:
+            with self.conn:
+                removed = self.conn.execute("DELETE FROM entries").rowcount
+                if stats:
+                    self.conn.execute("DELETE FROM stats")
+            self.conn.execute("VACUUM")
+        self.hits = self.misses = 0
+        return removed
+
+
+def _rate(hits, misses):
+    return hits / (hits + misses) if hits + misses else None
+
+
+# ------------------------------------------------------------
+# Requêtes mises en cache
+# ------------------------------------------------------------
+
+def _cached(cache, kind, db, query, compute):
+    fingerprint = catalog_fingerprint(db)
+    key = cache_key(kind, fingerprint, query)
+    missing = object()
+    value = cache.get(key, kind, missing)
+    if value is missing:
+        value = compute()
+        # catalogue modifié pendant le calcul : rien n'est stocké sous l'ancienne empreinte
+        if catalog_fingerprint(db) == fingerprint:
+            cache.put(key, value, kind)
+    return value
+
+
+def _catalog_call(cache, kind, func, db, query, convert=None):
+    def compute():
+        result = func(cameras=db.load_camera_catalog(), objectives=db.load_objective_catalog(), **query)
+        return convert(result) if convert is not None else result
+
+    return _cached(cache, kind, db, bound_query(func, query), compute)
+
+
+def cached_search(cache, db, **query):
+    """
+    services.config_search.search_configurations(**query) sur le catalogue de db.
+    """
+    from services.config_search import search_configurations
+
+    return _catalog_call(cache, "search", search_configurations, db, query)
+
+
+def cached_front(cache, db, **query):
+    """
+    services.pareto.configuration_front(**query) sur le catalogue de db.
+    """
+    from services.pareto import configuration_front
+
+    return _catalog_call(cache, "pareto", configuration_front, db, query)
+
+
+def cached_sweep(cache, db, **query):
+    """
+    services.parallel_sweep.catalog_sweep(**query) sur le catalogue de db ;
+    renvoie un CatalogSweep en mémoire ordinaire (rien à fermer).
+    """
+    from services.parallel_sweep import CatalogSweep, catalog_sweep
+
+    def detach(result):
+        # copie hors mémoire partagée, puis libération des segments
+        with result:
+            return {"axes": result.axes, "arrays": {k: v.copy() for k, v in result.arrays.items()}}
+
+    stored = _catalog_call(cache, "sweep", catalog_sweep, db, query, convert=detach)
+    return CatalogSweep(stored["axes"], stored["arrays"])
+
+
+def cached_solve(cache, db, camera, lens=None, **params):
+    """
+    services.solver.evaluate pour la caméra `camera` (nom), la focale de
+    l'objectif `lens` (nom) si focal n'est pas donnée. KeyError si un nom
+    est inconnu.
+    """
+    from services.solver import evaluate
+
+    query = dict(bound_query(evaluate, {"camera": None, **params}, skip=("camera",)), camera=camera, lens=lens)
+
+    def compute():
+        # catalogues mappés : une ligne lue, pas tout le JSON
+        record = db.load_camera_catalog().record(camera)
+        focal = params.get("focal")
+        if lens is not None:
+            objective = db.load_objective_catalog().record(lens)
+            if focal is None:
+                focal = objective["focal_length"]
+        result = evaluate(record, **{**params, "focal": focal})
+        if lens is not None:
+            result["objective"] = lens
+        return result
+
+    return _cached(cache, "solve", db, query, compute)
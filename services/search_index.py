@@ -0,0 +1,174 @@
+# services/search_index.py
+"""
+Index de recherche incrémental sur les noms (et notes) du catalogue, pour
+la saisie assistée des sélecteurs caméra / objectif.
+
+Structures, mises à jour à chaque insertion (pas de reconstruction) :
+- noms en minuscules triés → préfixe du nom par dichotomie ;
+- mots (découpage sur les caractères non alphanumériques) triés →
+  préfixe d'un mot ("imx" trouve "Sony IMX264") ;
+- index inversé de trigrammes du nom et des notes → sous-chaîne
+  ("264" trouve "IMX264").
+
+Classement par niveaux : préfixe du nom, puis préfixe d'un mot du nom,
+puis sous-chaîne du nom, puis notes. Chaque niveau s'arrête dès que
+`limit` résultats sont trouvés : le coût d'une frappe dépend de `limit`,
+pas de la taille du catalogue.
+"""
+
+import re
+from bisect import bisect_left, insort
+
+_WORD = re.compile(r"[0-9a-z]+")
+
+
+def _words(text):
+    return set(_WORD.findall(text))
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class CatalogSearchIndex:
+    def __init__(self, records=None, fields=("notes",)):
+        self.fields = fields
+        self._names = []      # (nom minuscule, nom) triés
+        self._words = []      # (mot, nom) triés
+        self._name_grams = {}
+        self._note_grams = {}
+        self._entries = {}    # nom → (nom minuscule, notes minuscules)
+        if records:
+            self.add_many(records)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def add(self, name, record=None):
+        """
+        Ajoute (ou remplace) une entrée : insertions dichotomiques.
+        """
+        if name in self._entries:
+            self.remove(name)
+        lower = self._add_entry(name, record)
+        insort(self._names, (lower, name))
+        for word in _words(lower):
+            insort(self._words, (word, name))
+
+    def add_many(self, records):
+        """
+        Chargement en bloc {nom: enregistrement} : un seul tri à la fin.
+        """
+        for name in records:
+            if name in self._entries:
+                self.remove(name)
+        for name, record in records.items():
+            lower = self._add_entry(name, record)
+            self._names.append((lower, name))
+            self._words.extend((word, name) for word in _words(lower))
+        self._names.sort()
+        self._words.sort()
+
+    def _add_entry(self, name, record):
+        lower = name.lower()
+        notes = " ".join(str(record.get(f) or "") for f in self.fields).lower().strip() if record else ""
+        self._entries[name] = (lower, notes)
+        for gram in _trigrams(lower):
+            self._name_grams.setdefault(gram, set()).add(name)
+        for gram in _trigrams(notes):
+            self._note_grams.setdefault(gram, set()).add(name)
+        return lower
+
+    def remove(self, name):
+        lower, notes = self._entries.pop(name)
+        _discard(self._names, (lower, name))
+        for word in _words(lower):
+            _discard(self._words, (word, name))
+        for grams, text in ((self._name_grams, lower), (self._note_grams, notes)):
+            for gram in _trigrams(text):
+                postings = grams.get(gram)
+                if postings is not None:
+                    postings.discard(name)
+                    if not postings:
+                        del grams[gram]
+
+    def search(self, query, limit=20, accept=None):
+        """
+        Noms classés correspondant à `query` (tous les termes doivent
+        apparaître dans le nom ou les notes). accept(name) → bool filtre
+        les résultats (ex. objectifs compatibles seulement).
+        """
+        query = query.lower().strip()
+        terms = query.split()
+        if not terms or limit <= 0:
+            return []
+        results = []
+        seen = set()
+
+        def take(names):
+            for name in names:
+                if name in seen:
+                    continue
+                seen.add(name)
+                lower, notes = self._entries[name]
+                # les niveaux ne cherchent qu'un mot du premier terme : chaque terme est vérifié en entier
+                if not all(t in lower or t in notes for t in terms):
+                    continue
+                if accept is not None and not accept(name):
+                    continue
+                results.append(name)
+                if len(results) >= limit:
+                    return True
+            return False
+
+        first = terms[0]
+        words = _WORD.findall(first)
+        tiers = (
+            # 1. préfixe du nom complet
+            _prefix_range(self._names, query),
+            # 2. préfixe d'un mot du nom
+            _prefix_range(self._words, words[0]) if words else (),
+            # 3. sous-chaîne du nom, 4. sous-chaîne des notes
+            self._substring(self._name_grams, first, 0),
+            self._substring(self._note_grams, first, 1),
+        )
+        for tier, names in enumerate(tiers):
+            start = len(results)
+            full = take(names)
+            if tier >= 2:
+                # ordre des ensembles arbitraire : tri au sein du niveau
+                results[start:] = sorted(results[start:], key=str.lower)
+            if full:
+                break
+        return results
+
+    def _substring(self, grams, term, position):
+        if len(term) < 3:
+            return
+        postings = [grams.get(gram) for gram in _trigrams(term)]
+        if not all(postings):
+            return
+        postings.sort(key=len)
+        smallest, others = postings[0], postings[1:]
+        entries = self._entries
+        for name in smallest:
+            # un trigramme commun ne garantit pas la sous-chaîne : vérification
+            if all(name in p for p in others) and term in entries[name][position]:
+                yield name
+
+
+def _prefix_range(items, prefix):
+    # noms des éléments (clé, nom) triés dont la clé commence par prefix
+    i = bisect_left(items, (prefix,))
+    while i < len(items) and items[i][0].startswith(prefix):
+        yield items[i][1]
+        i += 1
+
+
+def _discard(items, item):
+    i = bisect_left(items, item)
+    if i < len(items) and items[i] == item:
+        del items[i]
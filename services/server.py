@@ -0,0 +1,496 @@
+# services/server.py
+"""
+Service local JSON sur HTTP (asyncio, bibliothèque standard seulement).
+
+Le catalogue, les index de recherche / compatibilité et la géométrie capteur
+restent en mémoire ; le journal du catalogue est relu périodiquement
+(incrémental) et le cache des réponses est vidé à chaque changement.
+
+    POST /solve       un poste (mêmes champs qu'une ligne de `batch`) ou
+                      {"stations": [...]} → résultat(s) de solver.evaluate
+    POST /evaluate    {"camera" | "resolution_x" + "pixel_size_um", "fov",
+                      "required_pixels", "speed_m_s", "exposure_time_s"}
+                      → px/mm, défaut min, flou
+    GET  /cameras?q=imx&limit=20          recherche (services.search_index)
+    GET  /cameras/<nom>                   fiche
+    GET  /objectives?q=..&compatible_with=<caméra>
+    GET  /objectives/<nom>
+    GET  /health
+
+Les postes reçus pendant la même fenêtre (max_delay) sont évalués ensemble,
+en une passe vectorisée (services.optics_batch) ; les lignes hors domaine
+(division par zéro, FOV <= 0) repassent par solver.evaluate, les réponses
+sont donc identiques à celles du CLI. Les réponses identiques (même requête)
+sont servies depuis un cache LRU.
+"""
+
+import asyncio
+import json
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+
+from services.batch import parse_row
+from services.compatibility import CompatibilityIndex
+from services.database_manager import DatabaseManager, CAMERA_FILE, OBJECTIVE_FILE
+from services.instrumentation import timed
+from services.optics_batch import (
+    compute_fov_batch,
+    compute_distance_batch,
+    compute_focal_batch,
+    compute_px_per_mm_batch,
+    compute_min_detectable_defect_batch,
+    compute_motion_blur_batch,
+)
+from services.search_index import CatalogSearchIndex
+from services.solver import SensorGeometryTable, evaluate, sensor_geometry
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+MAX_BODY = 16 * 1024 * 1024
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ------------------------------------------------------------
+# Micro-batching
+# ------------------------------------------------------------
+
+class MicroBatcher:
+    """
+    Regroupe les submit() reçus pendant max_delay secondes (ou jusqu'à
+    max_batch éléments) en un seul appel func(items) → résultats, dans le
+    même ordre ; un résultat qui est une exception est levé chez l'appelant.
+    """
+
+    def __init__(self, func, max_batch=1024, max_delay=0.001):
+        self.func = func
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.pending = []
+        self.timer = None
+        self.batches = 0
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((item, future))
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.max_delay, self.flush)
+        return await future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+        self.batches += 1
+        try:
+            results = self.func([item for item, _ in pending])
+        except Exception as e:
+            results = [e] * len(pending)
+        for (_, future), result in zip(pending, results):
+            if future.done():  # client parti entre-temps
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+# ------------------------------------------------------------
+# Évaluation vectorisée
+# ------------------------------------------------------------
+
+def _column(values):
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+@timed("server.evaluate_stations")
+def evaluate_stations(stations, sensors):
+    """
+    stations : [(caméra, arguments de evaluate())] → [résultat ou exception].
+    Même résultat que evaluate() pour chaque poste.
+    """
+    results = [None] * len(stations)
+    rows = []
+    for i, (camera, values) in enumerate(stations):
+        if sum(values[key] is not None for key in ("wd", "focal", "fov")) < 2:
+            results[i] = ValueError("At least two of wd, focal and fov are required.")
+        else:
+            rows.append(i)
+    if not rows:
+        return results
+
+    cameras = [stations[i][0] for i in rows]
+    values = [stations[i][1] for i in rows]
+    geometry = [sensors.geometry.get(cam.get("name")) or sensor_geometry(cam) for cam in cameras]
+    sensor_w = np.array([g.width_mm for g in geometry])
+    resolution_x = np.array([cam["resolution_x"] for cam in cameras], dtype=np.float64)
+    pixel_um = np.array([cam["pixel_size_um"] for cam in cameras], dtype=np.float64)
+    wd, focal, fov = (_column([v[key] for v in values]) for key in ("wd", "focal", "fov"))
+    speed, exposure = (_column([v[key] for v in values]) for key in ("speed_m_s", "exposure_time_s"))
+    required = np.array([v["required_pixels"] for v in values], dtype=np.float64)
+
+    with np.errstate(all="ignore"):
+        # la valeur manquante parmi wd / focal / fov, comme solve()
+        fov = np.where(np.isnan(fov), compute_fov_batch(sensor_w, focal, wd), fov)
+        wd = np.where(np.isnan(wd), compute_distance_batch(fov, sensor_w, focal), wd)
+        focal = np.where(np.isnan(focal), compute_focal_batch(sensor_w, wd, fov), focal)
+        px_per_mm = compute_px_per_mm_batch(resolution_x, fov)
+        defect = compute_min_detectable_defect_batch(px_per_mm, required)
+        blur = compute_motion_blur_batch(speed, exposure, px_per_mm, pixel_um)
+    has_blur = ~(np.isnan(speed) | np.isnan(exposure))
+    # hors domaine : le chemin scalaire décide (None, exception)
+    exact = np.isfinite(wd) & np.isfinite(focal) & (fov > 0) & np.isfinite(px_per_mm) & np.isfinite(defect)
+    exact &= ~has_blur | np.isfinite(blur[2])
+
+    columns = [c.tolist() for c in (wd, focal, fov, px_per_mm, defect, *blur)]
+    has_blur, exact = has_blur.tolist(), exact.tolist()
+    for j, i in enumerate(rows):
+        camera, args = stations[i]
+        if not exact[j]:
+            try:
+                results[i] = evaluate(camera, **args)
+            except (ValueError, KeyError, TypeError, ZeroDivisionError) as e:
+                results[i] = ValueError(str(e))
+            continue
+        result = {
+            "camera": camera.get("name"),
+            "sensor_width_mm": geometry[j].width_mm,
+            "sensor_height_mm": geometry[j].height_mm,
+            "wd": columns[0][j],
+            "focal": columns[1][j],
+            "fov": columns[2][j],
+            "px_per_mm": columns[3][j],
+            "min_defect_mm": columns[4][j],
+        }
+        if has_blur[j]:
+            result["blur_object_mm"] = columns[5][j]
+            result["blur_sensor_um"] = columns[6][j]
+            result["blur_px"] = columns[7][j]
+        results[i] = result
+    return results
+
+
+@timed("server.evaluate_fov")
+def evaluate_fov(items):
+    """
+    items : [(resolution_x, pixel_size_um, fov, required_pixels, speed, exposure)]
+    → px/mm, défaut min et flou (si vitesse et exposition), None hors domaine
+    (FOV <= 0, pixel nul) comme le moteur services.dataflow.
+    """
+    resolution_x, pixel_um, fov, required, speed, exposure = (_column(c) for c in zip(*items))
+    with np.errstate(all="ignore"):
+        px_per_mm = np.where(fov > 0, compute_px_per_mm_batch(resolution_x, fov), np.nan)
+        defect = compute_min_detectable_defect_batch(px_per_mm, required)
+        blur = compute_motion_blur_batch(speed, exposure, px_per_mm, pixel_um)
+    columns = [c.tolist() for c in (fov, px_per_mm, defect, *blur)]
+    results = []
+    for j in range(len(items)):
+        px = columns[1][j]
+        result = {
+            "fov": columns[0][j],
+            "px_per_mm": px if np.isfinite(px) else None,
+            "min_defect_mm": columns[2][j] if np.isfinite(columns[2][j]) else None,
+        }
+        if result["px_per_mm"] is not None and np.isfinite(columns[5][j]):
+            result["blur_object_mm"] = columns[3][j]
+            result["blur_sensor_um"] = columns[4][j]
+            result["blur_px"] = columns[5][j]
+        results.append(result)
+    return results
+
+
+# ------------------------------------------------------------
+# Service
+# ------------------------------------------------------------
+
+class ConfiguratorService:
+    """
+    État chaud + routage ; indépendant du transport (testable sans socket).
+    """
+
+    def __init__(self, db=None, max_batch=1024, max_delay=0.001, cache_size=10000):
+        self.db = db or DatabaseManager()
+        self.cameras = self.db.load_cameras()
+        self.objectives = self.db.load_objectives()
+        self.sensors = SensorGeometryTable(self.cameras)
+        # colonnes du catalogue compilé mappé (repli JSON) ; les dicts servent aux réponses
+        self.compat = CompatibilityIndex(self.db.load_camera_catalog(), self.db.load_objective_catalog())
+        self.camera_search = CatalogSearchIndex(self.cameras)
+        self.objective_search = CatalogSearchIndex(self.objectives, fields=("notes", "mount"))
+        self.batcher = MicroBatcher(lambda stations: evaluate_stations(stations, self.sensors), max_batch, max_delay)
+        self.fov_batcher = MicroBatcher(evaluate_fov, max_batch, max_delay)
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.hits = 0
+        self.requests = 0
+        self.refresh_error = None  # dernier échec de relecture du catalogue (None : à jour)
+
+    # --- catalogue ---
+
+    def refresh(self):
+        """
+        Applique les changements du catalogue sur disque ; True si quelque chose a changé.
+        """
+        added, removed, changed = self.db.refresh_cameras(self.cameras)
+        self.sensors.remove_cameras(removed)
+        self.sensors.update_cameras(self.cameras, added + changed)
+        for name in removed:
+            self.compat.remove_camera(name)
+            self.camera_search.remove(name)
+        for name in added + changed:
+            self.compat.set_camera(self.cameras[name])
+            self.camera_search.add(name, self.cameras[name])
+        obj_added, obj_removed, obj_changed = self.db.refresh_objectives(self.objectives)
+        for name in obj_removed:
+            self.compat.remove_objective(name)
+            self.objective_search.remove(name)
+        for name in obj_added + obj_changed:
+            self.compat.set_objective(self.objectives[name])
+            self.objective_search.add(name, self.objectives[name])
+        if added or removed or changed or obj_added or obj_removed or obj_changed:
+            self.cache.clear()
+            return True
+        return False
+
+    # --- requêtes ---
+
+    async def handle(self, method, target, body=b""):
+        """
+        → (statut, corps JSON en octets). Les réponses sont mises en cache
+        par (méthode, cible, corps).
+        """
+        self.requests += 1
+        key = (method, target, body)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return cached
+        try:
+            status, payload = 200, await self._route(method, target, body)
+        except HttpError as e:
+            status, payload = e.status, {"error": str(e)}
+        except (ValueError, KeyError, TypeError) as e:
+            status, payload = 400, {"error": str(e)}
+        response = status, json.dumps(payload).encode("utf-8")
+        if status in (200, 400, 404) and target != "/health":
+            self.cache[key] = response
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return response
+
+    async def _route(self, method, target, body):
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.strip("/").split("/", 1)]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        resource = parts[0]
+        if resource in ("solve", "evaluate"):
+            if method != "POST":
+                raise HttpError(405, f"Use POST /{resource}")
+            data = json.loads(body or b"{}")
+            if not isinstance(data, dict):
+                raise HttpError(400, "JSON object expected")
+            if resource == "solve":
+                return await self.solve(data)
+            return await self.evaluate(data)
+        if method != "GET":
+            raise HttpError(405, f"Use GET /{resource}")
+        if resource == "health":
+            return self.stats()
+        if resource in ("cameras", "objectives"):
+            records = self.cameras if resource == "cameras" else self.objectives
+            if len(parts) > 1:
+                record = records.get(parts[1])
+                if record is None:
+                    raise HttpError(404, f"Unknown {resource[:-1]}: {parts[1]!r}")
+                return record
+            return self.lookup(resource, query)
+        raise HttpError(404, f"Unknown endpoint: {url.path}")
+
+    async def solve(self, data):
+        stations = data.get("stations")
+        if stations is None:
+            return await self._solve_one(data)
+        if not isinstance(stations, list):
+            raise HttpError(400, "'stations' must be a list")
+        results = await asyncio.gather(*(self._solve_one(s) for s in stations), return_exceptions=True)
+        return [
+            {"error": str(r)} if isinstance(r, (ValueError, KeyError, TypeError, HttpError)) else r
+            for r in results
+        ]
+
+    async def _solve_one(self, row):
+        if not isinstance(row, dict):
+            raise ValueError("station must be a JSON object")
+        camera, values, objective = parse_row(row, self.cameras, self.objectives)
+        result = await self.batcher.submit((camera, values))
+        if objective is not None:
+            result = dict(result, objective=objective)
+        return result
+
+    async def evaluate(self, data):
+        # px/mm, défaut et flou pour un FOV donné (caméra du catalogue ou capteur libre)
+        if data.get("camera") is not None:
+            camera = self.cameras.get(data["camera"])
+            if camera is None:
+                raise ValueError(f"Unknown camera: {data['camera']!r}")
+            resolution_x, pixel_um = camera["resolution_x"], camera["pixel_size_um"]
+        else:
+            resolution_x, pixel_um = float(data["resolution_x"]), float(data["pixel_size_um"])
+        return await self.fov_batcher.submit((
+            resolution_x, pixel_um, float(data["fov"]), int(data.get("required_pixels") or 3),
+            _optional(data.get("speed_m_s")), _optional(data.get("exposure_time_s")),
+        ))
+
+    def lookup(self, resource, query):
+        limit = int(query.get("limit") or 20)
+        if resource == "cameras":
+            index, accept = self.camera_search, None
+        else:
+            index, accept = self.objective_search, None
+            camera = query.get("compatible_with")
+            if camera is not None:
+                if camera not in self.compat.camera_rows:
+                    raise HttpError(404, f"Unknown camera: {camera!r}")
+                allowed = set(self.compat.compatible_objectives(camera))
+                accept = allowed.__contains__
+        q = query.get("q", "")
+        if q:
+            names = index.search(q, limit, accept)
+        else:
+            records = self.cameras if resource == "cameras" else self.objectives
+            names = [name for name in records if accept is None or accept(name)][:limit]
+        return {"names": names}
+
+    def stats(self):
+        return {
+            "cameras": len(self.cameras),
+            "objectives": len(self.objectives),
+            "requests": self.requests,
+            "cache_hits": self.hits,
+            "cache_size": len(self.cache),
+            "batches": self.batcher.batches + self.fov_batcher.batches,
+            "refresh_error": self.refresh_error,
+        }
+
+
+def _optional(value):
+    return None if value in (None, "") else float(value)
+
+
+# ------------------------------------------------------------
+# Transport HTTP/1.1 (keep-alive)
+# ------------------------------------------------------------
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HttpError(400, "Invalid Content-Length")
+    if length < 0:
+        raise HttpError(400, "Invalid Content-Length")
+    if length > MAX_BODY:
+        raise HttpError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+def _response(status, body, keep_alive):
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def serve(service, host="127.0.0.1", port=8765, refresh_interval=2.0, ready=None):
+    """
+    Sert `service` sur host:port jusqu'à annulation. ready(server) est
+    appelé une fois le socket ouvert (port effectif si port=0).
+    """
+
+    async def client(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except HttpError as e:
+                    writer.write(_response(e.status, json.dumps({"error": str(e)}).encode(), False))
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, payload = await service.handle(method, target, body)
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def refresh_loop():
+        while True:
+            await asyncio.sleep(refresh_interval)
+            try:
+                service.refresh()
+            except Exception as e:
+                # catalogue illisible un instant (partage réseau, écriture en
+                # cours) : on sert l'état en mémoire et on réessaie au tour suivant
+                error = f"{type(e).__name__}: {e}"
+                if error != service.refresh_error:
+                    print(f"catalog refresh failed: {error}", file=sys.stderr)
+                service.refresh_error = error
+            else:
+                service.refresh_error = None
+
+    server = await asyncio.start_server(client, host, port)
+    refresher = asyncio.create_task(refresh_loop()) if refresh_interval else None
+    if ready is not None:
+        ready(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if refresher is not None:
+            refresher.cancel()
+
+
+def run(host="127.0.0.1", port=8765, camera_file: Path = CAMERA_FILE, objective_file: Path = OBJECTIVE_FILE,
+        refresh_interval=2.0, ready=None):
+    service = ConfiguratorService(DatabaseManager(Path(camera_file), Path(objective_file)))
+    try:
+        asyncio.run(serve(service, host, port, refresh_interval, ready))
+    except KeyboardInterrupt:
+        pass
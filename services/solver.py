@@ -1,33 +1,182 @@
 # services/solver.py
+import math
+from collections import namedtuple
+from functools import lru_cache
 
-from services.optics_calculations import (
-    compute_fov,
-    compute_distance,
-    compute_focal
-)
+from services.dataflow import resolve
+from services.instrumentation import timed
+from services.optics_calculations import compute_distance, compute_focal, compute_fov
 
 
+@timed("solver.solve")
+def solve(params, locks, SENSOR_SIZE_MM):
+    """
+    2 verrouillées parmi wd / focal / fov → résoudre la 3e ; sinon les
+    valeurs sont renvoyées telles quelles. Même résultat que
+    services.dataflow.resolve, sans construire de plan : appelé en boucle.
+    """
+    wd, focal, fov = params["wd"], params["focal"], params["fov"]
+    if SENSOR_SIZE_MM is not None:
+        # comme resolve : une variable verrouillée sans valeur ne compte pas,
+        # et une seule valeur manquante est déduite des deux autres
+        lock_wd = wd is not None and bool(locks.get("wd"))
+        lock_focal = focal is not None and bool(locks.get("focal"))
+        lock_fov = fov is not None and bool(locks.get("fov"))
+        if lock_wd + lock_focal + lock_fov == 2:
+            target = "wd" if not lock_wd else "focal" if not lock_focal else "fov"
+        elif (wd is None) + (focal is None) + (fov is None) == 1:
+            target = "wd" if wd is None else "focal" if focal is None else "fov"
+        else:
+            target = None
 
+        if target == "fov":
+            fov = compute_fov(SENSOR_SIZE_MM, focal, wd)
+        elif target == "focal":
+            focal = compute_focal(SENSOR_SIZE_MM, wd, fov)
+        elif target == "wd":
+            wd = compute_distance(fov, SENSOR_SIZE_MM, focal)
 
-def solve(params, locks, SENSOR_SIZE_MM):
+    return {"wd": wd, "focal": focal, "fov": fov}
 
-    wd = params["wd"]
-    focal = params["focal"]
-    fov = params["fov"]
 
-    # CAS 1 : 2 locked → résoudre la 3e
-    if locks["wd"] and locks["focal"] and not locks["fov"]:
-        fov = compute_fov(SENSOR_SIZE_MM, focal, wd)
+def sensor_size_mm(camera):
+    """
+    Taille physique du capteur (largeur, hauteur) en mm.
+    """
+    px = camera["pixel_size_um"]
+    return (px * camera["resolution_x"]) / 1000., (px * camera["resolution_y"]) / 1000.
 
-    elif locks["wd"] and locks["fov"] and not locks["focal"]:
-        focal = compute_focal(SENSOR_SIZE_MM, wd, fov)
 
-    elif locks["focal"] and locks["fov"] and not locks["wd"]:
-        wd = compute_distance(fov, SENSOR_SIZE_MM, focal)
+@timed("solver.evaluate")
+def evaluate(camera, wd=None, focal=None, fov=None,
+             speed_m_s=None, exposure_time_s=None, required_pixels=3, solver=None):
+    """
+    Évaluation complète d'un poste : parmi wd / focal / fov, les valeurs
+    données sont verrouillées et la troisième est résolue par solve().
+    Ajoute px/mm, défaut min et, si vitesse et exposition sont données,
+    le flou de bougé. solver (CachedSolver contenant la caméra) : géométrie
+    précalculée et solve() mémoïsé, même résultat.
+    """
+    given = {"wd": wd, "focal": focal, "fov": fov}
+    locks = {key: value is not None for key, value in given.items()}
+    if sum(locks.values()) < 2:
+        raise ValueError("At least two of wd, focal and fov are required.")
+    given = {key: (None if value is None else float(value)) for key, value in given.items()}
 
+    geometry = solver.geometry.get(camera.get("name")) if solver is not None else None
+    if geometry is not None:
+        sensor_w, sensor_h = geometry.width_mm, geometry.height_mm
+        # la troisième grandeur vient du cache ; resolve ne calcule plus que les sorties
+        given = solver.solve(camera["name"], given, locks)
+        locks = {key: value is not None for key, value in given.items()}
+    else:
+        sensor_w, sensor_h = sensor_size_mm(camera)
+    values = resolve({
+        "sensor_width_mm": sensor_w,
+        "resolution_x": camera["resolution_x"],
+        "pixel_size_um": camera["pixel_size_um"],
+        "required_pixels": required_pixels,
+        "speed_m_s": speed_m_s,
+        "exposure_time_s": exposure_time_s,
+        **given,
+    }, locks)
 
-    return {
-        "wd": wd,
-        "focal": focal,
-        "fov": fov
+    result = {
+        "camera": camera.get("name"),
+        "sensor_width_mm": sensor_w,
+        "sensor_height_mm": sensor_h,
+        "wd": values["wd"],
+        "focal": values["focal"],
+        "fov": values["fov"],
+        # None si fov <= 0
+        "px_per_mm": values["px_per_mm"],
+        "min_defect_mm": values["min_defect_mm"],
     }
+    if values["px_per_mm"] is not None and values["blur_px"] is not None:
+        result["blur_object_mm"] = values["blur_object_mm"]
+        result["blur_sensor_um"] = values["blur_sensor_um"]
+        result["blur_px"] = values["blur_px"]
+    return result
+
+
+# ------------------------------------------------------------
+# Géométrie capteur
+# ------------------------------------------------------------
+
+SensorGeometry = namedtuple("SensorGeometry", ["width_mm", "height_mm", "diagonal_mm"])
+
+
+def sensor_geometry(camera):
+    w, h = sensor_size_mm(camera)
+    return SensorGeometry(w, h, math.hypot(w, h))
+
+
+class SensorGeometryTable:
+    """
+    Géométrie capteur calculée une fois par caméra du catalogue, tenue à
+    jour enregistrement par enregistrement au rechargement.
+    """
+
+    def __init__(self, cameras=None):
+        self.geometry = {}
+        if cameras:
+            self.update_cameras(cameras)
+
+    def update_cameras(self, cameras, names=None):
+        # names : seulement les enregistrements ajoutés / modifiés
+        for name in (cameras if names is None else names):
+            self.geometry[name] = sensor_geometry(cameras[name])
+
+    def remove_cameras(self, names):
+        for name in names:
+            self.geometry.pop(name, None)
+
+    def sensor_geometry(self, name):
+        return self.geometry[name]
+
+
+class CachedSolver(SensorGeometryTable):
+    """
+    Géométrie capteur par caméra (SensorGeometryTable) et cache LRU borné
+    des résultats de solve(), clé (caméra, largeur capteur, entrées, verrous) :
+    les requêtes répétées (GUI, lots) deviennent des lectures de dictionnaire.
+    """
+
+    def __init__(self, cameras=None, maxsize=4096):
+        self._solve = lru_cache(maxsize=maxsize)(self._solve_uncached)
+        super().__init__(cameras)
+
+    @timed("solver.cached_solve")
+    def solve(self, camera_name, params, locks):
+        # la largeur capteur fait partie de la clé : une caméra modifiée
+        # dans le catalogue ne réutilise pas d'anciens résultats
+        wd, focal, fov = self._solve(
+            camera_name,
+            self.geometry[camera_name].width_mm,
+            params["wd"], params["focal"], params["fov"],
+            bool(locks.get("wd")), bool(locks.get("focal")), bool(locks.get("fov")),
+        )
+        return {"wd": wd, "focal": focal, "fov": fov}
+
+    def cache_info(self):
+        info = self._solve.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+            "hit_rate": info.hits / lookups if lookups else 0.0,
+        }
+
+    def cache_clear(self):
+        self._solve.cache_clear()
+
+    @staticmethod
+    def _solve_uncached(camera_name, sensor_width_mm, wd, focal, fov, lock_wd, lock_focal, lock_fov):
+        solved = solve(
+            {"wd": wd, "focal": focal, "fov": fov},
+            {"wd": lock_wd, "focal": lock_focal, "fov": lock_fov},
+            sensor_width_mm,
+        )
+        return solved["wd"], solved["focal"], solved["fov"]
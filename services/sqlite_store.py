@@ -0,0 +1,183 @@
+# services/sqlite_store.py
+"""
+Stockage SQLite optionnel du catalogue, même API que DatabaseManager
+(load_cameras / save_cameras / load_objectives / save_objective) plus des
+requêtes par plage sur des colonnes indexées :
+- caméras : pixel_size_um, resolution_x, resolution_y, mount
+- objectifs : focal_length, mount
+
+Chaque enregistrement est conservé tel quel (colonne JSON `data`), les
+colonnes indexées n'en sont qu'une projection typée.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+from services.database_manager import (
+    DATA_DIR, CAMERA_FILE, OBJECTIVE_FILE, DatabaseManager, normalize_camera, normalize_objective,
+)
+
+SQLITE_FILE = DATA_DIR / "catalog.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cameras (
+    name TEXT PRIMARY KEY,
+    resolution_x INTEGER,
+    resolution_y INTEGER,
+    pixel_size_um REAL,
+    mount TEXT COLLATE NOCASE,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cameras_pixel_size ON cameras(pixel_size_um);
+CREATE INDEX IF NOT EXISTS idx_cameras_resolution ON cameras(resolution_x, resolution_y);
+CREATE INDEX IF NOT EXISTS idx_cameras_mount ON cameras(mount);
+
+CREATE TABLE IF NOT EXISTS objectives (
+    name TEXT PRIMARY KEY,
+    focal_length REAL,
+    mount TEXT COLLATE NOCASE,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_objectives_focal ON objectives(focal_length);
+CREATE INDEX IF NOT EXISTS idx_objectives_mount ON objectives(mount);
+"""
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _camera_row(cam):
+    cam = normalize_camera(cam)
+    return (
+        cam["name"],
+        _to_int(cam.get("resolution_x")),
+        _to_int(cam.get("resolution_y")),
+        _to_float(cam.get("pixel_size_um")),
+        cam.get("mount"),
+        json.dumps(cam),
+    )
+
+
+def _objective_row(lens):
+    lens = normalize_objective(lens)
+    return (
+        lens["name"],
+        _to_float(lens.get("focal_length")),
+        lens.get("mount"),
+        json.dumps(lens),
+    )
+
+
+def _range_clause(column, bounds, clauses, args):
+    # bounds : (min, max) inclusifs, chacun pouvant valoir None
+    if bounds is None:
+        return
+    lo, hi = bounds
+    if lo is not None:
+        clauses.append(f"{column} >= ?")
+        args.append(lo)
+    if hi is not None:
+        clauses.append(f"{column} <= ?")
+        args.append(hi)
+
+
+class SQLiteDatabaseManager:
+    def __init__(self, db_file: Path = SQLITE_FILE):
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_file)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ----- même API que DatabaseManager -----
+
+    def load_cameras(self):
+        return self._select("cameras", "", [])
+
+    def save_cameras(self, cams_dict):
+        with self.conn:
+            self.conn.execute("DELETE FROM cameras")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO cameras VALUES (?, ?, ?, ?, ?, ?)",
+                (_camera_row(cam) for cam in cams_dict.values()),
+            )
+
+    def load_objectives(self):
+        return self._select("objectives", "", [])
+
+    def save_objective(self, obj_dict):
+        with self.conn:
+            self.conn.execute("DELETE FROM objectives")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO objectives VALUES (?, ?, ?, ?)",
+                (_objective_row(lens) for lens in obj_dict.values()),
+            )
+
+    def add_camera(self, cam):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO cameras VALUES (?, ?, ?, ?, ?, ?)", _camera_row(cam))
+
+    def add_objective(self, lens):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO objectives VALUES (?, ?, ?, ?)", _objective_row(lens))
+
+    # ----- requêtes indexées -----
+
+    def query_cameras(self, pixel_size_um=None, resolution_x=None, resolution_y=None, mount=None):
+        """
+        Caméras filtrées par plages (min, max) inclusives et/ou monture
+        (insensible à la casse). Ex : query_cameras(pixel_size_um=(None, 3.0))
+        """
+        clauses, args = [], []
+        _range_clause("pixel_size_um", pixel_size_um, clauses, args)
+        _range_clause("resolution_x", resolution_x, clauses, args)
+        _range_clause("resolution_y", resolution_y, clauses, args)
+        if mount is not None:
+            clauses.append("mount = ?")
+            args.append(mount)
+        return self._select("cameras", " AND ".join(clauses), args)
+
+    def query_objectives(self, focal_length=None, mount=None):
+        """
+        Objectifs filtrés par plage de focale (min, max) et/ou monture.
+        Ex : query_objectives(focal_length=(12, 25), mount="C")
+        """
+        clauses, args = [], []
+        _range_clause("focal_length", focal_length, clauses, args)
+        if mount is not None:
+            clauses.append("mount = ?")
+            args.append(mount)
+        return self._select("objectives", " AND ".join(clauses), args)
+
+    def _select(self, table, where, args):
+        sql = f"SELECT data FROM {table}"
+        if where:
+            sql += f" WHERE {where}"
+        sql += " ORDER BY rowid"
+        return {rec["name"]: rec for rec in (json.loads(row[0]) for row in self.conn.execute(sql, args))}
+
+
+def migrate_from_json(db_file: Path = SQLITE_FILE, camera_file: Path = CAMERA_FILE,
+                      objective_file: Path = OBJECTIVE_FILE) -> SQLiteDatabaseManager:
+    """
+    Import unique de cameras.json / objectives.json dans la base SQLite.
+    """
+    source = DatabaseManager(camera_file, objective_file)
+    store = SQLiteDatabaseManager(db_file)
+    store.save_cameras(source.load_cameras())
+    store.save_objective(source.load_objectives())
+    return store
@@ -0,0 +1,194 @@
+# services/sweep.py
+"""
+Balayage de l'espace de conception d'un poste, pour une caméra donnée.
+
+- sweep_grid : grille dense WD × focale (× vitesse × exposition en option)
+  de FOV, px/mm, défaut min et flou, calculée en une passe vectorisée
+  (services.optics_batch, résultats identiques aux formules scalaires) ;
+- refine_boundary : échantillonnage adaptatif — grille grossière, puis
+  seules les cellules traversées par une frontière de contrainte (défaut
+  max, flou max, FOV min / max) sont subdivisées, niveau par niveau.
+"""
+
+import numpy as np
+
+from services.optics_batch import (
+    compute_fov_batch,
+    compute_px_per_mm_batch,
+    compute_min_detectable_defect_batch,
+    compute_motion_blur_batch,
+)
+from services.solver import sensor_size_mm
+
+
+def _axis(values):
+    return np.atleast_1d(np.asarray(values, dtype=np.float64))
+
+
+def _evaluate(camera, wd, focal, speed=None, exposure=None, required_pixels=3):
+    # wd / focal / speed / exposure : tableaux déjà mis en forme pour le broadcasting
+    sensor_w, _ = sensor_size_mm(camera)
+    fov = compute_fov_batch(sensor_w, focal, wd)
+    px_per_mm = compute_px_per_mm_batch(camera["resolution_x"], fov)
+    result = {
+        "fov": fov,
+        "px_per_mm": px_per_mm,
+        "min_defect_mm": compute_min_detectable_defect_batch(px_per_mm, required_pixels),
+    }
+    if speed is not None and exposure is not None:
+        blur_obj, blur_sensor, blur_px = compute_motion_blur_batch(
+            speed, exposure, px_per_mm, camera["pixel_size_um"]
+        )
+        result["blur_object_mm"] = blur_obj
+        result["blur_sensor_um"] = blur_sensor
+        result["blur_px"] = blur_px
+    return result
+
+
+# ------------------------------------------------------------
+# Grille dense
+# ------------------------------------------------------------
+
+def _evaluate_outer(camera, wd, focal, required_pixels):
+    """
+    Même calcul que _evaluate sur le produit wd × focal, sans les tableaux
+    intermédiaires de optics_batch._divide : divisions directes, en place
+    (mêmes résultats, moitié moins de mémoire touchée sur 2000 × 2000).
+    """
+    sensor_w, _ = sensor_size_mm(camera)
+    resolution_x = float(camera["resolution_x"])
+    if not (sensor_w and resolution_x and np.all(wd) and np.all(focal)):
+        # dénominateur nul quelque part : chemin générique (NaN)
+        return _evaluate(camera, wd[:, None], focal[None, :], required_pixels=required_pixels)
+    fov = np.divide(wd[:, None], focal[None, :])
+    np.multiply(sensor_w, fov, out=fov)
+    px_per_mm = np.divide(resolution_x, fov)
+    defect = np.divide(float(required_pixels), px_per_mm)
+    return {"fov": fov, "px_per_mm": px_per_mm, "min_defect_mm": defect}
+
+
+def sweep_grid(camera, wd_mm, focal_mm, speed_m_s=None, exposure_time_s=None, required_pixels=3):
+    """
+    Évalue toutes les combinaisons des axes donnés.
+
+    Renvoie un dict : les axes ("wd", "focal" et, si vitesse et exposition
+    sont données, "speed", "exposure") et les tableaux "fov", "px_per_mm",
+    "min_defect_mm" de forme (len(wd), len(focal)) ; avec vitesse et
+    exposition, les tableaux de flou sont de forme
+    (len(wd), len(focal), len(speed), len(exposure)).
+    """
+    wd, focal = _axis(wd_mm), _axis(focal_mm)
+    result = {"wd": wd, "focal": focal}
+    result.update(_evaluate_outer(camera, wd, focal, required_pixels))
+
+    if speed_m_s is not None and exposure_time_s is not None:
+        speed, exposure = _axis(speed_m_s), _axis(exposure_time_s)
+        blur_obj, blur_sensor, blur_px = compute_motion_blur_batch(
+            speed[None, None, :, None],
+            exposure[None, None, None, :],
+            result["px_per_mm"][:, :, None, None],
+            camera["pixel_size_um"],
+        )
+        result.update({
+            "speed": speed,
+            "exposure": exposure,
+            "blur_object_mm": blur_obj,
+            "blur_sensor_um": blur_sensor,
+            "blur_px": blur_px,
+        })
+    return result
+
+
+def feasible(result, max_defect_mm=None, max_blur_px=None, min_fov_mm=None, max_fov_mm=None):
+    """
+    Masque booléen des points qui respectent toutes les contraintes données
+    (les points indéfinis — NaN — sont exclus). Avec un axe vitesse /
+    exposition, le masque a la forme des tableaux de flou.
+    """
+    mask = np.isfinite(result["px_per_mm"])
+    if max_defect_mm is not None:
+        mask &= result["min_defect_mm"] <= max_defect_mm
+    if min_fov_mm is not None:
+        mask &= result["fov"] >= min_fov_mm
+    if max_fov_mm is not None:
+        mask &= result["fov"] <= max_fov_mm
+    if max_blur_px is not None and "blur_px" in result:
+        blur_ok = result["blur_px"] <= max_blur_px
+        mask = mask.reshape(mask.shape + (1,) * (blur_ok.ndim - mask.ndim)) & blur_ok
+    return mask
+
+
+# ------------------------------------------------------------
+# Raffinement adaptatif
+# ------------------------------------------------------------
+
+def refine_boundary(camera, wd_range, focal_range, max_defect_mm=None, max_blur_px=None,
+                    min_fov_mm=None, max_fov_mm=None, speed_m_s=None, exposure_time_s=None,
+                    required_pixels=3, coarse=(64, 64), levels=4, factor=4):
+    """
+    Échantillonne le plan WD × focale en concentrant les points sur les
+    frontières des contraintes (vitesse / exposition scalaires ici).
+
+    Niveau 0 : grille coarse[0] × coarse[1] sur wd_range × focal_range. À
+    chaque niveau, les cellules dont les coins ne sont pas tous du même côté
+    d'une contrainte sont découpées en factor × factor sous-cellules.
+
+    Renvoie un dict de tableaux 1-D : "wd", "focal", "feasible", "level"
+    (tous les points évalués) et "boundary_wd", "boundary_focal" (centres
+    des cellules frontière du dernier niveau, résolution
+    plage / (coarse * factor ** levels)).
+    """
+    constraints = {
+        "max_defect_mm": max_defect_mm,
+        "max_blur_px": max_blur_px,
+        "min_fov_mm": min_fov_mm,
+        "max_fov_mm": max_fov_mm,
+    }
+
+    def evaluate(wd, focal):
+        result = _evaluate(camera, wd, focal, speed_m_s, exposure_time_s, required_pixels)
+        return feasible(result, **constraints)
+
+    wd0 = np.linspace(wd_range[0], wd_range[1], coarse[0] + 1)
+    focal0 = np.linspace(focal_range[0], focal_range[1], coarse[1] + 1)
+    nodes_ok = evaluate(wd0[:, None], focal0[None, :])
+    points = [(np.repeat(wd0, len(focal0)), np.tile(focal0, len(wd0)), nodes_ok.ravel(), 0)]
+
+    # cellules : coin bas (wd, focal) + pas ; mixtes = coins en désaccord
+    rows, cols = np.nonzero(_mixed_cells(nodes_ok))
+    cell_wd, cell_focal = wd0[rows], focal0[cols]
+    step_wd = (wd0[1] - wd0[0]) if len(wd0) > 1 else 0.0
+    step_focal = (focal0[1] - focal0[0]) if len(focal0) > 1 else 0.0
+
+    offsets = np.arange(factor + 1) / factor
+    for level in range(1, levels + 1):
+        if len(cell_wd) == 0:
+            break
+        # (cellule, i, j) : sous-grille (factor+1)² de chaque cellule
+        wd = cell_wd[:, None, None] + offsets[None, :, None] * step_wd
+        focal = cell_focal[:, None, None] + offsets[None, None, :] * step_focal
+        wd, focal = np.broadcast_arrays(wd, focal)
+        ok = evaluate(wd, focal)
+        points.append((wd.ravel(), focal.ravel(), ok.ravel(), level))
+
+        mixed = _mixed_cells(ok)
+        cell_wd, cell_focal = wd[:, :-1, :-1][mixed], focal[:, :-1, :-1][mixed]
+        step_wd /= factor
+        step_focal /= factor
+
+    return {
+        "wd": np.concatenate([p[0] for p in points]),
+        "focal": np.concatenate([p[1] for p in points]),
+        "feasible": np.concatenate([p[2] for p in points]),
+        "level": np.concatenate([np.full(len(p[0]), p[3], dtype=np.int8) for p in points]),
+        "boundary_wd": cell_wd + step_wd / 2,
+        "boundary_focal": cell_focal + step_focal / 2,
+    }
+
+
+def _mixed_cells(ok):
+    # ok[..., i, j] aux nœuds → cellules [..., i:i+1, j:j+1] non uniformes
+    corners = (
+        ok[..., :-1, :-1].astype(np.int8) + ok[..., 1:, :-1] + ok[..., :-1, 1:] + ok[..., 1:, 1:]
+    )
+    return (corners > 0) & (corners < 4)
@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+
+import services.batch
+from services.batch import run_batch, read_rows, iter_results, write_results
+
+CAMERAS = {"cam": {"name": "cam", "resolution_x": 2000, "resolution_y": 1000, "pixel_size_um": 3.0}}
+OBJECTIVES = {"lens": {"name": "lens", "focal_length": 12}}
+
+
+def write_catalog(tmp_path):
+    camera_file = tmp_path / "cameras.json"
+    objective_file = tmp_path / "objectives.json"
+    camera_file.write_text(json.dumps({"cameras": list(CAMERAS.values())}))
+    objective_file.write_text(json.dumps({"objectives": list(OBJECTIVES.values())}))
+    return camera_file, objective_file
+
+
+def test_rows_are_evaluated_and_errors_reported():
+    rows = [
+        {"camera": "cam", "lens": "lens", "wd": "400", "speed": "1", "exposure": "0.001"},
+        {"camera": "cam", "focal": "12", "fov": "200"},
+        {"camera": "unknown", "wd": "400", "fov": "200"},
+        {"camera": "cam", "wd": "400"},
+    ]
+    results = list(iter_results(rows, CAMERAS, OBJECTIVES))
+    assert [r["row"] for r in results] == [0, 1, 2, 3]
+    assert results[0]["fov"] == 200.0 and results[0]["blur_px"] == 10.0
+    assert results[1]["wd"] == 400.0
+    assert "error" in results[2] and "error" in results[3]
+
+    out = io.StringIO()
+    assert write_results(iter(results), out, "csv") == 4
+    written = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert written[0]["objective"] == "lens"
+    assert written[2]["error"]
+
+
+def test_parallel_matches_sequential(tmp_path):
+    camera_file, objective_file = write_catalog(tmp_path)
+    source = tmp_path / "stations.jsonl"
+    with open(source, "w") as f:
+        for wd in range(1, 251):
+            f.write(json.dumps({"camera": "cam", "lens": "lens", "wd": wd}) + "\n")
+
+    sequential = tmp_path / "seq.jsonl"
+    parallel = tmp_path / "par.jsonl"
+    assert run_batch(source, sequential, camera_file=camera_file, objective_file=objective_file) == 250
+    assert run_batch(source, parallel, workers=2, chunk_size=16,
+                     camera_file=camera_file, objective_file=objective_file) == 250
+    assert sequential.read_text() == parallel.read_text()
+    assert [r["wd"] for r in read_rows(parallel)] == [float(wd) for wd in range(1, 251)]
+
+
+def test_malformed_jsonl_lines_become_error_rows(tmp_path):
+    camera_file, objective_file = write_catalog(tmp_path)
+    source = tmp_path / "stations.jsonl"
+    source.write_text(
+        json.dumps({"camera": "cam", "lens": "lens", "wd": 400}) + "\n"
+        "{bad\n"
+        "\n"
+        "[1, 2]\n"
+        + json.dumps({"camera": "cam", "lens": "lens", "wd": 200}) + "\n"
+    )
+    output = tmp_path / "out.jsonl"
+    for workers in (1, 2):
+        assert run_batch(source, output, workers=workers, chunk_size=2,
+                         camera_file=camera_file, objective_file=objective_file) == 4
+        results = list(read_rows(output))
+        assert [r["fov"] for r in (results[0], results[3])] == [200.0, 100.0]
+        assert results[1]["error"].startswith("line 2: invalid JSON")
+        assert results[2]["error"] == "line 4: not an object: list"
+    # rows given directly (not read from a file)
+    assert "error" in next(iter_results([["cam"]], CAMERAS, OBJECTIVES))
+
+
+def test_division_by_zero_is_a_row_error(monkeypatch):
+    def divide_by_zero(camera, **values):
+        return {"fov": camera["resolution_x"] / values["wd"]}
+
+    monkeypatch.setattr(services.batch, "evaluate", divide_by_zero)
+    rows = [{"camera": "cam", "wd": "0", "focal": "12"}, {"camera": "cam", "wd": "400", "focal": "12"}]
+    results = list(iter_results(rows, CAMERAS, OBJECTIVES))
+    assert "division by zero" in results[0]["error"]
+    assert results[1]["fov"] == 5.0 and "error" not in results[1]
@@ -0,0 +1,26 @@
+import json
+
+from benchmarks.__main__ import main
+from benchmarks.suite import compare, run_suite
+
+
+def test_suite_runs_on_small_catalog():
+    results = run_suite(sizes=[10])
+    assert "optics.batch[10]" in results["results"]
+    assert "catalog.load_mapped[10]" in results["results"]
+    assert all(seconds >= 0 for seconds in results["results"].values())
+
+
+def test_compare_flags_regressions(tmp_path):
+    baseline = {"results": {"a[10]": 1.0, "b[10]": 1.0, "noise[10]": 1e-6, "gone[10]": 1.0}}
+    current = {"results": {"a[10]": 1.1, "b[10]": 1.5, "noise[10]": 5e-6, "new[10]": 1.0}}
+    rows = {key: regressed for key, _, _, _, regressed in compare(baseline, current, threshold=0.2)}
+    assert rows == {"a[10]": False, "b[10]": True, "noise[10]": False}
+
+
+def test_compare_command_exit_status(tmp_path):
+    base, cur = tmp_path / "base.json", tmp_path / "cur.json"
+    base.write_text(json.dumps({"results": {"a[10]": 1.0}}))
+    cur.write_text(json.dumps({"results": {"a[10]": 2.0}}))
+    assert main(["compare", str(base), str(base)]) == 0
+    assert main(["compare", str(base), str(cur)]) == 1
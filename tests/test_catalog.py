@@ -0,0 +1,45 @@
+import math
+
+import numpy as np
+
+from services.catalog import CameraCatalog, ObjectiveCatalog, as_objective_catalog
+from services.database_manager import normalize_camera, normalize_objective
+
+
+def test_normalization():
+    cam = normalize_camera({"name": " VCXU ", "resolution_x": "2448", "resolution_y": 2048,
+                            "pixel_size_um": "3.45", "shutter": "Global"})
+    assert cam == {"name": "VCXU", "resolution_x": 2448, "resolution_y": 2048,
+                   "pixel_size_um": 3.45, "shutter": "global", "notes": ""}
+    lens = normalize_objective({"name": "LM12CX", "focal_length": 12, "mount": "c",
+                                "max_image_cirle": 1.0, "aperture": "f/2.8"})
+    assert lens == {"name": "LM12CX", "focal_length": 12.0, "mount": "C",
+                    "max_image_circle": 1.0, "aperture": 2.8}
+
+
+def test_columns_and_derived_geometry():
+    catalog = CameraCatalog.from_records([
+        {"name": "A", "resolution_x": 2000, "resolution_y": 1500, "pixel_size_um": 3.0, "shutter": "global"},
+        {"name": "B", "resolution_x": 4000, "resolution_y": 3000, "pixel_size_um": 2.0, "shutter": "rolling"},
+        {"name": "A", "resolution_x": 1000, "resolution_y": 750, "pixel_size_um": 3.0, "shutter": "global"},
+    ])
+    assert catalog.names == ["A", "B"]
+    assert catalog.column("resolution_x").tolist() == [1000, 4000]
+    assert catalog.column("sensor_width_mm").tolist() == [3.0, 8.0]
+    assert math.isclose(catalog.column("sensor_diagonal_mm")[1], 10.0)
+    assert catalog.record("B")["shutter"] == "rolling"
+    assert np.shares_memory(catalog.column("pixel_size_um"), catalog.data)
+
+
+def test_append_and_remove():
+    catalog = as_objective_catalog({"16mm": {"name": "16mm", "focal_length": 16, "aperture": "16"}})
+    for i in range(40):
+        catalog.append({"name": f"lens{i}", "focal_length": i + 1, "mount": "c"})
+    assert len(catalog) == 41
+    assert catalog.record("lens3") == {"name": "lens3", "focal_length": 4.0, "max_image_circle": None,
+                                       "aperture": None, "mount": "C"}
+    catalog.remove("lens0")
+    assert catalog.row("lens1") == 1
+    assert "lens0" not in catalog
+    assert catalog.column("focal_length")[:2].tolist() == [16.0, 2.0]
+    assert catalog.column("aperture")[0] == 16.0
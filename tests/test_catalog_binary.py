@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+import services.catalog_binary
+from services.catalog import CameraCatalog
+from services.catalog_binary import compiled_path, open_catalog, write_catalog
+from services.database_manager import DatabaseManager
+
+
+def make_db(tmp_path):
+    db = DatabaseManager(tmp_path / "cameras.json", tmp_path / "objectives.json")
+    db.save_cameras({
+        "B cam": {"name": "B cam", "resolution_x": 2448, "resolution_y": 2048, "pixel_size_um": 3.45,
+                  "shutter": "Global", "notes": "2/3\" CMOS"},
+        "A cam": {"name": "A cam", "resolution_x": 1440, "resolution_y": 1080, "pixel_size_um": 3.45,
+                  "shutter": "rolling", "notes": "é"},
+    })
+    return db
+
+
+def test_round_trip_matches_in_memory_catalog(tmp_path):
+    db = make_db(tmp_path)
+    memory = db.load_camera_catalog(mapped=False)
+    mapped = db.load_camera_catalog()
+    assert isinstance(mapped, CameraCatalog)
+    assert list(mapped.names) == memory.names
+    assert mapped.row("A cam") == 1 and "C cam" not in mapped
+    for name in memory.names:
+        assert mapped.record(name) == memory.record(name)
+    assert np.array_equal(mapped.column("sensor_width_mm"), memory.column("sensor_width_mm"))
+    with pytest.raises(TypeError):
+        mapped.append({"name": "C cam"})
+
+
+def test_rebuilt_when_source_changes(tmp_path):
+    db = make_db(tmp_path)
+    db.load_camera_catalog(mapped=True)
+    stamp = compiled_path(db.camera_journal).stat().st_mtime_ns
+    db.load_camera_catalog(mapped=True)
+    assert compiled_path(db.camera_journal).stat().st_mtime_ns == stamp  # up to date: not rebuilt
+
+    db.append_camera({"name": "C cam", "resolution_x": 640, "resolution_y": 480, "pixel_size_um": 5.6})
+    mapped = db.load_camera_catalog(mapped=True)
+    assert "C cam" in mapped and len(mapped) == 3
+
+
+def test_empty_catalog(tmp_path):
+    path = tmp_path / "empty.occat"
+    write_catalog(CameraCatalog.from_records([]), path)
+    catalog = open_catalog(path)
+    assert len(catalog) == 0 and "x" not in catalog
+
+
+def test_json_fallback_when_the_compiled_file_cannot_be_written(tmp_path, monkeypatch):
+    db = make_db(tmp_path)
+
+    def read_only(*args, **kwargs):
+        raise OSError("read-only file system")
+
+    monkeypatch.setattr(services.catalog_binary, "write_catalog", read_only)
+    catalog = db.load_camera_catalog()
+    assert not catalog.read_only and list(catalog.names) == ["B cam", "A cam"]
+    assert not compiled_path(db.camera_journal).exists()
+
+
+def test_loading_the_catalog_does_not_hide_changes_from_refresh(tmp_path):
+    db = make_db(tmp_path)
+    cameras = db.load_cameras()
+    db.append_camera({"name": "C cam", "resolution_x": 640, "resolution_y": 480, "pixel_size_um": 5.6})
+    assert "C cam" in db.load_camera_catalog()
+    assert db.refresh_cameras(cameras)[0] == ["C cam"]
@@ -0,0 +1,87 @@
+import json
+import multiprocessing
+
+from services.catalog_journal import CatalogJournal
+from services.database_manager import DatabaseManager
+
+
+def make_db(tmp_path):
+    return DatabaseManager(tmp_path / "cameras.json", tmp_path / "objectives.json")
+
+
+def test_append_does_not_rewrite_base(tmp_path):
+    db = make_db(tmp_path)
+    before = db.camera_file.read_text()
+    db.append_camera({"name": "A", "resolution_x": 640})
+    db.append_objective({"name": "L", "focal_length": 16})
+    assert db.camera_file.read_text() == before
+    assert list(db.load_cameras()) == ["A"]
+    assert list(db.load_objectives()) == ["L"]
+
+
+def test_compact_merges_log_atomically(tmp_path):
+    db = make_db(tmp_path)
+    db.save_cameras({"A": {"name": "A", "resolution_x": 640}})
+    db.append_camera({"name": "B", "resolution_x": 1280})
+    db.append_camera({"name": "A", "resolution_x": 2448})
+    db.compact()
+    data = json.loads(db.camera_file.read_text())
+    assert [c["name"] for c in data["cameras"]] == ["A", "B"]
+    assert data["cameras"][0]["resolution_x"] == 2448
+    assert db.camera_journal.log_path.read_text() == ""
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_truncated_log_line_is_skipped(tmp_path):
+    journal = CatalogJournal(tmp_path / "cameras.json", "cameras")
+    journal.log_path.write_text('{"name": "A"}\n{"name": "B", "reso')
+    journal.append({"name": "C"})
+    assert [r["name"] for r in journal.read()] == ["A", "C"]
+
+
+def _append_many(path, worker, count):
+    journal = CatalogJournal(path, "cameras")
+    for i in range(count):
+        journal.append({"name": f"w{worker}-{i}"})
+        if i % 10 == 0:
+            journal.compact()
+
+
+def test_concurrent_writers_lose_nothing(tmp_path):
+    path = tmp_path / "cameras.json"
+    path.write_text('{"cameras": []}')
+    procs = [multiprocessing.Process(target=_append_many, args=(path, w, 40)) for w in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    names = {r["name"] for r in CatalogJournal(path, "cameras").read()}
+    assert len(names) == 160
+
+
+def test_refresh_reports_only_changes(tmp_path):
+    db = make_db(tmp_path)
+    db.save_cameras({"A": {"name": "A", "resolution_x": 640},
+                     "B": {"name": "B", "resolution_x": 1280}})
+    cams = db.load_cameras()
+    assert db.refresh_cameras(cams) == ([], [], [])
+
+    other = make_db(tmp_path)  # another station
+    other.append_camera({"name": "C", "resolution_x": 2448})
+    other.append_camera({"name": "A", "resolution_x": 4096})
+    assert db.refresh_cameras(cams) == (["C"], [], ["A"])
+    assert cams["A"]["resolution_x"] == 4096
+
+    other.save_cameras({"A": cams["A"], "C": cams["C"]})
+    assert db.refresh_cameras(cams) == ([], ["B"], [])
+    assert list(cams) == ["A", "C"]
+
+
+def test_log_is_compacted_past_threshold(tmp_path):
+    journal = CatalogJournal(tmp_path / "cameras.json", "cameras", compact_bytes=1000)
+    for i in range(100):
+        journal.append({"name": f"cam{i}", "resolution_x": 640})
+        # the log never holds much more than one threshold of history
+        assert journal.log_path.stat().st_size < 1000
+    assert json.loads(journal.path.read_text())["cameras"]
+    assert [r["name"] for r in journal.read()] == [f"cam{i}" for i in range(100)]
@@ -0,0 +1,72 @@
+import pytest
+
+QtCore = pytest.importorskip("PyQt6.QtCore")
+
+from ui.catalog_model import CatalogListModel
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def names(model):
+    return [model.data(model.index(row)) for row in range(model.rowCount())]
+
+
+def test_rows_are_fetched_lazily(app):
+    model = CatalogListModel((f"cam{i}" for i in range(100_000)), batch=100)
+    assert len(model) == 100_000
+    assert model.rowCount() == 100
+    assert model.canFetchMore()
+    model.fetchMore()
+    assert model.rowCount() == 200
+    # looking a name up makes it selectable
+    assert model.row("cam5000") == 5000
+    assert model.rowCount() == 5001
+    assert model.row("missing") == -1
+    assert "cam99999" in model and model.rowCount() == 5001
+
+
+def test_inserts_and_removals_emit_row_signals(app):
+    model = CatalogListModel(["a", "b", "c"], batch=10)
+    inserted, removed, resets = [], [], []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+    model.modelReset.connect(lambda: resets.append(True))
+
+    model.append(["d", "e", "a"])
+    assert inserted == [(3, 4)]
+    model.remove(["b", "zz"])
+    assert removed == [(1, 1)]
+    assert names(model) == ["a", "c", "d", "e"]
+    assert model.row("e") == 3
+    assert not resets
+
+    model.set_names(["x", "y"])
+    assert resets and names(model) == ["x", "y"]
+
+
+def test_inserts_into_unfetched_tail_stay_hidden(app):
+    model = CatalogListModel([f"n{i}" for i in range(50)], batch=10)
+    inserted = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    model.append(["new"])
+    assert not inserted and model.rowCount() == 10
+    assert model.row("new") == 50 and model.rowCount() == 51
+
+
+def test_removing_many_names_signals_once(app):
+    model = CatalogListModel([f"n{i}" for i in range(50)], batch=10)
+    removed, resets = [], []
+    model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+    model.modelReset.connect(lambda: resets.append(True))
+
+    model.remove(["n2", "n3", "n4", "n40"])  # one visible block + the unfetched tail
+    assert removed == [(2, 4)] and not resets
+    assert model.rowCount() == 7 and len(model) == 46
+
+    model.remove(["n0", "n6", "n8"])  # scattered
+    assert removed == [(2, 4)] and len(resets) == 1
+    assert names(model) == ["n1", "n5", "n7", "n9"]
+    assert model.row("n45") == 38 and "n40" not in model
@@ -0,0 +1,96 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import cli
+from cli import main
+
+ROOT = Path(__file__).parent.parent
+
+
+def write_catalog(tmp_path):
+    camera_file = tmp_path / "cameras.json"
+    objective_file = tmp_path / "objectives.json"
+    camera_file.write_text(json.dumps({"cameras": [
+        {"name": "cam", "resolution_x": 2000, "resolution_y": 1000, "pixel_size_um": 3.0},
+    ]}))
+    objective_file.write_text(json.dumps({"objectives": [
+        {"name": "lens", "focal_length": 12},
+    ]}))
+    return ["--camera-file", str(camera_file), "--objective-file", str(objective_file)]
+
+
+def test_solve_with_lens(tmp_path, capsys):
+    files = write_catalog(tmp_path)
+    assert main(files + ["solve", "--camera", "cam", "--lens", "lens", "--wd", "400"]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result["fov"] == 200.0  # 6 mm * 400 / 12
+    assert result["px_per_mm"] == 10.0
+    assert result["objective"] == "lens"
+
+
+def test_errors_are_json(tmp_path, capsys):
+    files = write_catalog(tmp_path)
+    assert main(files + ["solve", "--camera", "missing", "--wd", "1", "--fov", "2"]) == 1
+    assert "error" in json.loads(capsys.readouterr().out)
+    assert main(files + ["solve", "--camera", "cam", "--wd", "1"]) == 1
+    assert "error" in json.loads(capsys.readouterr().out)
+
+
+def test_type_and_zero_division_errors_are_json(tmp_path, capsys, monkeypatch):
+    files = write_catalog(tmp_path)
+    for error in (TypeError("bad type"), ZeroDivisionError("division by zero")):
+        def fail(*args, **kwargs):
+            raise error
+
+        monkeypatch.setattr(cli, "evaluate", fail)
+        assert main(files + ["solve", "--camera", "cam", "--wd", "400", "--focal", "12"]) == 1
+        assert json.loads(capsys.readouterr().out) == {"error": str(error)}
+
+
+def test_cli_does_not_import_pyqt(tmp_path):
+    files = write_catalog(tmp_path)
+    script = ("import sys, cli; rc = cli.main(sys.argv[1:]); "
+              "assert not any(m.startswith(('PyQt6', 'numpy')) for m in sys.modules), 'heavy import'; "
+              "sys.exit(rc)")
+    proc = subprocess.run(
+        [sys.executable, "-c", script] + files + ["solve", "--camera", "cam", "--focal", "12", "--wd", "400"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert json.loads(proc.stdout)["fov"] == 200.0
+
+
+def test_pareto(tmp_path, capsys):
+    # scratch result cache: nothing written to data/results_cache.sqlite3
+    files = write_catalog(tmp_path) + ["--cache-file", str(tmp_path / "cache.sqlite3")]
+    assert main(files + ["pareto", "--wd", "100:400:4", "--criteria", "min_defect_mm,wd"]) == 0
+    front = json.loads(capsys.readouterr().out)
+    # one camera × lens: smaller defect and larger WD trade off along the WD axis
+    assert [r["wd"] for r in front] == [100.0, 200.0, 300.0, 400.0]
+    assert front[-1]["fov"] == 200.0
+    assert main(files + ["pareto", "--wd", "1:2:0"]) == 1
+    assert "error" in json.loads(capsys.readouterr().out)
+
+
+def test_pareto_result_cache(tmp_path, capsys):
+    files = write_catalog(tmp_path) + ["--cache-file", str(tmp_path / "cache.sqlite3")]
+    for _ in range(2):
+        assert main(files + ["pareto", "--wd", "100:400:4"]) == 0
+    first, second = capsys.readouterr().out.splitlines()
+    assert first == second
+    assert main(files + ["cache", "stats"]) == 0
+    stats = json.loads(capsys.readouterr().out)
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+    assert main(files + ["cache", "clear"]) == 0
+    assert json.loads(capsys.readouterr().out) == {"removed": 1}
+
+
+def test_coverage(tmp_path, capsys):
+    files = write_catalog(tmp_path)
+    # 2000 px, 0.3 mm defect → FOV <= 200 mm; 12 mm lens up to WD 400 → FOV <= 200 mm
+    assert main(files + ["coverage", "--width", "1000", "--max-defect", "0.3", "--overlap", "0",
+                         "--wd-max", "400"]) == 0
+    plans = json.loads(capsys.readouterr().out)
+    assert [(p["camera"], p["objective"], p["camera_count"], p["fov"]) for p in plans] == [("cam", "lens", 5, 200.0)]
@@ -0,0 +1,86 @@
+import math
+import random
+
+import numpy as np
+
+from services.compatibility import CompatibilityIndex
+
+
+def make_catalog(n_cam, n_obj, seed=0):
+    rnd = random.Random(seed)
+    cameras = {
+        f"cam{i}": {
+            "name": f"cam{i}",
+            "resolution_x": rnd.choice([1440, 2448, 4096, 5472]),
+            "resolution_y": rnd.choice([1080, 2048, 3000]),
+            "pixel_size_um": rnd.choice([2.4, 3.45, 5.5]),
+            **({"mount": rnd.choice(["C", "cs", "F"])} if rnd.random() < 0.7 else {}),
+        }
+        for i in range(n_cam)
+    }
+    objectives = {
+        f"lens{i}": {
+            "name": f"lens{i}",
+            "focal_length": rnd.uniform(4, 75),
+            **({"max_image_circle": rnd.choice([8, 11, 16, 22, 43])} if rnd.random() < 0.8 else {}),
+            **({"mount": rnd.choice(["C", "CS", "F", "M42"])} if rnd.random() < 0.8 else {}),
+        }
+        for i in range(n_obj)
+    }
+    return cameras, objectives
+
+
+def expected(cam, lens):
+    mount_ok = not cam.get("mount") or not lens.get("mount") or cam["mount"].upper() == lens["mount"].upper()
+    if lens.get("max_image_circle") is None:
+        return mount_ok
+    px = cam["pixel_size_um"]
+    diagonal = math.hypot(px * cam["resolution_x"] / 1000., px * cam["resolution_y"] / 1000.)
+    return mount_ok and lens["max_image_circle"] >= diagonal
+
+
+def check(index, cameras, objectives):
+    assert sorted(index.camera_names) == sorted(cameras)
+    for name, cam in cameras.items():
+        compatible = set(index.compatible_objectives(name))
+        assert compatible == {lens for lens, rec in objectives.items() if expected(cam, rec)}
+
+
+def test_index_matches_pairwise_rule():
+    cameras, objectives = make_catalog(30, 50)
+    index = CompatibilityIndex(cameras, objectives)
+    check(index, cameras, objectives)
+    cam, lens = next(iter(cameras)), next(iter(objectives))
+    assert index.is_compatible(cam, lens) == expected(cameras[cam], objectives[lens])
+    assert np.array_equal(
+        index.camera_mask(lens),
+        [expected(cameras[c], objectives[lens]) for c in index.camera_names],
+    )
+
+
+def test_incremental_updates_match_a_rebuild():
+    cameras, objectives = make_catalog(10, 10)
+    index = CompatibilityIndex(cameras, objectives)
+    more_cams, more_objs = make_catalog(40, 60, seed=1)
+    for i, (name, rec) in enumerate(more_objs.items()):
+        rec = dict(rec, name=f"new-{name}")
+        objectives[rec["name"]] = rec
+        index.set_objective(rec)
+        if i < len(more_cams):
+            cam = dict(more_cams[f"cam{i}"], name=f"new-cam{i}")
+            cameras[cam["name"]] = cam
+            index.set_camera(cam)
+    check(index, cameras, objectives)
+
+    # modification + suppressions
+    cameras["cam0"] = dict(cameras["cam0"], pixel_size_um=9.0, mount="M42")
+    index.set_camera(cameras["cam0"])
+    objectives["lens1"] = dict(objectives["lens1"], max_image_circle=80, mount=None)
+    index.set_objective(objectives["lens1"])
+    for name in ["cam3", "new-cam39", "cam5"]:
+        del cameras[name]
+        index.remove_camera(name)
+    for name in ["lens0", "new-lens59", "lens7"]:
+        del objectives[name]
+        index.remove_objective(name)
+    check(index, cameras, objectives)
@@ -0,0 +1,100 @@
+import math
+import random
+
+import pytest
+
+from services.config_search import search_configurations
+from services.optics_calculations import (
+    compute_distance,
+    compute_px_per_mm,
+    compute_min_detectable_defect,
+)
+
+
+def make_catalog(n_cam, n_obj, seed=0):
+    rnd = random.Random(seed)
+    cameras = {
+        f"cam{i}": {
+            "name": f"cam{i}",
+            "resolution_x": rnd.choice([1440, 2448, 4096, 5472]),
+            "resolution_y": 2048,
+            "pixel_size_um": rnd.choice([2.4, 2.74, 3.45, 5.5]),
+        }
+        for i in range(n_cam)
+    }
+    objectives = {
+        f"lens{i}": {"name": f"lens{i}", "focal_length": rnd.uniform(4, 75)}
+        for i in range(n_obj)
+    }
+    return cameras, objectives
+
+
+def brute_force(cameras, objectives, fov, max_defect, wd_min, wd_max):
+    pairs = []
+    for cam in cameras.values():
+        sensor = cam["pixel_size_um"] * cam["resolution_x"] / 1000.
+        defect = compute_min_detectable_defect(compute_px_per_mm(cam["resolution_x"], fov))
+        if defect > max_defect:
+            continue
+        for lens in objectives.values():
+            wd = compute_distance(fov, sensor, lens["focal_length"])
+            if wd_min <= wd <= wd_max:
+                pairs.append((defect, abs(wd - (wd_min + wd_max) / 2.), cam["name"], lens["name"]))
+    pairs.sort(key=lambda p: (p[0], p[1]))
+    return pairs
+
+
+def test_search_matches_brute_force():
+    cameras, objectives = make_catalog(40, 60)
+    results = search_configurations(150, 0.2, 150, 400, top_n=15,
+                                    cameras=cameras, objectives=objectives)
+    expected = brute_force(cameras, objectives, 150, 0.2, 150, 400)[:15]
+    assert [(r["min_defect_mm"], r["camera"], r["objective"]) for r in results] == \
+        [(p[0], p[2], p[3]) for p in expected]
+    for r in results:
+        assert 150 <= r["wd"] <= 400
+        assert r["min_defect_mm"] <= 0.2
+
+
+def test_blur_budget_prunes_cameras():
+    cameras, objectives = make_catalog(20, 20)
+    results = search_configurations(150, 1.0, 50, 2000, max_blur_px=1.0,
+                                    speed_m_s=1.0, exposure_time_s=1e-4,
+                                    cameras=cameras, objectives=objectives)
+    assert results
+    assert all(r["blur_px"] <= 1.0 for r in results)
+
+
+def test_no_match_and_invalid_requirements():
+    cameras, objectives = make_catalog(5, 5)
+    assert search_configurations(150, 1e-6, 50, 2000,
+                                 cameras=cameras, objectives=objectives) == []
+    with pytest.raises(ValueError):
+        search_configurations(150, 1.0, 50, 2000, max_blur_px=1.0,
+                              cameras=cameras, objectives=objectives)
+
+
+def test_incompatible_pairs_are_skipped():
+    cameras, objectives = make_catalog(40, 80, seed=3)
+    rnd = random.Random(3)
+    for cam in cameras.values():
+        cam["mount"] = rnd.choice(["C", "F"])
+    for lens in objectives.values():
+        lens["mount"] = rnd.choice(["C", "F"])
+        lens["max_image_circle"] = rnd.choice([8, 11, 16, 43])
+
+    def compatible(cam, lens):
+        diagonal = cam["pixel_size_um"] * math.hypot(cam["resolution_x"], cam["resolution_y"]) / 1000.
+        return cam["mount"] == lens["mount"] and lens["max_image_circle"] >= diagonal
+
+    results = search_configurations(150, 0.2, 150, 400, top_n=15,
+                                    cameras=cameras, objectives=objectives)
+    expected = [
+        p for p in brute_force(cameras, objectives, 150, 0.2, 150, 400)
+        if compatible(cameras[p[2]], objectives[p[3]])
+    ][:15]
+    assert [(r["camera"], r["objective"]) for r in results] == [(p[2], p[3]) for p in expected]
+
+    unfiltered = search_configurations(150, 0.2, 150, 400, top_n=15, cameras=cameras,
+                                       objectives=objectives, compatible_only=False)
+    assert len(unfiltered) == 15
@@ -0,0 +1,117 @@
+import time
+
+import numpy as np
+import pytest
+
+from services.catalog import as_camera_catalog, as_objective_catalog
+from services.compatibility import pair_mask
+from services.coverage import camera_count, plan_coverage, required_fov
+from services.optics_calculations import compute_fov, compute_min_detectable_defect, compute_px_per_mm
+
+
+def make_catalog(n_cam, n_obj, rnd):
+    cameras = {
+        f"cam{i}": {
+            "name": f"cam{i}",
+            "resolution_x": int(rnd.integers(640, 5000)),
+            "resolution_y": int(rnd.integers(480, 4000)),
+            "pixel_size_um": float(rnd.uniform(2, 6)),
+            "mount": str(rnd.choice(["C", "F", ""])),
+        }
+        for i in range(n_cam)
+    }
+    objectives = {
+        f"lens{i}": {
+            "name": f"lens{i}",
+            "focal_length": float(rnd.choice([rnd.uniform(4, 75), 0.0, 16.0])),
+            "max_image_circle": float(rnd.choice([11, 16, 22, 43])),
+            "mount": str(rnd.choice(["C", "F", ""])),
+        }
+        for i in range(n_obj)
+    }
+    return cameras, objectives
+
+
+def brute_force(cameras, objectives, width, max_defect, overlap_pct, wd_min, wd_max, compatible_only):
+    # every pair, every camera count: smallest count, then finest defect
+    cameras, objectives = as_camera_catalog(cameras), as_objective_catalog(objectives)
+    best = None
+    for i in range(len(cameras)):
+        sensor, resolution = cameras.column("sensor_width_mm")[i], cameras.column("resolution_x")[i]
+        for j in range(len(objectives)):
+            focal = objectives.column("focal_length")[j]
+            if focal <= 0 or (compatible_only and not pair_mask(cameras, objectives, [i], [j])[0]):
+                continue
+            for count in range(1, 500):
+                fov = max(required_fov(width, count, overlap_pct / 100), compute_fov(sensor, focal, wd_min))
+                if fov <= compute_fov(sensor, focal, wd_max) * (1 + 1e-9) and \
+                        compute_min_detectable_defect(compute_px_per_mm(resolution, fov)) <= max_defect * (1 + 1e-9):
+                    key = (count, 3 * fov / resolution)
+                    best = key if best is None or key < best else best
+                    break
+    return best
+
+
+def test_camera_count_closed_form():
+    assert camera_count(100, 100) == 1 and camera_count(100, 150) == 1
+    # 10 % overlap: 3 cameras of 100 mm cover 100 + 2 * 90 = 280 mm
+    assert camera_count(280, 100, 0.1) == 3 and camera_count(281, 100, 0.1) == 4
+    np.testing.assert_array_equal(camera_count(1000, required_fov(1000, np.arange(1, 20), 0.25), 0.25),
+                                  np.arange(1, 20))
+
+
+def test_matches_brute_force():
+    rnd = np.random.default_rng(0)
+    for _ in range(40):
+        cameras, objectives = make_catalog(int(rnd.integers(1, 15)), int(rnd.integers(1, 15)), rnd)
+        width, max_defect = float(rnd.uniform(10, 3000)), float(rnd.uniform(0.02, 1))
+        overlap = float(rnd.choice([0, 10, 33]))
+        wd_min = float(rnd.choice([0, rnd.uniform(10, 300)]))
+        wd_max = wd_min + float(rnd.uniform(1, 1500))
+        compatible_only = bool(rnd.random() < 0.5)
+        plans = plan_coverage(width, max_defect, overlap, wd_min, wd_max, cameras=cameras, objectives=objectives,
+                              compatible_only=compatible_only, top_n=5)
+        expected = brute_force(cameras, objectives, width, max_defect, overlap, wd_min, wd_max, compatible_only)
+        if expected is None:
+            assert plans == []
+            continue
+        assert plans[0]["camera_count"] == expected[0]
+        assert plans[0]["min_defect_mm"] == pytest.approx(expected[1], rel=1e-9)
+        for plan in plans:
+            camera = cameras[plan["camera"]]
+            assert plan["camera_count"] == expected[0]
+            assert plan["coverage_mm"] >= width * (1 - 1e-9)
+            assert wd_min * (1 - 1e-9) <= plan["wd"] <= wd_max * (1 + 1e-9)
+            sensor = as_camera_catalog({camera["name"]: camera}).column("sensor_width_mm")[0]
+            assert compute_fov(sensor, plan["focal"], plan["wd"]) == pytest.approx(plan["fov"])
+            assert plan["min_defect_mm"] <= max_defect * (1 + 1e-9)
+        defects = [plan["min_defect_mm"] for plan in plans]
+        assert defects == sorted(defects)
+
+
+def test_wide_web_example():
+    cameras = {"cam": {"name": "cam", "resolution_x": 2000, "resolution_y": 1000, "pixel_size_um": 3.0}}
+    objectives = {"12mm": {"name": "12mm", "focal_length": 12}, "25mm": {"name": "25mm", "focal_length": 25}}
+    # 6 mm sensor, 0.3 mm defect → FOV <= 200 mm per camera; WD <= 400 with the 12 mm lens
+    plans = plan_coverage(1000, 0.3, overlap_pct=10, wd_min_mm=100, wd_max_mm=400, cameras=cameras,
+                          objectives=objectives)
+    # 200 + 4 * 180 = 920 < 1000 → 6 cameras, each FOV 1000 / 5.5 = 181.8 mm;
+    # the 25 mm lens only reaches 96 mm at WD 400
+    assert [(p["objective"], p["camera_count"]) for p in plans] == [("12mm", 6)]
+    assert plans[0]["fov"] == pytest.approx(1000 / 5.5)
+    assert plans[0]["wd"] == pytest.approx(1000 / 5.5 * 12 / 6)
+    assert plans[0]["coverage_mm"] == pytest.approx(1000)
+    assert plan_coverage(1000, 0.3, 10, 100, 400, max_cameras=5, cameras=cameras, objectives=objectives) == []
+    with pytest.raises(ValueError):
+        plan_coverage(1000, 0.3, overlap_pct=100, cameras=cameras, objectives=objectives)
+
+
+def test_large_catalog_is_fast():
+    rnd = np.random.default_rng(1)
+    cameras, objectives = make_catalog(5000, 5000, rnd)
+    cameras, objectives = as_camera_catalog(cameras), as_objective_catalog(objectives)
+    plan_coverage(1500, 0.2, 10, 100, 800, cameras=cameras, objectives=objectives)
+    start = time.perf_counter()
+    plans = plan_coverage(1500, 0.2, 10, 100, 800, cameras=cameras, objectives=objectives)
+    assert plans and len({p["camera_count"] for p in plans}) == 1
+    assert time.perf_counter() - start < 5  # generous bound for slow CI machines (~20 ms locally)
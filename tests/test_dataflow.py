@@ -0,0 +1,101 @@
+import math
+
+from services.dataflow import Dataflow
+from services.optics_calculations import (
+    compute_fov,
+    compute_px_per_mm,
+    compute_min_detectable_defect,
+    compute_motion_blur,
+)
+
+CAMERA = {"sensor_width_mm": 6.0, "resolution_x": 2000, "pixel_size_um": 3.0, "required_pixels": 3}
+INPUTS = {"wd": 400.0, "focal": 12.0, "fov": 0.0, "speed_m_s": 1.5, "exposure_time_s": 0.002}
+
+
+def make_flow(locks):
+    return Dataflow(dict(CAMERA, **INPUTS), locks)
+
+
+def test_forward_values_match_optics_calculations():
+    flow = make_flow({"wd": True, "focal": True})
+    flow.solve()
+    v = flow.values
+    fov = compute_fov(6.0, 12.0, 400.0)
+    px_per_mm = compute_px_per_mm(2000, fov)
+    assert v["fov"] == fov
+    assert v["px_per_mm"] == px_per_mm
+    assert v["min_defect_mm"] == compute_min_detectable_defect(px_per_mm, 3)
+    assert (v["blur_object_mm"], v["blur_sensor_um"], v["blur_px"]) == compute_motion_blur(1.5, 0.002, px_per_mm, 3.0)
+
+
+def test_solve_any_variable_from_locks():
+    # défaut min + focale imposés → px/mm → FOV → WD
+    flow = Dataflow(dict(CAMERA, focal=16.0, min_defect_mm=0.1), {"focal": True, "min_defect_mm": True})
+    flow.solve()
+    v = flow.values
+    assert math.isclose(v["px_per_mm"], 30.0)
+    assert math.isclose(v["fov"], 2000 / 30.0)
+    assert math.isclose(v["wd"], v["fov"] * 16.0 / 6.0)
+
+    # flou max 1 px à vitesse donnée → exposition
+    flow = make_flow({"wd": True, "focal": True, "speed_m_s": True, "blur_px": True})
+    flow.set("blur_px", 1.0)
+    flow.solve()
+    v = flow.values
+    assert math.isclose(compute_motion_blur(1.5, v["exposure_time_s"], v["px_per_mm"], 3.0)[2], 1.0)
+
+
+def test_only_downstream_nodes_change():
+    flow = make_flow({"wd": True, "focal": True})
+    flow.solve()
+    changed = flow.solve()
+    assert changed == {}
+    flow.set("speed_m_s", 3.0)
+    changed = flow.solve()
+    assert set(changed) == {"speed_m_s", "blur_object_mm", "blur_sensor_um", "blur_px"}
+    flow.set("wd", 200.0)
+    changed = flow.solve()
+    assert set(changed) == {"wd", "fov", "px_per_mm", "min_defect_mm", "blur_sensor_um", "blur_px"}
+
+
+def test_derived_value_typed_by_user_is_recomputed():
+    flow = make_flow({"wd": True, "focal": True})
+    flow.solve()
+    fov = flow.values["fov"]
+    flow.set("fov", 1.0)
+    assert flow.solve() == {}
+    assert flow.values["fov"] == fov
+
+
+def test_undefined_outputs_are_none():
+    flow = make_flow({})  # aucun verrou : les entrées gardent leur valeur, fov = 0
+    changed = flow.solve()
+    assert flow.values["fov"] == 0.0
+    assert flow.values["px_per_mm"] is None and flow.values["blur_px"] is None
+    assert "px_per_mm" not in changed
+    flow.set("speed_m_s", None)
+    flow.set("fov", 100.0)
+    flow.solve()
+    assert flow.values["px_per_mm"] == 20.0
+    assert flow.values["blur_object_mm"] is None
+
+
+def test_zero_pixel_size_or_resolution_gives_none():
+    flow = Dataflow(dict(CAMERA, **INPUTS, pixel_size_um=0.0), {"wd": True, "focal": True})
+    flow.solve()
+    assert flow.values["px_per_mm"] == 10.0 and flow.values["blur_sensor_um"] == 0.0
+    assert flow.values["blur_px"] is None
+    flow = Dataflow(dict(CAMERA, **INPUTS, resolution_x=0), {"wd": True, "focal": True})
+    flow.solve()
+    assert flow.values["px_per_mm"] == 0.0
+    assert flow.values["min_defect_mm"] is None
+
+
+def test_resolve_matches_stateful_engine():
+    from services.dataflow import resolve
+
+    locks = {"wd": True, "fov": True}
+    values = dict(CAMERA, **dict(INPUTS, fov=250.0))
+    flow = Dataflow(values, locks)
+    flow.solve()
+    assert resolve(dict(values), locks) == flow.values
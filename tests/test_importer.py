@@ -0,0 +1,112 @@
+import csv
+import json
+import time
+
+import pytest
+
+from cli import main
+from services.database_manager import DatabaseManager
+from services.importer import import_file, import_records, prepare_camera, prepare_objective
+
+
+@pytest.fixture
+def db(tmp_path):
+    camera_file = tmp_path / "cameras.json"
+    objective_file = tmp_path / "objectives.json"
+    camera_file.write_text(json.dumps({"cameras": [
+        {"name": "cam", "resolution_x": 2000, "resolution_y": 1000, "pixel_size_um": 3.0},
+    ]}))
+    objective_file.write_text(json.dumps({"objectives": []}))
+    return DatabaseManager(camera_file, objective_file)
+
+
+def test_vendor_fields_and_units_are_normalized():
+    cam = prepare_camera({
+        "Model": " acA2440-20gm ", "Resolution": "2448 x 2048", "Pixel Size": "3.45 µm",
+        "Shutter Type": "Global", "Lens-Mount": "c", "Vendor SKU": "107406",
+    })
+    assert cam == {
+        "name": "acA2440-20gm", "resolution_x": 2448, "resolution_y": 2048,
+        "pixel_size_um": 3.45, "shutter": "global", "mount": "C", "notes": "",
+    }
+    assert prepare_camera({"name": "x", "width": "10", "height": "10", "pixel_size_nm": "3450"})["pixel_size_um"] == 3.45
+
+    lens = prepare_objective({"name": "KOWA LM16JC", "focal": "16mm", "mount": "c",
+                              "max_image_cirle": "1.1 cm", "aperture": "F1.4"})
+    assert lens == {"name": "KOWA LM16JC", "focal_length": 16.0, "mount": "C",
+                    "max_image_circle": 11.0, "aperture": 1.4}
+
+
+@pytest.mark.parametrize("row", [
+    {"name": "", "width": 10, "height": 10, "pixel_size": 3},
+    {"name": "x", "width": 10, "height": 0, "pixel_size": 3},
+    {"name": "x", "width": 10, "height": 10, "pixel_size": "3 parsecs"},
+    {"name": "x", "width": 10, "height": 10},
+])
+def test_invalid_cameras_are_rejected(row):
+    with pytest.raises(ValueError):
+        prepare_camera(row)
+
+
+def test_import_reports_rejections_and_dedupes(db):
+    rows = [
+        {"model": "a", "focal": 8},
+        {"model": "b", "focal": "n/a"},
+        {"model": "a", "focal": 12},
+        "garbage",
+        {"model": "c", "focal": 25, "aperture": "f/2.8"},
+    ]
+    batches = []
+    report = import_records(db, "objectives", rows, batch_size=1, progress=lambda r: batches.append(r.imported))
+    assert (report.rows, report.imported, report.skipped) == (5, 2, 0)
+    assert [(row, reason.split(":")[0]) for row, _, reason in report.rejected] == [
+        (1, "invalid focal_length"), (2, "duplicate name in source"), (3, "not an object"),
+    ]
+    assert batches == [1, 2]
+    assert db.load_objectives()["c"]["aperture"] == 2.8
+    # compacted: nothing left in the journal
+    assert db.objective_journal.log_path.stat().st_size == 0
+
+
+def test_malformed_jsonl_lines_are_rejected(db, tmp_path):
+    source = tmp_path / "lenses.jsonl"
+    source.write_text('{"model": "a", "focal": 8}\n{bad\n[1]\n{"model": "b", "focal": 12}\n')
+    report = import_file(db, "objectives", source)
+    assert (report.rows, report.imported) == (4, 2)
+    assert [(row, reason.split(" (")[0]) for row, _, reason in report.rejected] == [
+        (1, "line 2: invalid JSON"), (2, "line 3: not an object: list"),
+    ]
+    assert sorted(db.load_objectives()) == ["a", "b"]
+
+
+def test_existing_names_are_skipped_unless_update(db):
+    rows = [{"name": "cam", "resolution_x": 10, "resolution_y": 10, "pixel_size_um": 5}]
+    assert import_records(db, "cameras", rows).skipped == 1
+    assert db.load_cameras()["cam"]["pixel_size_um"] == 3.0
+    assert import_records(db, "cameras", rows, update=True).imported == 1
+    assert db.load_cameras()["cam"]["pixel_size_um"] == 5.0
+
+
+def test_large_csv_import_is_fast(db, tmp_path):
+    source = tmp_path / "vendor.csv"
+    with open(source, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Model", "Width", "Height", "Pixel size (um)", "Shutter"])
+        for i in range(100_000):
+            writer.writerow([f"model-{i}", 2448, 2048, "3.45", "Global"])
+    start = time.perf_counter()
+    report = import_file(db, "cameras", source)
+    assert report.imported == 100_000 and not report.rejected
+    assert time.perf_counter() - start < 30  # generous bound for slow CI machines
+    assert len(db.load_cameras()) == 100_001
+
+
+def test_cli_import(db, tmp_path, capsys):
+    source = tmp_path / "lenses.jsonl"
+    source.write_text('{"name": "l1", "focal_length": "16"}\n{"name": "l2"}\n')
+    rejects = tmp_path / "rejects.jsonl"
+    files = ["--camera-file", str(db.camera_file), "--objective-file", str(db.objective_file)]
+    assert main(files + ["import", "objectives", str(source), "--rejects", str(rejects)]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert (result["imported"], result["rejected"]) == (1, 1)
+    assert json.loads(rejects.read_text())["name"] == "l2"
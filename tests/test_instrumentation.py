@@ -0,0 +1,41 @@
+import json
+
+from services import instrumentation
+
+
+def test_disabled_is_a_no_op(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_target", None)
+    instrumentation.reset()
+
+    def func():
+        return 42
+
+    assert instrumentation.timed("x")(func) is func
+    with instrumentation.span("x"):
+        pass
+    assert instrumentation.snapshot() == {}
+
+
+def test_spans_and_decorators_are_aggregated(monkeypatch, tmp_path):
+    monkeypatch.setattr(instrumentation, "_target", str(tmp_path / "profile.json"))
+    instrumentation.reset()
+
+    @instrumentation.timed("work")
+    def work(n):
+        return sum(range(n))
+
+    assert work(1000) == 499500
+    work(10)
+    with instrumentation.span("phase"):
+        pass
+    instrumentation.record("manual", 0.0015)
+
+    stats = instrumentation.snapshot()
+    assert stats["work"]["count"] == 2
+    assert stats["phase"]["count"] == 1
+    assert stats["manual"]["buckets_us"] == {"<=2048": 1}
+    assert abs(stats["manual"]["total_ms"] - 1.5) < 1e-9
+
+    instrumentation.dump()
+    assert json.loads((tmp_path / "profile.json").read_text())["work"]["count"] == 2
+    instrumentation.reset()
@@ -0,0 +1,116 @@
+import os
+import shutil
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+QtCore = pytest.importorskip("PyQt6.QtCore")
+
+import ui.main_window
+from services.database_manager import CAMERA_FILE, OBJECTIVE_FILE, DatabaseManager
+from ui.main_window import MainWindow
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def window(app, tmp_path, monkeypatch):
+    # scaled logo and a copy of the shipped catalog in a scratch folder
+    monkeypatch.setattr(ui.main_window, "DATA_DIR", tmp_path)
+    camera_file = shutil.copy(CAMERA_FILE, tmp_path / "cameras.json")
+    objective_file = shutil.copy(OBJECTIVE_FILE, tmp_path / "objectives.json")
+
+    class ScratchDatabaseManager(DatabaseManager):
+        def __init__(self, camera_file=camera_file, objective_file=objective_file):
+            super().__init__(camera_file, objective_file)
+
+    monkeypatch.setattr(ui.main_window, "DatabaseManager", ScratchDatabaseManager)
+    window = MainWindow(watch_catalog=False)
+    yield window
+    window.catalog_loader.wait()
+    window.recalc.wait()
+    window.close()
+
+
+def wait_ready(window, timeout_ms=10_000):
+    loop = QtCore.QEventLoop()
+    window.ready.connect(loop.quit)
+    QtCore.QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+
+
+def test_catalog_loads_after_show(window, tmp_path):
+    # nothing read from disk before the window is on screen
+    assert not window.catalog_loaded and window.cameras == {}
+    assert not window.camera_combo.isEnabled()
+    window.show()
+    wait_ready(window)
+
+    assert window.catalog_loaded and window.camera_combo.isEnabled()
+    assert window.camera_combo.currentText() in window.cameras
+    assert window.current_camera is not None
+    assert list(tmp_path.glob("logo_*.png"))
+
+
+def test_tabs_are_built_on_first_use(window):
+    window.show()
+    wait_ready(window)
+    assert window.tab_extra is None and window.tab_tradeoffs is None
+    # speed / exposure defaults are used while the Motion Blur tab does not exist
+    assert window.tradeoff_context()["speed_m_s"] == 1.0
+    # WD + focal locked: the FOV is solved, so the blur is defined
+    window.wd_edit.setText("200")
+    window.focal_edit.setText("16")
+    window.wd_lock.setChecked(True)
+    window.focal_lock.setChecked(True)
+    window.fov_lock.setChecked(False)
+    window.recalc.wait()
+    state = window.last_state
+    assert state is not None and state["blur_px"] is not None
+    # wd / focal / fov went through the memoized solver
+    assert window.solver.cache_info()["misses"] >= 1
+
+    window.tabs.setCurrentIndex(1)
+    assert window.tab_extra is not None
+    # filled from the last computed state, with the default speed / exposure
+    assert window.speed_edit.text() == "1.0" and window.exposure_edit.text() == "0.001"
+    assert window.blur_px_label.text() == f"{state['blur_px']:.2f}"
+    assert window.blur_object_label.text() == f"{state['blur_object_mm']:.3f}"
+    window.tabs.setCurrentIndex(2)
+    assert window.tab_tradeoffs is not None
+    window.tabs.setCurrentIndex(1)
+    assert window.tabs.widget(1).layout().count() == 1
+
+
+def test_tradeoff_worker_reads_do_not_hide_catalog_changes(window):
+    window.show()
+    wait_ready(window)
+    other = DatabaseManager(window.db.camera_file, window.db.objective_file)  # another station
+    other.append_camera({"name": "new camera", "resolution_x": 640, "resolution_y": 480, "pixel_size_um": 5.6})
+    # what the Trade-offs worker does with its context, before the GUI reloads
+    context = window.tradeoff_context()
+    assert context["db"] is not window.db
+    assert "new camera" in context["db"].load_cameras()
+    window.reload_catalog()
+    # read and diffed off the GUI thread
+    assert "new camera" not in window.cameras
+    window.catalog_refresher.wait()
+    assert "new camera" in window.cameras and "new camera" in window.camera_model
+
+
+def test_reloads_requested_during_a_refresh_are_not_lost(window):
+    window.show()
+    wait_ready(window)
+    other = DatabaseManager(window.db.camera_file, window.db.objective_file)
+    other.append_camera({"name": "first", "resolution_x": 640, "resolution_y": 480, "pixel_size_um": 5.6})
+    window.reload_catalog()
+    other.append_camera({"name": "second", "resolution_x": 640, "resolution_y": 480, "pixel_size_um": 5.6})
+    window.reload_catalog()  # while the first refresh is in flight
+    for _ in range(2):
+        window.catalog_refresher.wait()
+    assert {"first", "second"} <= set(window.cameras)
+    assert "second" in window.camera_model and not window.refresh_running
@@ -0,0 +1,66 @@
+import math
+
+import numpy as np
+
+from services.optics_calculations import (
+    compute_fov,
+    compute_distance,
+    compute_focal,
+    compute_px_per_mm,
+    compute_min_detectable_defect,
+    compute_motion_blur,
+)
+from services.optics_batch import (
+    compute_fov_batch,
+    compute_distance_batch,
+    compute_focal_batch,
+    compute_px_per_mm_batch,
+    compute_min_detectable_defect_batch,
+    compute_motion_blur_batch,
+)
+
+SENSORS = [8.4456, 6.0, 11.22304, 4.968]
+FOCALS = [16, 12.0, 50, 8.5]
+DISTANCES = [400, 200.0, 123.456, 1000]
+
+
+def test_geometry_matches_scalar():
+    s, f, d = np.array(SENSORS), np.array(FOCALS), np.array(DISTANCES)
+    fov = compute_fov_batch(s, f, d)
+    wd = compute_distance_batch(fov, s, f)
+    focal = compute_focal_batch(s, d, fov)
+    for i in range(len(SENSORS)):
+        assert fov[i] == compute_fov(SENSORS[i], FOCALS[i], DISTANCES[i])
+        assert wd[i] == compute_distance(fov[i], SENSORS[i], FOCALS[i])
+        assert focal[i] == compute_focal(SENSORS[i], DISTANCES[i], fov[i])
+
+
+def test_resolution_matches_scalar():
+    fov = np.array([200.0, 33.3, 1e-3])
+    pxmm = compute_px_per_mm_batch(2448, fov)
+    defect = compute_min_detectable_defect_batch(pxmm, required_pixels=3)
+    for i in range(len(fov)):
+        assert pxmm[i] == compute_px_per_mm(2448, fov[i])
+        assert defect[i] == compute_min_detectable_defect(pxmm[i], required_pixels=3)
+
+
+def test_motion_blur_matches_scalar_with_broadcasting():
+    speeds = np.array([0.5, 1.0, 2.0])[:, None]
+    exposures = np.array([1e-4, 1e-3])[None, :]
+    obj, sensor, px = compute_motion_blur_batch(speeds, exposures, 12.24, 3.45)
+    assert obj.shape == sensor.shape == px.shape == (3, 2)
+    for i in range(3):
+        for j in range(2):
+            expected = compute_motion_blur(speeds[i, 0], exposures[0, j], 12.24, 3.45)
+            assert (obj[i, j], sensor[i, j], px[i, j]) == expected
+
+
+def test_zero_divisors_give_nan():
+    fov = compute_fov_batch(6, np.array([12.0, 0.0]), 400)
+    assert fov[0] == 200 and math.isnan(fov[1])
+    assert math.isnan(compute_distance_batch(200, 0, 12))
+    assert math.isnan(compute_focal_batch(6, 400, 0))
+    assert math.isnan(compute_px_per_mm_batch(2048, 0))
+    assert math.isnan(compute_min_detectable_defect_batch(0))
+    _, _, blur_px = compute_motion_blur_batch(1.0, 1e-3, 10.0, 0.0)
+    assert math.isnan(blur_px)
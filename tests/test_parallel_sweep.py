@@ -0,0 +1,61 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from services.parallel_sweep import catalog_sweep
+from services.sweep import sweep_grid
+
+
+def make_catalog(n_cam, n_obj, seed=0):
+    rnd = np.random.default_rng(seed)
+    cameras = {
+        f"cam{i}": {
+            "name": f"cam{i}",
+            "resolution_x": int(rnd.integers(640, 5000)),
+            "resolution_y": 1000,
+            "pixel_size_um": float(rnd.uniform(2, 6)),
+        }
+        for i in range(n_cam)
+    }
+    objectives = {f"lens{i}": {"name": f"lens{i}", "focal_length": float(rnd.uniform(4, 75))} for i in range(n_obj)}
+    # a zero focal length: NaN, as in optics_batch
+    objectives["lens0"]["focal_length"] = 0.0
+    return cameras, objectives
+
+
+def test_parallel_matches_serial_and_sweep_grid():
+    cameras, objectives = make_catalog(23, 17)
+    wd, speed, exposure = np.linspace(0, 800, 9), [0.5, 2.0], [1e-4, 1e-3, 0.0]
+    serial = catalog_sweep(cameras, objectives, wd, speed, exposure, workers=1)
+    with catalog_sweep(cameras, objectives, wd, speed, exposure,
+                       workers=2, min_parallel=0, block_size=500) as parallel:
+        assert parallel["blur_px"].shape == (23, 17, 9, 2, 3)
+        for key in ("fov", "px_per_mm", "min_defect_mm", "blur_object_mm", "blur_sensor_um", "blur_px"):
+            np.testing.assert_array_equal(parallel[key], serial[key])
+
+    for cam in ("cam0", "cam11", "cam22"):
+        i = serial["cameras"].index(cam)
+        focal = [objectives[name]["focal_length"] for name in serial["objectives"]]
+        grid = sweep_grid(cameras[cam], wd, focal, speed, exposure)
+        np.testing.assert_array_equal(serial["fov"][i], grid["fov"].T)
+        np.testing.assert_array_equal(serial["blur_px"][i], grid["blur_px"].transpose(1, 0, 2, 3))
+
+
+def test_small_jobs_stay_in_process():
+    cameras, objectives = make_catalog(3, 4)
+    result = catalog_sweep(cameras, objectives, [100, 200], workers=8)
+    assert result._shared == []
+    assert result["fov"].shape == (3, 4, 2)
+    assert "blur_px" not in result
+
+
+def test_shared_memory_is_released():
+    cameras, objectives = make_catalog(8, 5)
+    result = catalog_sweep(cameras, objectives, [100, 200, 300], workers=2, min_parallel=0, block_size=10)
+    names = [shared.shm.name for shared in result._shared]
+    assert names
+    result.close()
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
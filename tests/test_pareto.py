@@ -0,0 +1,113 @@
+import time
+
+import numpy as np
+import pytest
+
+from services.pareto import configuration_front, pareto_front
+from services.solver import evaluate
+
+
+def brute_force(values):
+    keep = []
+    for i, point in enumerate(values):
+        if np.isnan(point).any():
+            continue
+        dominated = False
+        for other in values:
+            if (other <= point).all() and (other < point).any():
+                dominated = True
+                break
+        if not dominated:
+            keep.append(i)
+    return np.array(keep, dtype=np.int64)
+
+
+@pytest.mark.parametrize("d", [1, 2, 3, 4, 5])
+def test_matches_brute_force(d):
+    rnd = np.random.default_rng(d)
+    for n in (1, 7, 300):
+        # few distinct values: many ties and exact duplicates
+        values = rnd.integers(0, 6, size=(n, d)).astype(float)
+        values[rnd.random((n, d)) < 0.02] = np.nan
+        np.testing.assert_array_equal(pareto_front(values), brute_force(values))
+        values = rnd.random((n, d))
+        np.testing.assert_array_equal(pareto_front(values), brute_force(values))
+
+
+def test_empty_and_shape_errors():
+    assert pareto_front(np.empty((0, 3))).size == 0
+    assert pareto_front([[np.nan, 1.0]]).size == 0
+    with pytest.raises(ValueError):
+        pareto_front([1.0, 2.0])
+
+
+def test_million_points_is_fast():
+    rnd = np.random.default_rng(0)
+    values = rnd.random((1_000_000, 3))
+    pareto_front(values[:1000])
+    start = time.perf_counter()
+    front = pareto_front(values)
+    elapsed = time.perf_counter() - start
+    # the front of uniform random points is small; spot-check it
+    for i in front[:20]:
+        point = values[i]
+        assert not ((values <= point).all(axis=1) & (values < point).any(axis=1)).any()
+    assert elapsed < 30  # generous bound for slow CI machines (well under a second locally)
+
+
+CAMERAS = {
+    "small": {"name": "small", "resolution_x": 1000, "resolution_y": 1000, "pixel_size_um": 5.0, "mount": "C"},
+    "big": {"name": "big", "resolution_x": 4000, "resolution_y": 3000, "pixel_size_um": 3.45, "mount": "C"},
+}
+OBJECTIVES = {
+    "8mm": {"name": "8mm", "focal_length": 8.0, "mount": "C", "max_image_circle": 16},
+    "25mm": {"name": "25mm", "focal_length": 25.0, "mount": "C", "max_image_circle": 16},
+    "F50": {"name": "F50", "focal_length": 50.0, "mount": "F", "max_image_circle": 43},
+}
+
+
+def test_configuration_front_is_non_dominated_and_consistent():
+    wd = np.linspace(50, 1000, 20)
+    front = configuration_front(wd, cameras=CAMERAS, objectives=OBJECTIVES)
+    assert front
+    # the F-mount lens is not compatible with C-mount cameras
+    assert {r["objective"] for r in front} <= {"8mm", "25mm"}
+    defects = [r["min_defect_mm"] for r in front]
+    assert defects == sorted(defects)
+    scores = [(r["min_defect_mm"], -r["wd"], -r["fov"]) for r in front]
+    for r, score in zip(front, scores):
+        expected = evaluate(CAMERAS[r["camera"]], wd=r["wd"], focal=r["focal"])
+        assert r["fov"] == pytest.approx(expected["fov"])
+        assert r["min_defect_mm"] == pytest.approx(expected["min_defect_mm"])
+        for other in scores:
+            assert other == score or not all(o <= s for o, s in zip(other, score))
+
+    with_all = configuration_front(wd, cameras=CAMERAS, objectives=OBJECTIVES, compatible_only=False)
+    assert "F50" in {r["objective"] for r in with_all}
+
+
+def test_configuration_front_constraints_and_blur():
+    wd = np.linspace(50, 1000, 20)
+    front = configuration_front(
+        wd, ("wd", "fov", "blur_px"), speed_m_s=1.0, exposure_time_s=1e-4,
+        max_defect_mm=0.5, min_fov_mm=100, cameras=CAMERAS, objectives=OBJECTIVES,
+    )
+    assert front
+    for r in front:
+        assert r["min_defect_mm"] <= 0.5 and r["fov"] >= 100
+        assert r["blur_px"] == pytest.approx(0.1 * r["px_per_mm"])
+
+
+def test_criteria_validation():
+    with pytest.raises(ValueError):
+        configuration_front([100], ("speed",), cameras=CAMERAS, objectives=OBJECTIVES)
+    with pytest.raises(ValueError):
+        configuration_front([100], ("blur_px",), cameras=CAMERAS, objectives=OBJECTIVES)
+    # smaller defect = more blur at fixed speed / exposure: not a meaningful front
+    with pytest.raises(ValueError):
+        configuration_front([100], ("min_defect_mm", "blur_px"), speed_m_s=1, exposure_time_s=1e-3,
+                            cameras=CAMERAS, objectives=OBJECTIVES)
+    # same ordering: px/mm adds nothing to the defect criterion
+    a = configuration_front([100, 300], ("min_defect_mm", "wd"), cameras=CAMERAS, objectives=OBJECTIVES)
+    b = configuration_front([100, 300], ("min_defect_mm", "wd", "px_per_mm"), cameras=CAMERAS, objectives=OBJECTIVES)
+    assert a == b
@@ -0,0 +1,123 @@
+import functools
+import json
+
+import numpy as np
+import pytest
+
+import services.pareto
+from services.database_manager import DatabaseManager
+from services.parallel_sweep import catalog_sweep
+from services.pareto import configuration_front
+from services.result_cache import (
+    ResultCache, cached_front, cached_search, cached_solve, cached_sweep, catalog_fingerprint,
+)
+
+CAMERAS = [
+    {"name": "cam", "resolution_x": 2000, "resolution_y": 1000, "pixel_size_um": 3.0, "mount": "C"},
+    {"name": "big", "resolution_x": 4000, "resolution_y": 3000, "pixel_size_um": 3.45, "mount": "C"},
+]
+OBJECTIVES = [
+    {"name": "lens", "focal_length": 12, "mount": "C", "max_image_circle": 16},
+    {"name": "25mm", "focal_length": 25, "mount": "C", "max_image_circle": 16},
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    camera_file = tmp_path / "cameras.json"
+    objective_file = tmp_path / "objectives.json"
+    camera_file.write_text(json.dumps({"cameras": CAMERAS}))
+    objective_file.write_text(json.dumps({"objectives": OBJECTIVES}))
+    return DatabaseManager(camera_file, objective_file)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with ResultCache(tmp_path / "cache.sqlite3") as cache:
+        yield cache
+
+
+def count_calls(monkeypatch):
+    calls = []
+    original = services.pareto.configuration_front
+
+    @functools.wraps(original)  # same signature: same normalized query
+    def counted(*args, **kwargs):
+        calls.append(kwargs)
+        return original(*args, **kwargs)
+
+    # cached_front imports the function from the module at call time
+    monkeypatch.setattr(services.pareto, "configuration_front", counted)
+    return calls
+
+
+def test_second_query_is_served_from_disk(db, cache, tmp_path, monkeypatch):
+    calls = count_calls(monkeypatch)
+    first = cached_front(cache, db, wd_mm=[100, 200, 300], min_fov_mm=50)
+    assert first == configuration_front([100, 200, 300], min_fov_mm=50,
+                                        cameras=db.load_camera_catalog(), objectives=db.load_objective_catalog())
+    # defaults given explicitly, tuples vs lists, ints vs floats: same query
+    again = cached_front(cache, db, wd_mm=(100.0, 200, 300), min_fov_mm=50.0,
+                         criteria=["min_defect_mm", "wd", "fov"], required_pixels=3)
+    assert again == first and len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # a new session on the same file
+    with ResultCache(tmp_path / "cache.sqlite3") as other:
+        assert cached_front(other, db, wd_mm=[100, 200, 300], min_fov_mm=50) == first
+        assert len(calls) == 1
+        stats = other.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1
+    assert stats["kinds"]["pareto"]["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_catalog_edit_invalidates(db, cache, monkeypatch):
+    calls = count_calls(monkeypatch)
+    fingerprint = catalog_fingerprint(db)
+    before = cached_front(cache, db, wd_mm=[100, 400])
+    db.append_camera({"name": "new", "resolution_x": 8000, "resolution_y": 6000, "pixel_size_um": 1.0, "mount": "C"})
+    assert catalog_fingerprint(db) != fingerprint
+    after = cached_front(cache, db, wd_mm=[100, 400])
+    assert len(calls) == 2
+    assert "new" in {r["camera"] for r in after} and after != before
+
+
+def test_solve_search_and_sweep(db, cache):
+    solved = cached_solve(cache, db, "cam", lens="lens", wd=400)
+    assert (solved["fov"], solved["objective"]) == (200.0, "lens")
+    assert cached_solve(cache, db, "cam", lens="lens", wd=400.0) == solved
+    assert cache.hits == 1
+    with pytest.raises(KeyError):
+        cached_solve(cache, db, "missing", wd=1, fov=2)
+
+    query = dict(target_fov_mm=100, max_defect_mm=1, wd_min_mm=50, wd_max_mm=1000)
+    assert cached_search(cache, db, **query) == cached_search(cache, db, **query)
+    assert cache.hits == 2
+
+    sweep = cached_sweep(cache, db, wd_mm=np.linspace(50, 500, 4), speed_m_s=[1.0], exposure_time_s=[1e-3])
+    again = cached_sweep(cache, db, wd_mm=np.linspace(50, 500, 4), speed_m_s=[1.0], exposure_time_s=[1e-3])
+    assert cache.hits == 3
+    expected = catalog_sweep(db.load_camera_catalog(), db.load_objective_catalog(), np.linspace(50, 500, 4),
+                             [1.0], [1e-3])
+    for result in (sweep, again):
+        assert result["cameras"] == ["cam", "big"]
+        np.testing.assert_array_equal(result["blur_px"], expected["blur_px"])
+
+
+def test_lru_eviction_and_clear(cache):
+    cache.max_bytes = 3000
+    for i in range(5):
+        cache.put(f"k{i}", b"x" * 900, "test")
+        if i == 2:
+            assert cache.get("k0", "test") is not None  # k0 becomes the most recently used
+    stats = cache.stats()
+    assert stats["bytes"] <= 3000
+    assert cache.get("k0", "test") is not None
+    assert cache.get("k1", "test") is None and cache.get("k2", "test") is None
+    assert cache.get("k4", "test") is not None
+    # too large for the cache: not stored
+    assert not cache.put("huge", b"x" * 5000)
+
+    assert cache.clear() == stats["entries"]
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["hit_rate"]) == (0, 0, None)
@@ -0,0 +1,85 @@
+import random
+import time
+
+from services.search_index import CatalogSearchIndex
+
+
+CAMERAS = {
+    "Sony IMX250 (5MP)": {"notes": '2/3" CMOS'},
+    "VCXU.2-51C (Sony IMX264 Gen2)": {"notes": "Baumer"},
+    "acA2440-20gm": {"notes": "Basler ace, Sony IMX264"},
+    "IMX264 board": {},
+    "Basler ace 2": {"notes": None},
+}
+
+
+def test_ranking_prefix_word_substring_notes():
+    index = CatalogSearchIndex(CAMERAS)
+    # name prefix, then word prefix, then notes
+    assert index.search("imx2") == ["IMX264 board", "Sony IMX250 (5MP)", "VCXU.2-51C (Sony IMX264 Gen2)", "acA2440-20gm"]
+    assert index.search("IMX264") == ["IMX264 board", "VCXU.2-51C (Sony IMX264 Gen2)", "acA2440-20gm"]
+    # substring in the middle of a word
+    assert index.search("440") == ["acA2440-20gm"]
+    # every term must match (name or notes)
+    assert index.search("sony 264") == ["VCXU.2-51C (Sony IMX264 Gen2)", "acA2440-20gm"]
+    assert index.search("") == []
+    assert index.search("zzz") == []
+
+
+def test_terms_split_into_words_must_match_whole():
+    index = CatalogSearchIndex(CAMERAS)
+    # "imx-250" is looked up by its first word, "imx", but only names containing it match
+    assert index.search("imx-250") == []
+    assert index.search("imx250") == ["Sony IMX250 (5MP)"]
+    assert index.search("2/3") == ["Sony IMX250 (5MP)"]
+    assert index.search("2-51") == ["VCXU.2-51C (Sony IMX264 Gen2)"]
+
+
+def test_limit_and_accept():
+    index = CatalogSearchIndex(CAMERAS)
+    assert index.search("imx", limit=1) == ["IMX264 board"]
+    assert index.search("imx264", accept=lambda name: "board" not in name) == [
+        "VCXU.2-51C (Sony IMX264 Gen2)", "acA2440-20gm",
+    ]
+
+
+def brute_force(records, query):
+    terms = query.lower().split()
+    return {
+        name for name, rec in records.items()
+        if all(t in name.lower() or t in str(rec.get("notes") or "").lower() for t in terms)
+    }
+
+
+def test_incremental_updates_match_a_rebuild():
+    rnd = random.Random(0)
+    records = {}
+    index = CatalogSearchIndex()
+    for i in range(300):
+        name = f"{rnd.choice(['Sony', 'Basler', 'FLIR'])} IMX{rnd.randint(100, 999)}-{i}"
+        records[name] = {"notes": rnd.choice(["global", "rolling", "", "NIR"])}
+        index.add(name, records[name])
+    for name in rnd.sample(sorted(records), 50):
+        del records[name]
+        index.remove(name)
+    name = next(iter(records))
+    records[name] = {"notes": "modified"}
+    index.add(name, records[name])
+
+    rebuilt = CatalogSearchIndex(records)
+    assert len(index) == len(records)
+    for query in ["sony", "imx5", "-1", "glob", "modified", "basler imx", "nir flir"]:
+        found = index.search(query, limit=len(records))
+        assert found == rebuilt.search(query, limit=len(records))
+        assert set(found) == brute_force(records, query)
+
+
+def test_keystroke_cost_independent_of_catalog_size():
+    records = {f"Vendor{i % 50} IMX{i:05d} model {i}": {"notes": "global shutter"} for i in range(20000)}
+    index = CatalogSearchIndex(records)
+    start = time.perf_counter()
+    queries = ["i", "im", "imx", "imx1", "imx12", "imx123", "123", "vendor4", "model 9"]
+    for query in queries:
+        assert index.search(query)
+    # generous bound (CI machines): ~ms per keystroke
+    assert (time.perf_counter() - start) / len(queries) < 0.01
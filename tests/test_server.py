@@ -0,0 +1,221 @@
+import asyncio
+import json
+import random
+import threading
+import time
+import urllib.request
+
+import pytest
+
+from services.database_manager import DatabaseManager
+from services.server import ConfiguratorService, HttpError, MicroBatcher, _read_request, serve
+from services.solver import evaluate
+
+CAMERAS = [
+    {"name": "Sony IMX264", "resolution_x": 2448, "resolution_y": 2048, "pixel_size_um": 3.45, "mount": "C"},
+    {"name": "cam", "resolution_x": 2000, "resolution_y": 1000, "pixel_size_um": 3.0},
+]
+OBJECTIVES = [
+    {"name": "lens", "focal_length": 12, "mount": "C", "max_image_circle": 16},
+    {"name": "small", "focal_length": 8, "mount": "C", "max_image_circle": 4},
+]
+
+
+@pytest.fixture
+def service(tmp_path):
+    camera_file = tmp_path / "cameras.json"
+    objective_file = tmp_path / "objectives.json"
+    camera_file.write_text(json.dumps({"cameras": CAMERAS}))
+    objective_file.write_text(json.dumps({"objectives": OBJECTIVES}))
+    return ConfiguratorService(DatabaseManager(camera_file, objective_file))
+
+
+def request(service, method, target, body=None):
+    data = b"" if body is None else json.dumps(body).encode()
+    status, payload = asyncio.run(service.handle(method, target, data))
+    return status, json.loads(payload)
+
+
+def test_solve_matches_scalar_evaluate(service):
+    rnd = random.Random(0)
+    stations = []
+    for _ in range(200):
+        given = rnd.sample(["wd", "focal", "fov"], rnd.choice([2, 3]))
+        station = {key: rnd.choice([0, -5, rnd.uniform(1, 500)]) for key in given}
+        station["camera"] = rnd.choice(["cam", "Sony IMX264"])
+        if rnd.random() < 0.5:
+            station.update(speed_m_s=rnd.uniform(0, 3), exposure_time_s=rnd.choice([0, 1e-3]))
+        stations.append(station)
+    stations.append({"camera": "cam", "wd": 100})
+    stations.append({"camera": "nope", "wd": 100, "fov": 10})
+
+    status, results = request(service, "POST", "/solve", {"stations": stations})
+    assert status == 200
+    cameras = {cam["name"]: cam for cam in CAMERAS}
+    for station, result in zip(stations, results):
+        try:
+            args = {key: value for key, value in station.items() if key != "camera"}
+            expected = evaluate(cameras[station["camera"]], **args)
+        except (ValueError, KeyError, ZeroDivisionError):
+            assert "error" in result
+            continue
+        assert result == json.loads(json.dumps(expected))
+    # one vectorized pass for the whole request
+    assert service.batcher.batches == 1
+
+
+def test_solve_with_lens_and_errors(service):
+    status, result = request(service, "POST", "/solve", {"camera": "cam", "lens": "lens", "wd": 400})
+    assert status == 200
+    assert (result["fov"], result["px_per_mm"], result["objective"]) == (200.0, 10.0, "lens")
+    assert request(service, "POST", "/solve", {"camera": "cam", "wd": 400})[0] == 400
+    assert request(service, "GET", "/solve")[0] == 405
+    assert request(service, "GET", "/nothing")[0] == 404
+
+
+def test_evaluate_from_fov(service):
+    status, result = request(service, "POST", "/evaluate", {
+        "camera": "cam", "fov": 200, "speed_m_s": 1, "exposure_time_s": 0.001,
+    })
+    assert status == 200
+    assert result == {"fov": 200.0, "px_per_mm": 10.0, "min_defect_mm": 0.3,
+                      "blur_object_mm": 1.0, "blur_sensor_um": 30.0, "blur_px": 10.0}
+    _, result = request(service, "POST", "/evaluate", {"resolution_x": 1000, "pixel_size_um": 5, "fov": 0})
+    assert result == {"fov": 0.0, "px_per_mm": None, "min_defect_mm": None}
+
+
+def test_catalog_lookup(service):
+    assert request(service, "GET", "/cameras?q=imx")[1] == {"names": ["Sony IMX264"]}
+    assert request(service, "GET", "/cameras/Sony%20IMX264")[1]["resolution_x"] == 2448
+    assert request(service, "GET", "/objectives/missing")[0] == 404
+    # IMX264 diagonal ~ 11 mm: "small" (4 mm circle) is excluded
+    assert request(service, "GET", "/objectives?compatible_with=Sony%20IMX264")[1] == {"names": ["lens"]}
+
+
+def test_identical_requests_are_cached_until_the_catalog_changes(service):
+    body = {"camera": "cam", "focal": 12, "wd": 400}
+    first = request(service, "POST", "/solve", body)
+    assert request(service, "POST", "/solve", body) == first
+    assert service.hits == 1 and service.batcher.batches == 1
+
+    service.db.append_camera({"name": "cam", "resolution_x": 4000, "resolution_y": 2000, "pixel_size_um": 1.5})
+    assert service.refresh()
+    assert request(service, "POST", "/solve", body)[1]["px_per_mm"] == 20.0
+
+
+def test_micro_batcher_groups_concurrent_submits():
+    calls = []
+
+    def double(items):
+        calls.append(list(items))
+        return [ValueError("odd") if x % 2 else 2 * x for x in items]
+
+    async def main():
+        batcher = MicroBatcher(double, max_batch=4, max_delay=0.01)
+        return await asyncio.gather(*(batcher.submit(x) for x in range(6)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert calls == [[0, 1, 2, 3], [4, 5]]
+    assert results[0] == 0 and results[4] == 8 and isinstance(results[5], ValueError)
+
+
+def test_http_roundtrip_and_throughput(service):
+    started = threading.Event()
+    state = {}
+
+    def ready(server):
+        state["port"] = server.sockets[0].getsockname()[1]
+        started.set()
+
+    def run():
+        loop = asyncio.new_event_loop()
+        state["loop"] = loop
+        state["task"] = loop.create_task(serve(service, port=0, refresh_interval=0, ready=ready))
+        try:
+            loop.run_until_complete(state["task"])
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert started.wait(5)
+    url = f"http://127.0.0.1:{state['port']}"
+    try:
+        req = urllib.request.Request(url + "/solve", data=json.dumps({"camera": "cam", "focal": 12, "wd": 400}).encode(),
+                                     method="POST")
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            assert json.loads(resp.read())["fov"] == 200.0
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(url + "/cameras/missing", timeout=5)
+        assert err.value.code == 404
+
+        # many clients over keep-alive connections, distinct (uncached) requests
+        async def clients(n_clients=20, per_client=50):
+            async def client(c):
+                reader, writer = await asyncio.open_connection("127.0.0.1", state["port"])
+                for i in range(per_client):
+                    body = json.dumps({"camera": "cam", "focal": 12, "wd": 1 + c * per_client + i}).encode()
+                    writer.write(b"POST /solve HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+                    await writer.drain()
+                    headers = await reader.readuntil(b"\r\n\r\n")
+                    length = int(headers.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+                    assert json.loads(await reader.readexactly(length))["wd"] == 1 + c * per_client + i
+                writer.close()
+            start = time.perf_counter()
+            await asyncio.gather(*(client(c) for c in range(n_clients)))
+            return n_clients * per_client / (time.perf_counter() - start)
+
+        rate = asyncio.run(clients())
+        assert rate > 300  # generous bound for slow CI machines (thousands/s locally)
+        # concurrent requests shared vectorized passes
+        assert service.batcher.batches < 1000
+    finally:
+        state["loop"].call_soon_threadsafe(state["task"].cancel)
+        thread.join(5)
+
+
+def test_invalid_content_length_is_a_400():
+    async def read(raw):
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await _read_request(reader)
+
+    for value in (b"abc", b"-5"):
+        with pytest.raises(HttpError) as err:
+            asyncio.run(read(b"POST /solve HTTP/1.1\r\nContent-Length: " + value + b"\r\n\r\n"))
+        assert err.value.status == 400
+
+
+def test_refresh_errors_do_not_stop_the_refresh_loop(service, monkeypatch, capsys):
+    calls = []
+    refresh = service.refresh
+
+    def flaky():
+        calls.append(True)
+        if len(calls) <= 3:
+            raise OSError("share unavailable")
+        return refresh()
+
+    monkeypatch.setattr(service, "refresh", flaky)
+
+    async def run():
+        task = asyncio.create_task(serve(service, port=0, refresh_interval=0.01))
+        states = {}
+        deadline = time.perf_counter() + 5
+        while len(calls) < 5 and time.perf_counter() < deadline:
+            await asyncio.sleep(0.005)
+            # state seen after each failed attempt, and after the first good one
+            states.setdefault(min(len(calls), 4), service.stats()["refresh_error"])
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return states
+
+    states = asyncio.run(run())
+    assert len(calls) >= 5
+    failing = {states[n] for n in (1, 2, 3) if n in states}
+    assert failing == {"OSError: share unavailable"}
+    assert states[4] is None
+    # logged once, not on every failed attempt
+    assert capsys.readouterr().err.count("catalog refresh failed") == 1
@@ -0,0 +1,77 @@
+import itertools
+import math
+
+import pytest
+
+from services.dataflow import resolve
+from services.solver import CachedSolver, SensorGeometryTable, evaluate, solve, sensor_geometry
+
+CAMERAS = {
+    "A": {"name": "A", "resolution_x": 2000, "resolution_y": 1500, "pixel_size_um": 3.0},
+    "B": {"name": "B", "resolution_x": 4000, "resolution_y": 3000, "pixel_size_um": 2.0},
+}
+LOCKS = {"wd": True, "focal": True, "fov": False}
+
+
+def test_geometry_is_precomputed():
+    sensors = SensorGeometryTable(CAMERAS)
+    geo = sensors.sensor_geometry("A")
+    assert geo == sensor_geometry(CAMERAS["A"])
+    assert (geo.width_mm, geo.height_mm) == (6.0, 4.5)
+    assert math.isclose(geo.diagonal_mm, 7.5)
+
+
+def test_solve_matches_dataflow():
+    values = (None, 0.0, 5.0, 400.0, 12.0)
+    for wd, focal, fov in itertools.product(values, repeat=3):
+        for locked in itertools.product((False, True), repeat=3):
+            locks = dict(zip(("wd", "focal", "fov"), locked))
+            params = {"wd": wd, "focal": focal, "fov": fov}
+            try:
+                expected = resolve({"sensor_width_mm": 6.0, **params}, locks)
+            except ValueError:
+                with pytest.raises(ValueError):
+                    solve(params, locks, 6.0)
+                continue
+            assert solve(params, locks, 6.0) == {key: expected[key] for key in params}
+
+
+def test_updated_camera_geometry():
+    cameras = {name: dict(cam) for name, cam in CAMERAS.items()}
+    sensors = SensorGeometryTable(cameras)
+    cameras["A"]["pixel_size_um"] = 6.0
+    sensors.update_cameras(cameras, ["A"])
+    assert sensors.sensor_geometry("A").width_mm == 12.0
+    sensors.remove_cameras(["B"])
+    assert "B" not in sensors.geometry
+
+
+def test_cached_results_match_solve_and_count_hits():
+    solver = CachedSolver(CAMERAS, maxsize=8)
+    params = {"wd": 400.0, "focal": 12.0, "fov": 0.0}
+    first = solver.solve("A", params, LOCKS)
+    assert first == solve(params, LOCKS, 6.0)
+    first["fov"] = None  # the caller's copy, not the cached entry
+    assert solver.solve("A", params, LOCKS) == solve(params, LOCKS, 6.0)
+    info = solver.cache_info()
+    assert (info["hits"], info["misses"], info["size"], info["maxsize"]) == (1, 1, 1, 8)
+    solver.cache_clear()
+    assert solver.cache_info()["size"] == 0
+
+
+def test_updated_camera_is_not_served_stale():
+    cameras = {name: dict(cam) for name, cam in CAMERAS.items()}
+    solver = CachedSolver(cameras)
+    params = {"wd": 400.0, "focal": 12.0, "fov": None}
+    assert solver.solve("A", params, LOCKS)["fov"] == 200.0
+    cameras["A"]["pixel_size_um"] = 6.0
+    solver.update_cameras(cameras, ["A"])
+    assert solver.solve("A", params, LOCKS)["fov"] == 400.0
+
+
+def test_evaluate_through_the_cache():
+    solver = CachedSolver(CAMERAS)
+    for _ in range(2):
+        result = evaluate(CAMERAS["B"], wd=300, fov=100, speed_m_s=1.0, exposure_time_s=0.001, solver=solver)
+        assert result == evaluate(CAMERAS["B"], wd=300, fov=100, speed_m_s=1.0, exposure_time_s=0.001)
+    assert solver.cache_info()["hits"] == 1
@@ -0,0 +1,48 @@
+import json
+
+from services.sqlite_store import SQLiteDatabaseManager, migrate_from_json
+
+
+def write_catalog(tmp_path):
+    cameras = [
+        {"name": "A", "resolution_x": 2448, "resolution_y": 2048, "pixel_size_um": 3.45, "shutter": "global"},
+        {"name": "B", "resolution_x": 4096, "resolution_y": 2992, "pixel_size_um": 2.74, "shutter": "global"},
+        {"name": "C", "resolution_x": 1440, "resolution_y": 1080, "pixel_size_um": 3.45, "shutter": "Global"},
+    ]
+    objectives = [
+        {"name": "16mm", "focal_length": 16, "mount": "C", "max_image_circle": 11, "aperture": 2.8},
+        {"name": "50mm", "focal_length": 50, "mount": "C", "max_image_circle": 11, "aperture": 1.8},
+        {"name": "LM12CX", "focal_length": 12.0, "mount": "c", "max_image_cirle": 1.0, "aperture": "22"},
+    ]
+    camera_file = tmp_path / "cameras.json"
+    objective_file = tmp_path / "objectives.json"
+    camera_file.write_text(json.dumps({"cameras": cameras}))
+    objective_file.write_text(json.dumps({"objectives": objectives}))
+    return camera_file, objective_file
+
+
+def test_migration_round_trip(tmp_path):
+    camera_file, objective_file = write_catalog(tmp_path)
+    store = migrate_from_json(tmp_path / "catalog.sqlite3", camera_file, objective_file)
+    assert list(store.load_cameras()) == ["A", "B", "C"]
+    # records are normalized by DatabaseManager on the way in
+    assert store.load_objectives()["LM12CX"]["aperture"] == 22.0
+    assert store.load_objectives()["LM12CX"]["max_image_circle"] == 1.0
+
+
+def test_range_queries(tmp_path):
+    camera_file, objective_file = write_catalog(tmp_path)
+    store = migrate_from_json(tmp_path / "catalog.sqlite3", camera_file, objective_file)
+    assert list(store.query_cameras(pixel_size_um=(None, 3.0))) == ["B"]
+    assert sorted(store.query_cameras(resolution_x=(2000, None))) == ["A", "B"]
+    assert sorted(store.query_objectives(focal_length=(12, 25))) == ["16mm", "LM12CX"]
+    assert sorted(store.query_objectives(mount="C")) == ["16mm", "50mm", "LM12CX"]
+
+
+def test_save_replaces_content(tmp_path):
+    store = SQLiteDatabaseManager(tmp_path / "catalog.sqlite3")
+    store.save_cameras({"X": {"name": "X", "resolution_x": 640, "resolution_y": 480, "pixel_size_um": 5.6}})
+    store.add_camera({"name": "Y", "resolution_x": 1280, "resolution_y": 1024, "pixel_size_um": 4.8})
+    assert list(store.load_cameras()) == ["X", "Y"]
+    store.save_cameras({})
+    assert store.load_cameras() == {}
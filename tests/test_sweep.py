@@ -0,0 +1,51 @@
+import numpy as np
+
+from services.optics_calculations import compute_motion_blur
+from services.solver import evaluate
+from services.sweep import sweep_grid, feasible, refine_boundary
+
+CAMERA = {"name": "A", "resolution_x": 2448, "resolution_y": 2048, "pixel_size_um": 3.45}
+
+
+def test_grid_matches_scalar_evaluate():
+    wd = np.linspace(100, 1000, 7)
+    focal = np.array([8.0, 12.0, 16.0, 25.0, 50.0])
+    grid = sweep_grid(CAMERA, wd, focal)
+    assert grid["fov"].shape == (7, 5)
+    for i in (0, 3, 6):
+        for j in (0, 2, 4):
+            ref = evaluate(CAMERA, wd=wd[i], focal=focal[j])
+            assert grid["fov"][i, j] == ref["fov"]
+            assert grid["px_per_mm"][i, j] == ref["px_per_mm"]
+            assert grid["min_defect_mm"][i, j] == ref["min_defect_mm"]
+
+
+def test_speed_exposure_axes():
+    grid = sweep_grid(CAMERA, [200, 400], [12, 16, 25], speed_m_s=[0.5, 2.0], exposure_time_s=[1e-4, 1e-3, 5e-3])
+    assert grid["blur_px"].shape == (2, 3, 2, 3)
+    expected = compute_motion_blur(2.0, 1e-3, grid["px_per_mm"][1, 2], 3.45)
+    assert grid["blur_px"][1, 2, 1, 1] == expected[2]
+    mask = feasible(grid, max_defect_mm=0.5, max_blur_px=1.0)
+    assert mask.shape == grid["blur_px"].shape
+    assert mask.any() and not mask.all()
+
+
+def test_zero_denominators_are_nan():
+    grid = sweep_grid(CAMERA, [0.0, 100.0], [0.0, 16.0])
+    assert np.isnan(grid["fov"][:, 0]).all()
+    assert np.isnan(grid["px_per_mm"][0]).all()
+    assert not feasible(grid)[0].any()
+
+
+def test_refinement_concentrates_on_the_boundary():
+    result = refine_boundary(CAMERA, (50, 1000), (4, 100), max_defect_mm=0.2, coarse=(16, 16), levels=3)
+    assert result["level"].max() == 3
+    assert len(result["boundary_wd"]) > 0
+    # les centres des cellules frontière sont sur la contrainte défaut = 0.2 mm
+    defects = [
+        evaluate(CAMERA, wd=w, focal=f)["min_defect_mm"]
+        for w, f in zip(result["boundary_wd"], result["boundary_focal"])
+    ]
+    assert np.allclose(defects, 0.2, rtol=0.02)
+    # bien moins de points que la grille uniforme de même résolution
+    assert len(result["wd"]) < (16 * 4 ** 3) ** 2 / 50
@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+QtCore = pytest.importorskip("PyQt6.QtCore")
+
+from ui.workers import LatestOnlyRunner
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def test_rapid_requests_are_coalesced(app):
+    runner = LatestOnlyRunner(delay_ms=1000)
+    calls, results = [], []
+    runner.result_ready.connect(results.append)
+    for i in range(5):
+        runner.request(lambda i=i: calls.append(i) or i * 10)
+    runner.wait(5000)
+    assert calls == [4]
+    assert results == [40]
+
+
+def test_stale_in_flight_result_is_dropped(app):
+    runner = LatestOnlyRunner(delay_ms=0)
+    started, release = threading.Event(), threading.Event()
+    results = []
+    runner.result_ready.connect(results.append)
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "stale"
+
+    runner.request(slow)
+    runner.flush()
+    assert started.wait(5)
+    runner.request(lambda: "latest")  # newer request while the first one runs
+    release.set()
+    runner.wait(5000)
+    assert results == ["latest"]
+
+
+def test_errors_are_reported(app):
+    runner = LatestOnlyRunner(delay_ms=0)
+    errors = []
+    runner.error.connect(errors.append)
+    runner.request(lambda: 1 / 0)
+    runner.wait(5000)
+    assert len(errors) == 1 and isinstance(errors[0], ZeroDivisionError)
+
+
+def test_cancel_drops_pending_request(app):
+    runner = LatestOnlyRunner(delay_ms=1000)
+    results = []
+    runner.result_ready.connect(results.append)
+    runner.request(lambda: 1)
+    runner.cancel()
+    runner.wait(5000)
+    assert results == []
+
+
+def test_every_dispatched_job_is_released(app):
+    runner = LatestOnlyRunner(delay_ms=0)
+    started, release = threading.Event(), threading.Event()
+    results = []
+    runner.result_ready.connect(results.append)
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "first"
+
+    runner.request(slow)
+    runner.flush()
+    assert started.wait(5)
+    # dispatched while the pool is busy, superseded before they start
+    for i in range(20):
+        runner.request(lambda i=i: i)
+        runner.flush()
+    release.set()
+    runner.wait(5000)
+    QtCore.QCoreApplication.processEvents()
+    assert results == [19]
+    assert runner.jobs == set()
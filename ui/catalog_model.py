@@ -0,0 +1,123 @@
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+
+class CatalogListModel(QAbstractListModel):
+    """
+    Catalog names for the selectors, exposed lazily: the view only sees the
+    rows fetched so far (canFetchMore / fetchMore, `batch` rows at a time),
+    so opening the window or resetting the list does no per-entry widget
+    work. Inserts and removals emit row signals instead of a reset.
+    """
+
+    def __init__(self, names=(), parent=None, batch=256):
+        super().__init__(parent)
+        self.batch = batch
+        self._names = list(names)
+        self._rows = None     # name → row, built on first lookup
+        self._fetched = min(batch, len(self._names))
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return self.row(name, fetch=False) >= 0
+
+    @property
+    def names(self):
+        return list(self._names)
+
+    # --- QAbstractListModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._fetched
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._fetched:
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self._names[index.row()]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._fetched < len(self._names)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        self._fetch_to(min(len(self._names), self._fetched + self.batch))
+
+    # --- catalogue ---
+
+    def set_names(self, names):
+        self.beginResetModel()
+        self._names = list(names)
+        self._rows = None
+        self._fetched = 0
+        self.endResetModel()
+        # the first batch, so that the view is not empty before it scrolls
+        self.fetchMore()
+
+    def append(self, names):
+        names = [name for name in names if name not in self]
+        if not names:
+            return
+        start = len(self._names)
+        fully_fetched = self._fetched == start
+        if fully_fetched:
+            self.beginInsertRows(QModelIndex(), start, start + len(names) - 1)
+        self._names.extend(names)
+        if self._rows is not None:
+            self._rows.update((name, start + i) for i, name in enumerate(names))
+        if fully_fetched:
+            self._fetched = len(self._names)
+            self.endInsertRows()
+        # otherwise the new rows sit in the unfetched tail
+
+    def remove(self, names):
+        removed = set(names)
+        if not removed:
+            return
+        # one pass over the list, whatever the number of names removed
+        kept, rows = [], []
+        for row, name in enumerate(self._names):
+            if name in removed:
+                rows.append(row)
+            else:
+                kept.append(name)
+        if not rows:
+            return
+        visible = [row for row in rows if row < self._fetched]
+        # one contiguous block of visible rows: a row signal, otherwise a single reset
+        contiguous = not visible or visible[-1] - visible[0] + 1 == len(visible)
+        if visible:
+            if contiguous:
+                self.beginRemoveRows(QModelIndex(), visible[0], visible[-1])
+            else:
+                self.beginResetModel()
+        self._names = kept
+        self._rows = None
+        self._fetched -= len(visible)
+        if visible:
+            if contiguous:
+                self.endRemoveRows()
+            else:
+                self.endResetModel()
+
+    def row(self, name, fetch=True):
+        """
+        Row of `name` (-1 if absent); fetch=True makes the row visible to the
+        view first (setCurrentIndex on an unfetched row would be ignored).
+        """
+        if self._rows is None:
+            self._rows = {n: i for i, n in enumerate(self._names)}
+        row = self._rows.get(name, -1)
+        if fetch and row >= self._fetched:
+            self._fetch_to(row + 1)
+        return row
+
+    def _fetch_to(self, count):
+        if count <= self._fetched:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, count - 1)
+        self._fetched = count
+        self.endInsertRows()
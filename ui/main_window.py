@@ -1,29 +1,137 @@
-from os import name,execl
+import threading
+
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QFormLayout,
     QLineEdit, QCheckBox, QLabel, QComboBox, QMessageBox,
     QDialog, QPushButton, QTabWidget, QHBoxLayout, 
 )
-from PyQt6.QtCore import Qt, QTimer
+from pathlib import Path
+
+from PyQt6.QtCore import Qt, QTimer, QFileSystemWatcher, QSignalBlocker, pyqtSignal
 from PyQt6.QtGui import QPixmap
 
-from services.database_manager import DatabaseManager
-from services.solver import solve
-from services.optics_calculations import (
-    compute_px_per_mm,
-    compute_min_detectable_defect,
-    compute_fov,
-    compute_distance,
-    compute_focal,
-    compute_motion_blur
-)
-from pathlib import Path
-import json
-import sys
+from services.database_manager import DATA_DIR, DatabaseManager, apply_changes
+from services.instrumentation import span, timed
+from services.solver import CachedSolver
+from services.dataflow import Dataflow
+from services.search_index import CatalogSearchIndex
+from ui.catalog_model import CatalogListModel
+from ui.search_completer import IndexCompleter
+from ui.workers import LatestOnlyRunner
+
+STYLESHEET = """
+    QWidget {
+        background-color: #000000;
+        color: white;
+        font-size: 14px;
+    }
+    QLineEdit, QComboBox, QPushButton {
+        background-color: #111111;
+        color: white;
+        border: 1px solid #444;
+        padding: 4px;
+    }
+    QTabWidget::pane {
+        border: 1px solid #333;
+    }
+    QTabBar::tab {
+        background: #111111;
+        padding: 8px;
+    }
+    QTabBar::tab:selected {
+        background: #222222;
+    }
+"""
+
+LOGO_FILE = Path(__file__).resolve().parent.parent / "logo.jpeg"
+LOGO_HEIGHT = 60
+
+# Motion Blur tab defaults, also used while the tab has not been built
+DEFAULT_SPEED = "1.0"
+DEFAULT_EXPOSURE = "0.001"
+
+
+def load_logo(height=LOGO_HEIGHT, source=LOGO_FILE):
+    """
+    Header logo scaled to `height`. Decoding and smooth-scaling the full-size
+    JPEG is done once: the result is kept as a small PNG in the data folder
+    and re-made only when the source is newer.
+    """
+    cached = DATA_DIR / f"logo_{height}.png"
+    try:
+        if cached.stat().st_mtime_ns >= source.stat().st_mtime_ns:
+            pixmap = QPixmap(str(cached))
+            if not pixmap.isNull():
+                return pixmap
+    except OSError:
+        pass
+    pixmap = QPixmap(str(source))
+    if pixmap.isNull():
+        return pixmap
+    pixmap = pixmap.scaledToHeight(height, Qt.TransformationMode.SmoothTransformation)
+    pixmap.save(str(cached), "PNG")  # best effort: read-only install → scaled again next time
+    return pixmap
+
+
+def load_catalog_state(db):
+    """
+    Everything the window derives from the catalog files (runs in a worker
+    thread at startup): records, sensor geometry, compatibility and search
+    indexes. Only plain Python objects, handed over to the GUI thread.
+    """
+    # NumPy is only needed from here on: not on the path to the first paint
+    from services.compatibility import CompatibilityIndex
+
+    with span("startup.load_catalog"):
+        cameras = db.load_cameras()
+        objectives = db.load_objectives()
+        # sensor geometry computed once per camera, memoized wd / focal / fov solves
+        solver = CachedSolver(cameras)
+        # camera × lens compatibility (image circle, mount), built from the memory-mapped
+        # columnar catalogs (JSON fallback) and kept up to date on reload
+        compat = CompatibilityIndex(db.load_camera_catalog(), db.load_objective_catalog())
+    with span("startup.search_index"):
+        # type-ahead on names + notes, updated per insert on reload
+        camera_search = CatalogSearchIndex(cameras)
+        objective_search = CatalogSearchIndex(objectives, fields=("notes", "mount"))
+    return {
+        "cameras": cameras, "objectives": objectives, "solver": solver, "compat": compat,
+        "camera_search": camera_search, "objective_search": objective_search,
+    }
+
+
+def compute_state(flow, lock, values, locks, solver=None, camera_name=None):
+    """
+    Pure computation behind the optics + motion blur tabs (runs in a worker
+    thread): wd / focal / fov come from the solver's LRU cache, the dataflow
+    engine only recomputes the outputs the new values affect.
+    """
+    if solver is not None:
+        values = {**values, **solver.solve(camera_name, values, locks)}
+        # already solved: the flow takes the three of them as given
+        locks = {key: values[key] is not None for key in ("wd", "focal", "fov")}
+    with lock:
+        flow.update(values)
+        flow.set_locks(locks)
+        flow.solve()
+        return dict(flow.values)
+
+
+def set_text(widget, text):
+    # untouched widgets are not repainted
+    if widget.text() != text:
+        widget.setText(text)
+
+
+def read_float(edit, empty=None):
+    text = edit.text().strip()
+    if not text:
+        return empty
+    try:
+        return float(text)
+    except ValueError:
+        return None
 
-DATA_DIR = Path(__file__).parent.parent / "data"
-CAMERA_FILE = DATA_DIR / "cameras.json"
-OBJECTIVE_FILE = DATA_DIR / "objectives.json"
 
 class AddCameraDialog(QDialog):
     def __init__(self, parent=None):
@@ -37,6 +145,7 @@ class AddCameraDialog(QDialog):
         self.res_y_input = QLineEdit()
         self.pixel_input = QLineEdit()
         self.shutter_input = QLineEdit()
+        self.mount_input = QLineEdit()
         self.notes_input = QLineEdit()
 
         self.layout.addRow("Name:", self.name_input)
@@ -44,6 +153,7 @@ class AddCameraDialog(QDialog):
         self.layout.addRow("Resolution Y:", self.res_y_input)
         self.layout.addRow("Pixel size (µm):", self.pixel_input)
         self.layout.addRow("Shutter type:", self.shutter_input)
+        self.layout.addRow("Mount (optional):", self.mount_input)
         self.layout.addRow("Notes:", self.notes_input)
 
         self.ok_button = QPushButton("OK")
@@ -63,20 +173,13 @@ class AddCameraDialog(QDialog):
         except ValueError:
             QMessageBox.warning(self, "Error", "Vérifie les valeurs numériques")
             return
+        if self.mount_input.text().strip():
+            cam["mount"] = self.mount_input.text().strip()
 
-        try:
-            with open(CAMERA_FILE, "r") as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            data = {"cameras": []}
-
-        data["cameras"].append(cam)
-        with open(CAMERA_FILE, "w") as f:
-            json.dump(data, f, indent=4)
+        self.parent().db.append_camera(cam)
 
         QMessageBox.information(self, "Success", f"Caméra '{cam['name']}' ajoutée !")
         self.accept()
-        QTimer.singleShot(500, self.parent().reset)
 
 class AddLensDialog(QDialog):
     def __init__(self, parent=None):
@@ -110,7 +213,7 @@ class AddLensDialog(QDialog):
                 "name": self.name_input.text(),
                 "focal_length": float(self.focal_input.text()),
                 "mount": self.mount_input.text(),
-                "max_image_cirle": float(self.max_image_circle_input.text()),
+                "max_image_circle": float(self.max_image_circle_input.text()),
                 "aperture": self.aperture_input.text()
 
             }
@@ -118,15 +221,7 @@ class AddLensDialog(QDialog):
             QMessageBox.warning(self, "Error", "Vérifie les valeurs numériques")
             return
 
-        try:
-            with open(OBJECTIVE_FILE, "r") as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            data = {"objectives": []}
-
-        data["objectives"].append(lens)
-        with open(OBJECTIVE_FILE, "w") as f:
-            json.dump(data, f, indent=4)
+        self.parent().db.append_objective(lens)
 
         QMessageBox.information(self, "Success", f"Objectif '{lens['name']}' ajoutée !")
         self.accept()
@@ -134,20 +229,39 @@ class AddLensDialog(QDialog):
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # emitted once, when the deferred startup is over: catalog loaded and
+    # first camera shown (or the load failed and the error is displayed)
+    ready = pyqtSignal()
+
+    def __init__(self, watch_catalog=True):
         super().__init__()
         self.setWindowTitle("Optical Configurator - v0.3")
         self.setMinimumSize(800, 480)
 
-        # DB
+        # applied before any child exists: widgets are polished once, as they are created
+        with span("startup.stylesheet"):
+            self.setStyleSheet(STYLESHEET)
+
+        # DB: the catalog itself is read in the background after the first paint
+        # (finish_startup); empty until then
         self.db = DatabaseManager()
-        self.cameras = self.db.load_cameras()
-        self.objectives = self.db.load_objectives()
+        self.cameras = {}
+        self.objectives = {}
+        self.solver = CachedSolver()
+        self.compat = None
+        self.camera_search = CatalogSearchIndex()
+        self.objective_search = CatalogSearchIndex(fields=("notes", "mount"))
+        self.catalog_loaded = False
+        self.startup_scheduled = False
+        self.started = False
+        self.watch_catalog = watch_catalog
 
         # state
-        self.updating = False
         self.current_camera = None
+        self.current_camera_name = None
         self.current_objective = None
+        self.allowed_objectives = None  # None: no compatibility filter
+        self.last_state = None  # shown by the Motion Blur tab when it gets built
 
         # Header
         container = QWidget()
@@ -157,12 +271,13 @@ class MainWindow(QMainWindow):
         header = QWidget()
         header_layout = QHBoxLayout()
         header.setLayout(header_layout)
-        self.reset_btn = QPushButton("reset")
+        self.reset_btn = QPushButton("reload")
 
 
-        logo_label = QLabel()
-        logo_label.setPixmap(QPixmap("logo.jpeg").scaledToHeight(60, Qt.TransformationMode.SmoothTransformation))
-        header_layout.addWidget(logo_label)
+        # pixmap set after the first paint; the height is reserved so nothing moves
+        self.logo_label = QLabel()
+        self.logo_label.setMinimumHeight(LOGO_HEIGHT)
+        header_layout.addWidget(self.logo_label)
 
         title_label = QLabel("Optical Configurator")
         title_label.setStyleSheet("font-size: 24px; font-weight: bold; color: #F1C749 ; padding-left: 10px;")
@@ -193,10 +308,12 @@ class MainWindow(QMainWindow):
 
 
         #  Camera selector
+        # lazy models: rows are fetched as the popup scrolls, not up front
         self.camera_combo = QComboBox()
-        camera_names = list(self.cameras.keys())
-        self.camera_combo.addItems(camera_names)
+        self.camera_model = CatalogListModel(parent=self)
+        self.camera_combo.setModel(self.camera_model)
         self.camera_combo.currentTextChanged.connect(self.on_camera_selected)
+        self.camera_completer = IndexCompleter(self.camera_combo, self.camera_search)
         form.addRow(QLabel("Camera:"), self.camera_combo)
 
         self.add_camera_btn = QPushButton("Add Camera")
@@ -206,11 +323,20 @@ class MainWindow(QMainWindow):
         #  Objective selector
 
         self.objective_combo = QComboBox()
-        objective_names = list(self.objectives.keys())
-        self.objective_combo.addItems(objective_names)
+        self.objective_model = CatalogListModel(parent=self)
+        self.objective_combo.setModel(self.objective_model)
         self.objective_combo.currentTextChanged.connect(self.on_objective_selected)
+        self.objective_completer = IndexCompleter(
+            self.objective_combo, self.objective_search,
+            accept=lambda name: self.allowed_objectives is None or name in self.allowed_objectives,
+        )
         form.addRow(QLabel("Lens:"), self.objective_combo)
 
+        self.compatible_only_check = QCheckBox("compatible only")
+        self.compatible_only_check.setChecked(True)
+        self.compatible_only_check.toggled.connect(self.filter_objectives)
+        form.addRow("", self.compatible_only_check)
+
         self.add_lens_btn = QPushButton("Add Lens")
         form.addRow(" ", self.add_lens_btn)
 
@@ -264,20 +390,145 @@ class MainWindow(QMainWindow):
         self.add_lens_btn.clicked.connect(self.open_add_lens_dialog)
         self.reset_btn.clicked.connect(self.reset)
 
+        # nothing to select or add until the catalog is there
+        self.catalog_widgets = (
+            self.camera_combo, self.objective_combo, self.compatible_only_check,
+            self.add_camera_btn, self.add_lens_btn, self.reset_btn,
+        )
+        for widget in self.catalog_widgets:
+            widget.setEnabled(False)
+
+
+        # --------------------------
+        #   Tabs 2 and 3
+        # --------------------------
+        # empty pages until first shown (build_motion_blur_tab / build_tradeoff_tab)
+        self.tabs = tabs
+        self.tab_extra = None
+        self.tab_tradeoffs = None
+        self.lazy_tabs = {}
+        self.add_lazy_tab("Motion Blur", self.build_motion_blur_tab)
+        self.add_lazy_tab("Trade-offs", self.build_tradeoff_tab)
+        tabs.currentChanged.connect(self.on_tab_changed)
+
+        # --------------------------
+        #   Background computation
+        # --------------------------
+        # rapid edits are coalesced, computed off the event loop, and only
+        # the result of the latest request reaches the widgets
+        self.flow = Dataflow()
+        self.flow_lock = threading.Lock()
+        self.recalc = LatestOnlyRunner(self)
+        self.recalc.result_ready.connect(self.apply_state)
+        self.recalc.error.connect(self.on_recalc_error)
+
+        self.catalog_loader = LatestOnlyRunner(self, delay_ms=0)
+        self.catalog_loader.result_ready.connect(self.on_catalog_loaded)
+        self.catalog_loader.error.connect(self.on_catalog_error)
+
+        # --------------------------
+        #   Catalog hot reload
+        # --------------------------
+        # edits made by other stations show up without restarting
+        self.catalog_watcher = None
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(300)
+        self.reload_timer.timeout.connect(self.reload_catalog)
+        # the journal is read and diffed in a worker; one refresh at a time (each
+        # read moves the journal cursor: no result may be dropped)
+        self.catalog_refresher = LatestOnlyRunner(self, delay_ms=0)
+        self.catalog_refresher.result_ready.connect(self.apply_catalog_changes)
+        self.catalog_refresher.error.connect(self.on_catalog_refresh_error)
+        self.refresh_running = False
+        self.refresh_again = False
 
         # --------------------------
-        #   Tab 2 - Motion Blur
+        #   Starting 
         # --------------------------
+        # the constructor only builds what the first paint shows; the rest
+        # runs from the event loop once the window is on screen (showEvent)
+        self.statusBar().showMessage("Loading catalog…")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.startup_scheduled:
+            self.startup_scheduled = True
+            QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        with span("startup.logo"):
+            self.logo_label.setPixmap(load_logo())
+        db = self.db
+        self.catalog_loader.request(lambda: load_catalog_state(db))
+
+    @timed("ui.on_catalog_loaded")
+    def on_catalog_loaded(self, state):
+        self.cameras, self.objectives = state["cameras"], state["objectives"]
+        self.solver, self.compat = state["solver"], state["compat"]
+        self.camera_search = self.camera_completer.index = state["camera_search"]
+        self.objective_search = self.objective_completer.index = state["objective_search"]
+        with span("ui.populate_combos"):
+            for combo, model, records in (
+                (self.camera_combo, self.camera_model, self.cameras),
+                (self.objective_combo, self.objective_model, self.objectives),
+            ):
+                with QSignalBlocker(combo):
+                    model.set_names(records)
+                    combo.setCurrentIndex(0 if records else -1)
+        self.catalog_loaded = True
+        for widget in self.catalog_widgets:
+            widget.setEnabled(True)
+        self.statusBar().clearMessage()
+
+        if self.watch_catalog:
+            self.catalog_watcher = QFileSystemWatcher(self)
+            self.catalog_watcher.fileChanged.connect(self.on_catalog_file_changed)
+            self.catalog_watcher.directoryChanged.connect(self.on_catalog_file_changed)
+            self.watch_catalog_files()
+
+        if self.cameras:
+            self.on_camera_selected(self.camera_combo.currentText())
+        self.startup_finished()
+
+    def on_catalog_error(self, exc):
+        self.statusBar().showMessage(f"Catalog could not be loaded: {exc}")
+        # "reload" retries
+        self.reset_btn.setEnabled(True)
+        self.startup_finished()
+
+    def startup_finished(self):
+        if not self.started:
+            self.started = True
+            self.ready.emit()
+
+    # --------------------------
+    #   Deferred tabs
+    # --------------------------
+
+    def add_lazy_tab(self, title, build):
+        page = QWidget()
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        page.setLayout(layout)
+        self.lazy_tabs[self.tabs.addTab(page, title)] = build
+
+    def on_tab_changed(self, index):
+        build = self.lazy_tabs.pop(index, None)
+        if build is not None:
+            with span("ui.build_tab"):
+                self.tabs.widget(index).layout().addWidget(build())
+
+    def build_motion_blur_tab(self):
         self.tab_extra = QWidget()
-        tabs.addTab(self.tab_extra, "Motion Blur")
 
         blur_layout = QFormLayout()
         self.tab_extra.setLayout(blur_layout)
 
-        self.speed_edit = QLineEdit("1.0")
+        self.speed_edit = QLineEdit(DEFAULT_SPEED)
         blur_layout.addRow("Object speed (m/s):", self.speed_edit)
 
-        self.exposure_edit = QLineEdit("0.001")
+        self.exposure_edit = QLineEdit(DEFAULT_EXPOSURE)
         blur_layout.addRow("Exposure time (s):", self.exposure_edit)
 
         self.blur_object_label = QLabel("-")
@@ -292,37 +543,27 @@ class MainWindow(QMainWindow):
         self.speed_edit.editingFinished.connect(self.update_motion_blur)
         self.exposure_edit.editingFinished.connect(self.update_motion_blur)
 
-        # --------------------------
-        #   Starting 
-        # --------------------------
-        if camera_names:
-            self.camera_combo.setCurrentIndex(0)
-        
-        self.setStyleSheet("""
-    QWidget {
-        background-color: #000000;
-        color: white;
-        font-size: 14px;
-    }
-    QLineEdit, QComboBox, QPushButton {
-        background-color: #111111;
-        color: white;
-        border: 1px solid #444;
-        padding: 4px;
-    }
-    QTabWidget::pane {
-        border: 1px solid #333;
-    }
-    QTabBar::tab {
-        background: #111111;
-        padding: 8px;
-    }
-    QTabBar::tab:selected {
-        background: #222222;
-    }
-""")
+        # computed with the default speed / exposure since startup
+        if self.last_state is not None:
+            self.show_motion_blur(self.last_state)
+        return self.tab_extra
 
+    def build_tradeoff_tab(self):
+        # Pareto front of the whole catalog; a row sets camera, lens and WD
+        from ui.tradeoff_tab import TradeoffTab
 
+        self.tab_tradeoffs = TradeoffTab(self.tradeoff_context, self)
+        self.tab_tradeoffs.configuration_selected.connect(self.apply_configuration)
+        return self.tab_tradeoffs
+
+    def motion_inputs(self):
+        # (speed m/s, exposure s): the defaults until the Motion Blur tab exists
+        if self.tab_extra is None:
+            return float(DEFAULT_SPEED), float(DEFAULT_EXPOSURE)
+        return read_float(self.speed_edit), read_float(self.exposure_edit)
+
+
+    @timed("ui.on_camera_selected")
     def on_camera_selected(self, name):
         if not name:
             return
@@ -331,25 +572,28 @@ class MainWindow(QMainWindow):
             return
 
         self.current_camera = cam
+        self.current_camera_name = name
 
 
         px = cam.get("pixel_size_um")
         rx = cam.get("resolution_x")
         ry = cam.get("resolution_y")
-        # compute physical sensor size (mm) from px
-        self.sensor_width_mm = (px * rx) / 1000.
-        self.sensor_height_mm = (px * ry) / 1000.
+        # physical sensor size (mm), precomputed per catalog record
+        geometry = self.solver.sensor_geometry(name)
+        self.sensor_width_mm = geometry.width_mm
+        self.sensor_height_mm = geometry.height_mm
 
         # update fields
-        self.updating = True
         self.pixel_size_edit.setText(f"{px:.3f}")
         self.resolution_edit.setText(f"{rx} × {ry}")
         self.sensor_size_edit.setText(f"{self.sensor_width_mm:.3f} × {self.sensor_height_mm:.3f}")
-        self.updating = False
+
+        self.filter_objectives()
 
         # trigger recalcul (use current wd/focal/fov)
         self.recalculate_from_state()
 
+    @timed("ui.on_objective_selected")
     def on_objective_selected(self,name):
         if not name:
             return
@@ -360,140 +604,245 @@ class MainWindow(QMainWindow):
         self.current_objective = lens
         focal = lens.get("focal_length")
 
-        self.updating = True
         self.focal_edit.setText(f"{focal:.3f}")
-        self.focal_lock.setChecked(True)
+        with QSignalBlocker(self.focal_lock):
+            self.focal_lock.setChecked(True)
 
-        self.updating = False
         self.recalculate_from_state()
 
         return
 
 
+    def filter_objectives(self, checked=None):
+        if not self.catalog_loaded:
+            return
+        names = list(self.objectives)
+        self.allowed_objectives = None
+        if self.compatible_only_check.isChecked() and self.current_camera_name in self.compat.camera_rows:
+            self.allowed_objectives = set(self.compat.compatible_objectives(self.current_camera_name))
+            names = [name for name in names if name in self.allowed_objectives]
+
+        combo, model = self.objective_combo, self.objective_model
+        current = combo.currentText()
+        with QSignalBlocker(combo):
+            model.set_names(names)
+            combo.setCurrentIndex(max(model.row(current), 0) if names else -1)
+        # the selected lens was filtered out: switch to the first compatible one
+        if combo.currentText() and combo.currentText() != current:
+            self.on_objective_selected(combo.currentText())
+
     def open_add_camera_dialog(self):
         dialog = AddCameraDialog(self)
         if dialog.exec():
-            self.db.load_cameras()
-            self.reset()
+            self.reload_catalog()
     
     def open_add_lens_dialog(self):
         dialog = AddLensDialog(self)
         if dialog.exec():
-            self.load_material
+            self.reload_catalog()
 
 
+    @timed("ui.on_user_edit")
     def on_user_edit(self):
-        if self.updating:
-            return
         self.recalculate_from_state()
 
-    def on_lock_changed(self):
-        if self.updating:
-            return
+    @timed("ui.on_lock_changed")
+    def on_lock_changed(self, state=None):
         self.recalculate_from_state()
 
 
+    @timed("ui.recalculate_from_state")
     def recalculate_from_state(self):
         if self.current_camera is None:
             return
 
-        try:
-            wd = float(self.wd_edit.text())
-        except Exception:
-            wd = float(self.wd_edit.text() or 0.0)
-
-        try:
-            focal = float(self.focal_edit.text())
-        except Exception:
-            focal = float(self.focal_edit.text() or 0.0)
-
-        try:
-            fov = float(self.fov_edit.text())
-        except Exception:
-            fov = float(self.fov_edit.text() or 0.0)
-
-        params = {"wd": wd, "focal": focal, "fov": fov}
+        # snapshot the widgets on the GUI thread; the worker only sees plain values
+        values = {
+            "wd": read_float(self.wd_edit, empty=0.0),
+            "focal": read_float(self.focal_edit, empty=0.0),
+            "fov": read_float(self.fov_edit, empty=0.0),
+        }
+        if None in values.values():
+            return
         locks = {
             "wd": self.wd_lock.isChecked(),
             "focal": self.focal_lock.isChecked(),
             "fov": self.fov_lock.isChecked()
         }
+        values.update({
+            "sensor_width_mm": self.sensor_width_mm,
+            "resolution_x": self.current_camera["resolution_x"],
+            "pixel_size_um": self.current_camera["pixel_size_um"],
+            "required_pixels": 3,
+        })
+        values["speed_m_s"], values["exposure_time_s"] = self.motion_inputs()
+        # anything typed from now on is newer than this request
+        for edit in (self.wd_edit, self.focal_edit, self.fov_edit):
+            edit.setModified(False)
+
+        flow, lock, solver, name = self.flow, self.flow_lock, self.solver, self.current_camera_name
+        self.recalc.request(lambda: compute_state(flow, lock, values, locks, solver, name))
+
+    @timed("ui.update_motion_blur")
+    def update_motion_blur(self):
+        # blur depends on the solved fov: same background pass
+        self.recalculate_from_state()
 
-
-        solved = solve(params, locks,self.sensor_width_mm)
-        self.updating = True
-        self.wd_edit.setText(f"{solved['wd']:.3f}")
-        self.focal_edit.setText(f"{solved['focal']:.3f}")
-        self.fov_edit.setText(f"{solved['fov']:.3f}")
-        self.updating = False
-
-
-        px = self.current_camera["pixel_size_um"]
-        rx = self.current_camera["resolution_x"]
-        self.sensor_width_mm = (px * rx) / 1000.0
-
-        # assume fov in mm is horizontal FOV
-        fov_mm = solved["fov"]
-        if fov_mm <= 0.0:
-            self.px_per_mm_label.setText("N/A")
-            self.min_defect_label.setText("N/A")
+    @timed("ui.apply_state")
+    def apply_state(self, state):
+        # editingFinished is not emitted by setText: no re-entrancy guard needed;
+        # fields the user has started typing in again are left alone
+        for edit, key in ((self.wd_edit, "wd"), (self.focal_edit, "focal"), (self.fov_edit, "fov")):
+            if not edit.isModified() and state[key] is not None:
+                set_text(edit, f"{state[key]:.3f}")
+
+        px_per_mm, min_defect = state["px_per_mm"], state["min_defect_mm"]
+        set_text(self.px_per_mm_label, "N/A" if px_per_mm is None else f"{px_per_mm:.3f}")
+        set_text(self.min_defect_label, "N/A" if min_defect is None else f"{min_defect*1000:.1f} µm")
+
+        self.last_state = state
+        if self.tab_extra is not None:
+            self.show_motion_blur(state)
+
+    def show_motion_blur(self, state):
+        blur = (state["blur_object_mm"], state["blur_sensor_um"], state["blur_px"])
+        if None in blur:
+            blur_texts = ("-", "-", "-")
+        else:
+            blur_texts = (f"{blur[0]:.3f}", f"{blur[1]:.2f}", f"{blur[2]:.2f}")
+        for label, text in zip((self.blur_object_label, self.blur_sensor_label, self.blur_px_label), blur_texts):
+            set_text(label, text)
+
+    def tradeoff_context(self):
+        # the worker reads the catalog files itself (keyed by their content in the result cache),
+        # through its own manager: a read moves the journal cursor reload_catalog() relies on
+        speed, exposure = self.motion_inputs()
+        db = DatabaseManager(self.db.camera_file, self.db.objective_file)
+        return {"db": db, "speed_m_s": speed, "exposure_time_s": exposure}
+
+    def apply_configuration(self, config):
+        camera, objective = config["camera"], config["objective"]
+        if camera not in self.cameras or objective not in self.objectives:
             return
+        self.camera_combo.setCurrentIndex(self.camera_model.row(camera))
+        if objective not in self.objective_model:
+            # picked from an "all pairs" front: lift the compatibility filter
+            self.compatible_only_check.setChecked(False)
+        with QSignalBlocker(self.objective_combo):
+            self.objective_combo.setCurrentIndex(self.objective_model.row(objective))
+        self.current_objective = self.objectives[objective]
+        self.focal_edit.setText(f"{config['focal']:.3f}")
+        self.wd_edit.setText(f"{config['wd']:.3f}")
+        for check, locked in ((self.wd_lock, True), (self.focal_lock, True), (self.fov_lock, False)):
+            with QSignalBlocker(check):
+                check.setChecked(locked)
+        self.tabs.setCurrentWidget(self.tab_optics)
+        self.recalculate_from_state()
 
-        px_per_mm = compute_px_per_mm(rx, fov_mm)  # resolution_x per fov_mm
-        min_def = compute_min_detectable_defect(px_per_mm, required_pixels=3)
-
-        self.px_per_mm_label.setText(f"{px_per_mm:.3f}")
-        self.min_defect_label.setText(f"{min_def*1000:.1f} µm") 
-
-    def load_material(self):
-        self.db.load_cameras()
-        self.db.load_objectives()
-
-        
-
-    def update_motion_blur(self):
-        if self.current_camera is None:
-            return
+    def on_recalc_error(self, exc):
+        self.px_per_mm_label.setText("N/A")
+        self.min_defect_label.setText("N/A")
+        self.statusBar().showMessage(f"Calculation error: {exc}", 5000)
 
-        try:
-            speed = float(self.speed_edit.text())
-            exposure = float(self.exposure_edit.text())
-        except ValueError:
+    def reset(self):
+        self.reload_catalog()
+
+    # --------------------------
+    #   Catalog hot reload
+    # --------------------------
+
+    def watch_catalog_files(self):
+        # atomic rename (compaction) drops the watch on the old file: re-add every time
+        paths = [
+            self.db.camera_file, self.db.camera_journal.log_path,
+            self.db.objective_file, self.db.objective_journal.log_path,
+        ]
+        watched = set(self.catalog_watcher.files()) | set(self.catalog_watcher.directories())
+        missing = [str(p) for p in paths if p.exists() and str(p) not in watched]
+        directory = str(self.db.camera_file.parent)
+        if directory not in watched:
+            missing.append(directory)
+        if missing:
+            self.catalog_watcher.addPaths(missing)
+
+    def on_catalog_file_changed(self, path):
+        # a single insert touches several files: coalesce into one reload
+        self.reload_timer.start()
+
+    def reload_catalog(self):
+        if not self.catalog_loaded:
+            # first load failed or still running: load from scratch
+            db = self.db
+            self.catalog_loader.request(lambda: load_catalog_state(db))
             return
-
-        try:
-            fov_mm = float(self.fov_edit.text())
-        except ValueError:
+        if self.refresh_running:
+            # picked up as soon as the refresh in flight has been applied
+            self.refresh_again = True
             return
-
-        if fov_mm <= 0:
+        self.refresh_running = True
+        # the records are only read by the worker: the GUI thread changes them
+        # in apply_catalog_changes, once no refresh is running
+        db, cameras, objectives = self.db, self.cameras, self.objectives
+        self.catalog_refresher.request(lambda: (db.camera_changes(cameras), db.objective_changes(objectives)))
+
+    def on_catalog_refresh_error(self, exc):
+        self.refresh_running = False
+        self.statusBar().showMessage(f"Catalog reload failed: {exc}", 5000)
+        self.refresh_done()
+
+    def refresh_done(self):
+        if self.refresh_again:
+            self.refresh_again = False
+            self.reload_catalog()
+
+    @timed("ui.apply_catalog_changes")
+    def apply_catalog_changes(self, changes):
+        self.refresh_running = False
+        cam_changes = apply_changes(self.cameras, changes[0])
+        obj_changes = apply_changes(self.objectives, changes[1])
+        added, removed, changed = cam_changes
+        self.solver.remove_cameras(removed)
+        self.solver.update_cameras(self.cameras, added + changed)
+        for name in removed:
+            self.compat.remove_camera(name)
+        for name in added + changed:
+            self.compat.set_camera(self.cameras[name])
+        obj_added, obj_removed, obj_changed = obj_changes
+        for name in obj_removed:
+            self.compat.remove_objective(name)
+        for name in obj_added + obj_changed:
+            self.compat.set_objective(self.objectives[name])
+        for index, records, (new, gone, modified) in (
+            (self.camera_search, self.cameras, cam_changes),
+            (self.objective_search, self.objectives, obj_changes),
+        ):
+            for name in gone:
+                index.remove(name)
+            for name in new + modified:
+                index.add(name, records[name])
+
+        self.sync_combo(self.camera_combo, self.camera_model, self.cameras, cam_changes, self.on_camera_selected)
+        if obj_added or obj_removed or obj_changed:
+            current = self.objective_combo.currentText()
+            self.filter_objectives()
+            if current in obj_changed and self.objective_combo.currentText() == current:
+                self.on_objective_selected(current)
+        if self.catalog_watcher is not None:
+            self.watch_catalog_files()
+        self.refresh_done()
+
+    def sync_combo(self, combo, model, records, changes, on_selected):
+        added, removed, changed = changes
+        if not (added or removed or changed):
             return
-
-        rx = self.current_camera["resolution_x"]
-        px_size = self.current_camera["pixel_size_um"]
-
-        px_per_mm = compute_px_per_mm(rx, fov_mm)
-
-
-
-        blur_obj_mm, blur_sensor_um, blur_px = compute_motion_blur(
-            speed_m_s=speed,
-            exposure_time_s=exposure,
-            px_per_mm=px_per_mm,
-            pixel_size_um=px_size,
-        )
-
-        self.blur_object_label.setText(f"{blur_obj_mm:.3f}")
-        self.blur_sensor_label.setText(f"{blur_sensor_um:.2f}")
-        self.blur_px_label.setText(f"{blur_px:.2f}")
-    
-    def reset(self):
-        reply = QMessageBox.question(
-            self,
-            "Restart application",
-            "This will restart the application.\nContinue?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
-        if reply == QMessageBox.StandardButton.Yes:
-            python = sys.executable
-            execl(python, python, *sys.argv)
+        current = combo.currentText()
+        with QSignalBlocker(combo):
+            # row-level insert / remove signals: the view keeps its fetched rows
+            model.remove(removed)
+            model.append(added)
+            if current in records:
+                combo.setCurrentIndex(model.row(current))
+
+        # only re-run the calculation if the selected record is affected
+        if current not in records or current in changed or len(model) == len(added):
+            on_selected(combo.currentText())
@@ -0,0 +1,51 @@
+from PyQt6.QtCore import Qt, QStringListModel
+from PyQt6.QtWidgets import QComboBox, QCompleter
+
+
+class IndexCompleter(QCompleter):
+    """
+    Type-ahead for an editable QComboBox backed by a CatalogSearchIndex:
+    every keystroke queries the index (ranked, at most `limit` names) instead
+    of letting Qt filter the whole item list. `accept(name)` restricts the
+    suggestions (e.g. compatible lenses only). The combo is backed by a
+    CatalogListModel: lookups go through its name → row map, which also
+    fetches rows the popup has not reached yet.
+    """
+
+    def __init__(self, combo, index, accept=None, limit=20):
+        super().__init__(combo)
+        self.combo = combo
+        self.index = index
+        self.accept = accept
+        self.limit = limit
+        self.names = QStringListModel(self)
+        self.setModel(self.names)
+        # the index already ranks and filters: show its results as they are
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setMaxVisibleItems(limit)
+
+        combo.setEditable(True)
+        combo.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        combo.setCompleter(self)
+        combo.lineEdit().textEdited.connect(self.update_matches)
+        combo.lineEdit().editingFinished.connect(self.restore_selection)
+        self.activated[str].connect(self.select)
+
+    def update_matches(self, text):
+        self.names.setStringList(self.index.search(text, self.limit, self.accept))
+        if self.names.rowCount():
+            self.complete()
+        else:
+            self.popup().hide()
+
+    def select(self, name):
+        index = self.combo.model().row(name)
+        if index >= 0:
+            self.combo.setCurrentIndex(index)
+
+    def restore_selection(self):
+        # partial text left in the field: show the selected item again
+        combo = self.combo
+        if combo.currentText() not in combo.model() and combo.currentIndex() >= 0:
+            combo.setEditText(combo.itemText(combo.currentIndex()))
@@ -0,0 +1,171 @@
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QCheckBox,
+    QLabel, QPushButton, QTableWidget, QTableWidgetItem, QAbstractItemView,
+)
+
+from ui.workers import LatestOnlyRunner
+
+# (key, header, format)
+COLUMNS = (
+    ("camera", "Camera", "{}"),
+    ("objective", "Lens", "{}"),
+    ("wd", "WD (mm)", "{:.1f}"),
+    ("fov", "FOV (mm)", "{:.1f}"),
+    ("px_per_mm", "px/mm", "{:.2f}"),
+    ("min_defect_mm", "Min defect (µm)", None),
+    ("blur_px", "Blur (px)", "{:.2f}"),
+)
+CRITERIA = (
+    ("min_defect_mm", "Min defect"),
+    ("wd", "WD"),
+    ("fov", "FOV"),
+    ("blur_px", "Blur"),
+)
+MAX_ROWS = 2000
+
+
+def format_cell(key, fmt, value):
+    if value is None:
+        return "-"
+    if key == "min_defect_mm":
+        return f"{value * 1000:.1f}"
+    return fmt.format(value)
+
+
+class TradeoffTab(QWidget):
+    """
+    Pareto front of the catalog (camera × lens × WD) for the chosen criteria,
+    computed off the GUI thread; activating a row emits `configuration_selected`
+    with the configuration dict.
+
+    `context()` is called on the GUI thread and returns a catalog `db` for the
+    worker (not shared with the GUI thread) and the values shared with the
+    other tabs: speed_m_s, exposure_time_s.
+    Fronts go through the persistent result cache: the same query on an
+    unchanged catalog is read back instead of recomputed.
+    """
+
+    configuration_selected = pyqtSignal(object)
+
+    def __init__(self, context, parent=None):
+        super().__init__(parent)
+        self.context = context
+        self.front = []
+        self.cache = None  # opened on first use, not at startup
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        form = QFormLayout()
+        layout.addLayout(form)
+
+        self.wd_min_edit = QLineEdit("50")
+        self.wd_max_edit = QLineEdit("1000")
+        self.wd_steps_edit = QLineEdit("40")
+        wd_row = QHBoxLayout()
+        for edit in (self.wd_min_edit, self.wd_max_edit, self.wd_steps_edit):
+            wd_row.addWidget(edit)
+        form.addRow("WD from / to (mm) / steps:", wd_row)
+
+        self.min_fov_edit = QLineEdit("")
+        form.addRow("Min FOV (mm):", self.min_fov_edit)
+        self.max_defect_edit = QLineEdit("")
+        form.addRow("Max defect (mm):", self.max_defect_edit)
+        self.max_blur_edit = QLineEdit("")
+        form.addRow("Max blur (px):", self.max_blur_edit)
+
+        criteria_row = QHBoxLayout()
+        self.criteria_checks = {}
+        for key, label in CRITERIA:
+            check = QCheckBox(label)
+            check.setChecked(key != "blur_px")
+            criteria_row.addWidget(check)
+            self.criteria_checks[key] = check
+        form.addRow("Optimize:", criteria_row)
+
+        self.compatible_only_check = QCheckBox("compatible only")
+        self.compatible_only_check.setChecked(True)
+        form.addRow("", self.compatible_only_check)
+
+        self.compute_btn = QPushButton("Compute trade-offs")
+        self.compute_btn.clicked.connect(self.compute)
+        form.addRow(self.compute_btn)
+
+        self.status_label = QLabel("-")
+        layout.addWidget(self.status_label)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([header for _, header, _ in COLUMNS])
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.cellDoubleClicked.connect(self.on_row_activated)
+        layout.addWidget(self.table)
+
+        self.runner = LatestOnlyRunner(self)
+        self.runner.result_ready.connect(self.show_front)
+        self.runner.error.connect(self.on_error)
+
+    def request(self):
+        """
+        Snapshot of the widgets (GUI thread) as configuration_front kwargs;
+        None if a field is not a number.
+        """
+        fields = {}
+        for key, edit in (
+            ("wd_min", self.wd_min_edit), ("wd_max", self.wd_max_edit), ("wd_steps", self.wd_steps_edit),
+            ("min_fov_mm", self.min_fov_edit), ("max_defect_mm", self.max_defect_edit),
+            ("max_blur_px", self.max_blur_edit),
+        ):
+            text = edit.text().strip()
+            try:
+                fields[key] = float(text) if text else None
+            except ValueError:
+                return None
+        if None in (fields["wd_min"], fields["wd_max"], fields["wd_steps"]):
+            return None
+        steps = max(int(fields.pop("wd_steps")), 1)
+        wd_min, wd_max = fields.pop("wd_min"), fields.pop("wd_max")
+        step = (wd_max - wd_min) / max(steps - 1, 1)
+        request = dict(self.context())
+        request.update(fields)
+        request["wd_mm"] = [wd_min + i * step for i in range(steps)]
+        request["criteria"] = tuple(key for key, check in self.criteria_checks.items() if check.isChecked())
+        request["compatible_only"] = self.compatible_only_check.isChecked()
+        if "blur_px" not in request["criteria"] and request["max_blur_px"] is None:
+            # blur only costs time when it is a criterion or a constraint
+            request["speed_m_s"] = request["exposure_time_s"] = None
+        return request
+
+    def compute(self):
+        request = self.request()
+        if request is None:
+            self.status_label.setText("Invalid value")
+            return
+        self.status_label.setText("Computing…")
+
+        def job():
+            # NumPy / SQLite only when the tab is actually used
+            from services.result_cache import ResultCache, cached_front
+
+            if self.cache is None:
+                self.cache = ResultCache()
+            return cached_front(self.cache, **request)
+
+        self.runner.request(job)
+
+    def show_front(self, front):
+        self.front = front
+        shown = front[:MAX_ROWS]
+        self.table.setRowCount(len(shown))
+        for row, result in enumerate(shown):
+            for column, (key, _, fmt) in enumerate(COLUMNS):
+                self.table.setItem(row, column, QTableWidgetItem(format_cell(key, fmt, result.get(key))))
+        more = f" (first {MAX_ROWS} shown)" if len(front) > MAX_ROWS else ""
+        self.status_label.setText(f"{len(front)} Pareto-optimal configurations{more}")
+
+    def on_error(self, exc):
+        self.status_label.setText(f"Error: {exc}")
+
+    def on_row_activated(self, row, column=None):
+        if 0 <= row < len(self.front):
+            self.configuration_selected.emit(self.front[row])
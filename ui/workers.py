@@ -0,0 +1,108 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+
+class _JobSignals(QObject):
+    # emitted from the worker thread, delivered on the GUI thread (queued)
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+    skipped = pyqtSignal(int)
+
+
+class _Job(QRunnable):
+    def __init__(self, generation, func, latest):
+        super().__init__()
+        self.generation = generation
+        self.func = func
+        self.latest = latest
+        self.signals = _JobSignals()
+
+    def run(self):
+        # every path emits exactly one signal, so that the runner releases the job
+        if self.generation != self.latest():
+            # superseded before it even started: skip the work
+            self.signals.skipped.emit(self.generation)
+            return
+        try:
+            result = self.func()
+        except Exception as e:
+            self.signals.failed.emit(self.generation, e)
+        else:
+            self.signals.finished.emit(self.generation, result)
+
+
+class LatestOnlyRunner(QObject):
+    """
+    Runs computations off the GUI thread (QThreadPool):
+    - request() calls made within `delay_ms` of each other are coalesced;
+    - each request gets a generation number; results of older generations
+      are dropped, only the latest one reaches `result_ready`.
+    """
+
+    result_ready = pyqtSignal(object)
+    error = pyqtSignal(object)
+
+    def __init__(self, parent=None, delay_ms=40, pool=None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self.generation = 0
+        self.pending = None
+        self.jobs = set()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self._dispatch)
+
+    def request(self, func):
+        """
+        Schedule func() (called in a worker thread); replaces any pending request.
+        """
+        self.generation += 1
+        self.pending = func
+        self.timer.start()
+
+    def cancel(self):
+        self.generation += 1
+        self.pending = None
+        self.timer.stop()
+
+    def flush(self):
+        # dispatch the pending request now instead of waiting for the debounce
+        if self.timer.isActive():
+            self.timer.stop()
+            self._dispatch()
+
+    def wait(self, msecs=-1):
+        """
+        Dispatch, wait for the workers, then deliver the queued results
+        (scripts / tests; never called from the Qt slots themselves).
+        """
+        from PyQt6.QtCore import QCoreApplication
+
+        self.flush()
+        self.pool.waitForDone(msecs)
+        QCoreApplication.processEvents()
+
+    def _dispatch(self):
+        if self.pending is None:
+            return
+        job = _Job(self.generation, self.pending, lambda: self.generation)
+        self.pending = None
+        job.signals.finished.connect(self._on_finished)
+        job.signals.failed.connect(self._on_failed)
+        job.signals.skipped.connect(self._release)
+        job.setAutoDelete(False)
+        self.jobs.add(job)  # keep the signals object alive until delivery
+        self.pool.start(job)
+
+    def _on_finished(self, generation, result):
+        self._release(generation)
+        if generation == self.generation:
+            self.result_ready.emit(result)
+
+    def _on_failed(self, generation, exc):
+        self._release(generation)
+        if generation == self.generation:
+            self.error.emit(exc)
+
+    def _release(self, generation):
+        self.jobs = {job for job in self.jobs if job.generation != generation}